@@ -7,16 +7,6 @@ import os
 import shutil
 from typing import Dict, Any, List
 
-# データベースリポジトリの動的インポート
-database_url = os.getenv('DATABASE_URL', '')
-if database_url and 'postgres' in database_url:
-    try:
-        from database_postgres import task_repo  # type: ignore
-    except ImportError:
-        from database import task_repo  # type: ignore
-else:
-    from database import task_repo  # type: ignore
-
 logger = LoggerManager.get_logger(__name__)
 
 class AdminCog(commands.Cog):
@@ -125,8 +125,11 @@ class AttendanceView(discord.ui.View):
             success = attendance_repo.clock_out(user['id'])
             
             if success:
-                # 今日の記録を取得して勤務時間を表示
-                today_record = attendance_repo.get_today_attendance(user['id'])
+                # 更新後の記録が返されればそのまま使い、再取得のクエリを省く
+                if isinstance(success, dict):
+                    today_record = success
+                else:
+                    today_record = attendance_repo.get_today_attendance(user['id'])
                 
                 embed = discord.Embed(
                     title="🔴 退勤記録完了",
@@ -639,14 +642,7 @@ class AttendanceCog(commands.Cog):
                     await ctx.send("勤怠記録が見つかりません。")
                     return
             
-            # データ取得
-            attendance_data = attendance_repo.get_attendance_range(start_date, end_date, target_user_id)
-            
-            if not attendance_data:
-                await ctx.send(f"{start_date} から {end_date} の期間に勤怠データがありません。")
-                return
-            
-            # CSV作成
+            # CSV作成（勤怠データは1行ずつ読みながら書き出す）
             output = io.StringIO()
             writer = csv.writer(output)
             
@@ -658,7 +654,9 @@ class AttendanceCog(commands.Cog):
             ])
             
             # データ行
-            for record in attendance_data:
+            record_count = 0
+            for record in attendance_repo.iter_attendance_range(start_date, end_date, target_user_id):
+                record_count += 1
                 writer.writerow([
                     record.get('date', ''),
                     record.get('username', ''),
@@ -674,6 +672,10 @@ class AttendanceCog(commands.Cog):
                     record.get('notes', '')
                 ])
             
+            if record_count == 0:
+                await ctx.send(f"{start_date} から {end_date} の期間に勤怠データがありません。")
+                return
+            
             # ファイルとして送信
             output.seek(0)
             filename = f"{filename_prefix}_{start_date}_to_{end_date}.csv"
@@ -691,7 +693,7 @@ class AttendanceCog(commands.Cog):
             )
             embed.add_field(
                 name="レコード数",
-                value=f"{len(attendance_data)}件",
+                value=f"{record_count}件",
                 inline=True
             )
             
@@ -6,11 +6,42 @@ import sqlite3
 import logging
 import time
 import functools
-from typing import Any, Dict, List, Optional, Callable, Tuple
+import threading
+import atexit
+import weakref
+from collections import namedtuple
+from typing import Any, Dict, Iterator, List, Optional, Callable, Tuple
 from contextlib import contextmanager
 
 logger = logging.getLogger(__name__)
 
+# 接続ごとのチューニング設定（WALで読み取りと書き込みを並行させ、fsync回数を減らす）
+# ロック待ち時間は sqlite3.connect の timeout 引数で設定する
+# journal_mode はデータベースファイルに保存されるため、ファイルごとに1回だけ設定する（configure_connection 参照）
+CONNECTION_PRAGMAS = """
+    PRAGMA synchronous = NORMAL;
+    PRAGMA temp_store = MEMORY;
+    PRAGMA cache_size = -131072;
+    PRAGMA mmap_size = 268435456;
+"""
+
+# 新規作成するデータベースのページサイズ（月次・期間レポートのスキャンで読むページ数を減らす）
+PAGE_SIZE = 8192
+
+# WALモードを設定済みのデータベースファイル
+_wal_enabled_paths = set()
+_wal_lock = threading.Lock()
+
+# fetchmany で一度に取得する行数
+FETCH_ARRAYSIZE = 1000
+
+# log_query_performance が警告を出す実行時間（ナノ秒）
+SLOW_QUERY_NS = 1_000_000_000
+
+# WAL チェックポイントと PRAGMA optimize を行う間隔（秒）と、チェックポイントが完了しなかった場合の再試行間隔
+MAINTENANCE_INTERVAL = 15 * 60
+MAINTENANCE_RETRY_INTERVAL = 60
+
 
 class DatabaseError(Exception):
     """データベース操作の基本エラー"""
@@ -27,6 +58,36 @@ class DuplicateRecordError(DatabaseError):
     pass
 
 
+# 一意制約違反とみなす拡張エラーコード（主キー重複も「UNIQUE constraint failed」になる）
+_UNIQUE_ERROR_CODES = frozenset({
+    getattr(sqlite3, 'SQLITE_CONSTRAINT_UNIQUE', 2067),
+    getattr(sqlite3, 'SQLITE_CONSTRAINT_PRIMARYKEY', 1555),
+})
+_LOCK_ERROR_CODES = frozenset({sqlite3.SQLITE_BUSY, sqlite3.SQLITE_LOCKED})
+
+
+def _primary_error_code(e: sqlite3.Error) -> Optional[int]:
+    """例外の基本エラーコードを取得（Python 3.11 未満や手動生成の例外では None）"""
+    code = getattr(e, 'sqlite_errorcode', None)
+    return None if code is None else code & 0xFF
+
+
+def _is_unique_violation(e: sqlite3.Error) -> bool:
+    """一意制約違反かどうか（エラーコードがない場合のみメッセージで判定）"""
+    code = getattr(e, 'sqlite_errorcode', None)
+    if code is None:
+        return "UNIQUE constraint failed" in str(e)
+    return code in _UNIQUE_ERROR_CODES
+
+
+def _is_lock_error(e: sqlite3.Error) -> bool:
+    """SQLITE_BUSY / SQLITE_LOCKED かどうか（エラーコードがない場合のみメッセージで判定）"""
+    code = _primary_error_code(e)
+    if code is None:
+        return "database is locked" in str(e)
+    return code in _LOCK_ERROR_CODES
+
+
 def handle_database_error(func: Callable) -> Callable:
     """データベースエラーを統一的に処理するデコレータ"""
     @functools.wraps(func)
@@ -34,14 +95,14 @@ def handle_database_error(func: Callable) -> Callable:
         try:
             return func(*args, **kwargs)
         except sqlite3.IntegrityError as e:
-            if "UNIQUE constraint failed" in str(e):
+            if _is_unique_violation(e):
                 raise DuplicateRecordError(f"重複レコードエラー: {e}")
             else:
                 raise DatabaseError(f"整合性エラー: {e}")
         except sqlite3.OperationalError as e:
-            if "database is locked" in str(e):
+            if _is_lock_error(e):
+                # 待機は接続の busy_timeout（sqlite3.connect の timeout）で済んでいるので即座に再試行する
                 logger.warning("データベースがロックされています。リトライします...")
-                time.sleep(0.1)
                 return func(*args, **kwargs)
             else:
                 raise DatabaseError(f"操作エラー: {e}")
@@ -58,8 +119,172 @@ def handle_database_error(func: Callable) -> Callable:
 handle_db_error = handle_database_error
 
 
-def retry_on_lock(max_retries: int = 3, delay: float = 0.1) -> Callable:
-    """データベースロック時のリトライデコレータ"""
+def configure_connection(connection: sqlite3.Connection) -> None:
+    """接続に sqlite3.Row と、WALモードなど性能向上用のPRAGMAを設定（PRAGMAはインメモリDBには適用しない）"""
+    connection.row_factory = sqlite3.Row
+    main_db = connection.execute("PRAGMA database_list").fetchone()
+    if not main_db or not main_db[2]:
+        # ファイル名が空 = インメモリDB
+        return
+    
+    db_file = main_db[2]
+    with _wal_lock:
+        if db_file not in _wal_enabled_paths:
+            # page_size は空のファイルにしか効かず、WALモードでは VACUUM でも変更できないため先に設定する
+            if connection.execute("PRAGMA page_count").fetchone()[0] == 0:
+                connection.execute(f"PRAGMA page_size = {PAGE_SIZE}")
+            connection.execute("PRAGMA journal_mode = WAL")
+            _wal_enabled_paths.add(db_file)
+    connection.executescript(CONNECTION_PRAGMAS)
+
+
+class ConnectionPool:
+    """スレッドごとに1本の接続を使い回す接続プール
+    
+    接続は factory で作成し、同じスレッドからの2回目以降の get() では再利用する。
+    ファイル (.db / -wal / -shm) の開き直しと PRAGMA 設定のコストを初回だけに抑える。
+    """
+    
+    def __init__(self, factory: Callable[[], sqlite3.Connection]):
+        self._factory = factory
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: List[sqlite3.Connection] = []
+        self._maintenance_connection: Optional[sqlite3.Connection] = None
+        self._maintenance_interval: Optional[float] = None
+        self._maintenance_timer: Optional[threading.Timer] = None
+        _pools.add(self)
+    
+    def get(self) -> sqlite3.Connection:
+        """現在のスレッド用の接続を取得（なければ作成）"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = self._factory()
+            self._local.connection = connection
+            with self._lock:
+                self._connections.append(connection)
+        return connection
+    
+    def start_maintenance(self, interval: float = MAINTENANCE_INTERVAL) -> None:
+        """定期メンテナンス（WAL の切り詰めと統計更新）をバックグラウンドで開始"""
+        with self._lock:
+            self._maintenance_interval = interval
+            self._schedule_maintenance(interval)
+    
+    def _schedule_maintenance(self, delay: float) -> None:
+        # self._lock を保持した状態で呼び出す
+        timer = threading.Timer(delay, self._run_maintenance)
+        timer.daemon = True
+        self._maintenance_timer = timer
+        timer.start()
+    
+    def _run_maintenance(self) -> None:
+        with self._lock:
+            if self._maintenance_interval is None:
+                # close_all 済み
+                return
+            
+            next_delay = self._maintenance_interval
+            try:
+                if self._maintenance_connection is None:
+                    self._maintenance_connection = self._factory()
+                    self._connections.append(self._maintenance_connection)
+                busy, _, _ = self._maintenance_connection.execute(
+                    "PRAGMA wal_checkpoint(TRUNCATE)"
+                ).fetchone()
+                self._maintenance_connection.execute("PRAGMA optimize")
+                if busy:
+                    # 読み取り中の接続があり切り詰められなかったので、少し待って再試行する
+                    next_delay = MAINTENANCE_RETRY_INTERVAL
+            except sqlite3.Error as e:
+                logger.warning(f"データベースのメンテナンスに失敗しました: {e}")
+                next_delay = MAINTENANCE_RETRY_INTERVAL
+            
+            self._schedule_maintenance(next_delay)
+    
+    def close_all(self) -> None:
+        """プール内の全接続を閉じる"""
+        with self._lock:
+            connections, self._connections = self._connections, []
+            # 他スレッドが閉じた接続を再利用しないよう、スレッドローカルごと差し替える
+            self._local = threading.local()
+            self._maintenance_connection = None
+            self._maintenance_interval = None
+            if self._maintenance_timer is not None:
+                self._maintenance_timer.cancel()
+                self._maintenance_timer = None
+        for connection in connections:
+            try:
+                # 閉じる前に統計情報を更新し、次回以降の接続のクエリプランを改善する
+                connection.execute("PRAGMA optimize")
+            except sqlite3.Error as e:
+                logger.debug(f"PRAGMA optimize に失敗しました: {e}")
+            try:
+                connection.close()
+            except sqlite3.Error as e:
+                logger.warning(f"接続のクローズに失敗しました: {e}")
+
+
+# 終了時にまとめて閉じるため、生成されたプールを弱参照で保持
+_pools: "weakref.WeakSet[ConnectionPool]" = weakref.WeakSet()
+
+
+@atexit.register
+def _close_all_pools() -> None:
+    for pool in list(_pools):
+        pool.close_all()
+
+
+class TTLCache:
+    """有効期限付きの行キャッシュ（スレッドセーフ）
+    
+    値は dict のコピーで保存・返却し、呼び出し元での変更がキャッシュに残らないようにする。
+    """
+    
+    def __init__(self, ttl: float, maxsize: int = 1024):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries: Dict[Any, Tuple[float, Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+    
+    def get(self, key: Any) -> Optional[Dict[str, Any]]:
+        """有効なキャッシュがあればそのコピーを返す"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() >= entry[0]:
+                del self._entries[key]
+                return None
+            return dict(entry[1])
+    
+    def set(self, key: Any, value: Dict[str, Any]) -> None:
+        """値をキャッシュに保存（上限に達したら期限切れを掃除し、それでも満杯なら全消去）"""
+        now = time.monotonic()
+        with self._lock:
+            if len(self._entries) >= self.maxsize:
+                self._entries = {k: v for k, v in self._entries.items() if v[0] > now}
+                if len(self._entries) >= self.maxsize:
+                    self._entries.clear()
+            self._entries[key] = (now + self.ttl, dict(value))
+    
+    def invalidate(self, key: Any) -> None:
+        """指定キーのキャッシュを破棄"""
+        with self._lock:
+            self._entries.pop(key, None)
+    
+    def clear(self) -> None:
+        """全てのキャッシュを破棄"""
+        with self._lock:
+            self._entries.clear()
+
+
+def retry_on_lock(max_retries: int = 2, delay: float = 0.0) -> Callable:
+    """データベースロック時のリトライデコレータ
+    
+    ロック待ちは SQLite の busy_timeout が C レベルで行うため、既定では最後の手段として
+    待ち時間なしで1回だけ再試行する。
+    """
     def decorator(func: Callable) -> Callable:
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
@@ -67,9 +292,10 @@ def retry_on_lock(max_retries: int = 3, delay: float = 0.1) -> Callable:
                 try:
                     return func(*args, **kwargs)
                 except sqlite3.OperationalError as e:
-                    if "database is locked" in str(e) and attempt < max_retries - 1:
+                    if _is_lock_error(e) and attempt < max_retries - 1:
                         logger.warning(f"データベースロック (試行 {attempt + 1}/{max_retries})")
-                        time.sleep(delay * (attempt + 1))
+                        if delay:
+                            time.sleep(delay * (attempt + 1))
                         continue
                     raise DatabaseError(f"データベースロックエラー: {e}")
             return None
@@ -77,17 +303,60 @@ def retry_on_lock(max_retries: int = 3, delay: float = 0.1) -> Callable:
     return decorator
 
 
+def db_operation(retries: int = 2, delay: float = 0.1) -> Callable:
+    """handle_database_error と retry_on_lock を1段にまとめたデコレータ
+    
+    1つの try/except でエラーを種類ごとに振り分ける。ロック時は delay, 2*delay, 4*delay ... と
+    待ち時間を倍にしながら最大 retries 回まで試行し、それ以外は DatabaseError 系に変換する。
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            attempt = 0
+            while True:
+                try:
+                    return func(*args, **kwargs)
+                except DatabaseError:
+                    # 変換済みのエラー（DuplicateRecordError など）はそのまま伝える
+                    raise
+                except sqlite3.IntegrityError as e:
+                    if _is_unique_violation(e):
+                        raise DuplicateRecordError(f"重複レコードエラー: {e}")
+                    raise DatabaseError(f"整合性エラー: {e}")
+                except sqlite3.OperationalError as e:
+                    if not _is_lock_error(e):
+                        raise DatabaseError(f"操作エラー: {e}")
+                    attempt += 1
+                    if attempt >= retries:
+                        raise DatabaseError(f"データベースロックエラー: {e}")
+                    logger.warning(f"データベースロック (試行 {attempt}/{retries})")
+                    # SQLITE_BUSY は busy_timeout で既に待機済みなのですぐ再試行し、
+                    # それ以外（SQLITE_LOCKED など）は待ち時間を倍にしながら待つ
+                    if _primary_error_code(e) != sqlite3.SQLITE_BUSY:
+                        time.sleep(delay * (1 << (attempt - 1)))
+                except sqlite3.Error as e:
+                    raise DatabaseError(f"データベースエラー: {e}")
+                except Exception as e:
+                    logger.error(f"予期しないエラー: {e}", exc_info=True)
+                    raise DatabaseError(f"予期しないエラー: {e}")
+        return wrapper
+    return decorator
+
+
 @contextmanager
 def transaction_context(connection: sqlite3.Connection):
-    """トランザクション管理のコンテキストマネージャ"""
+    """トランザクション管理のコンテキストマネージャ
+    
+    BEGIN IMMEDIATE で開始時に書き込みロックを取得し、書き込み同士を直列化する。
+    読み取りのみの処理はWALモードではロックなしで進めるため、このラッパーは不要。
+    """
+    connection.execute("BEGIN IMMEDIATE")
     try:
-        connection.execute("BEGIN")
-        cursor = connection.cursor()
-        yield cursor
-        connection.commit()
+        # コミット/ロールバックは sqlite3 の接続コンテキストマネージャに任せる
+        with connection:
+            yield connection.cursor()
         logger.debug("トランザクションがコミットされました")
     except Exception as e:
-        connection.rollback()
         logger.error(f"トランザクションがロールバックされました: {e}")
         raise
 
@@ -111,93 +380,144 @@ def safe_execute(cursor_or_connection, query: str, params: Tuple = ()) -> sqlite
         raise DatabaseError(f"クエリ実行エラー: {e}")
 
 
+def _fetch_or_close(cursor: sqlite3.Cursor, fetch: Callable[[], Any]) -> Any:
+    """取得に失敗したカーソルを閉じてから例外を送出する
+    
+    プール接続ではカーソルが例外のトレースバック経由で生き残ると、
+    未完了の文が読み取りスナップショットを保持したままになるため。
+    """
+    try:
+        return fetch()
+    except Exception:
+        cursor.close()
+        raise
+
+
 def fetch_one_as_dict(cursor: sqlite3.Cursor) -> Optional[Dict[str, Any]]:
     """単一行を辞書として取得"""
-    row = cursor.fetchone()
+    row = _fetch_or_close(cursor, cursor.fetchone)
     if row is None:
         return None
+    if isinstance(row, sqlite3.Row):
+        return dict(row)
     
     columns = [description[0] for description in cursor.description]
     return dict(zip(columns, row))
 
 
+def iter_rows_as_dict(cursor: sqlite3.Cursor, arraysize: int = FETCH_ARRAYSIZE) -> Iterator[Dict[str, Any]]:
+    """結果を fetchmany で分割取得し、1行ずつ辞書として返す
+    
+    大きなレポート用クエリでも結果全体をタプルのリストとして保持しない。
+    """
+    if cursor.description is None:
+        return
+    
+    columns = tuple(description[0] for description in cursor.description)
+    cursor.arraysize = arraysize
+    while chunk := _fetch_or_close(cursor, cursor.fetchmany):
+        if isinstance(chunk[0], sqlite3.Row):
+            yield from map(dict, chunk)
+        else:
+            for row in chunk:
+                yield dict(zip(columns, row))
+
+
 def fetch_all_as_dict(cursor: sqlite3.Cursor) -> List[Dict[str, Any]]:
     """全行を辞書のリストとして取得"""
-    rows = cursor.fetchall()
-    if not rows:
+    return list(iter_rows_as_dict(cursor))
+
+
+def fetch_all_rows(cursor: sqlite3.Cursor) -> List[sqlite3.Row]:
+    """全行を sqlite3.Row のまま取得（row['列名'] で読むだけの処理向け）
+    
+    辞書への変換を省く。.get() や in による列名の判定が必要な場合は fetch_all_as_dict を使う。
+    """
+    return _fetch_or_close(cursor, cursor.fetchall)
+
+
+@functools.lru_cache(maxsize=128)
+def _row_tuple_class(columns: Tuple[str, ...]):
+    """列名の組ごとに名前付きタプルのクラスを1回だけ生成"""
+    return namedtuple('Row', columns, rename=True)
+
+
+def fetch_all_as_tuples(cursor: sqlite3.Cursor) -> List[Tuple]:
+    """全行を名前付きタプルのリストとして取得（属性アクセスで回す集計処理向け）"""
+    if cursor.description is None:
         return []
     
-    columns = [description[0] for description in cursor.description]
-    return [dict(zip(columns, row)) for row in rows]
+    row_class = _row_tuple_class(tuple(description[0] for description in cursor.description))
+    return list(map(row_class._make, _fetch_or_close(cursor, cursor.fetchall)))
 
 
 def validate_required_fields(data: Dict[str, Any], required_fields: List[str]) -> bool:
     """必須フィールドの検証"""
-    missing_fields = [field for field in required_fields if field not in data or data[field] is None]
+    missing_fields = [field for field in required_fields if data.get(field) is None]
     if missing_fields:
-        raise ValueError(f"必須フィールドが不足しています: {missing_fields}")
+        raise ValueError(f"必須フィールドが不足しています: {', '.join(missing_fields)}")
     return True
 
 
 def sanitize_string(value: str, max_length: Optional[int] = None) -> Optional[str]:
     """文字列のサニタイズ"""
-    if value is None:
-        return None
-    
+    # 大半の呼び出しは str なので、型チェックを先に行う
     if not isinstance(value, str):
+        if value is None:
+            return None
         value = str(value)
     
-    # 基本的なサニタイズ
+    # 基本的なサニタイズ（前後に空白がなければ strip は同じオブジェクトを返し、新たな文字列を作らない）
     value = value.strip()
     
-    # 長さ制限
+    # 長さ制限（切り詰めが必要な場合だけ部分文字列を作る）
     if max_length and len(value) > max_length:
         value = value[:max_length]
     
     return value
 
 
+@functools.lru_cache(maxsize=256)
+def _update_sql(table: str, columns: Tuple[str, ...], where_clause: str) -> str:
+    """UPDATE 文の文字列を組み立てる（テーブル・列・WHERE句が同じなら再利用）"""
+    set_clauses = [f"{column} = ?" for column in columns]
+    set_clauses.append("updated_at = CURRENT_TIMESTAMP")
+    return f"UPDATE {table} SET {', '.join(set_clauses)} WHERE {where_clause}"
+
+
 def build_update_query(table: str, data: Dict[str, Any], where_clause: str) -> Tuple[str, List]:
     """UPDATE クエリの構築"""
     if not data:
         raise ValueError("更新データが空です")
     
-    # updated_atを自動追加
-    data_with_timestamp = data.copy()
-    data_with_timestamp['updated_at'] = 'CURRENT_TIMESTAMP'
+    # updated_atは常にCURRENT_TIMESTAMPで自動設定する（通常は含まれないのでキーと値をそのまま使う）
+    if 'updated_at' in data:
+        columns = tuple(key for key in data if key != 'updated_at')
+        params = [data[key] for key in columns]
+    else:
+        columns = tuple(data)
+        params = list(data.values())
     
-    set_clauses = []
-    params = []
-    
-    for key, value in data_with_timestamp.items():
-        if key == 'updated_at' and value == 'CURRENT_TIMESTAMP':
-            set_clauses.append(f"{key} = CURRENT_TIMESTAMP")
-        else:
-            set_clauses.append(f"{key} = ?")
-            params.append(value)
-    
-    set_clause = ", ".join(set_clauses)
-    query = f"UPDATE {table} SET {set_clause} WHERE {where_clause}"
-    
-    return query, params
+    return _update_sql(table, columns, where_clause), params
 
 
 def log_query_performance(func: Callable) -> Callable:
     """クエリのパフォーマンスをログに記録するデコレータ"""
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         try:
             result = func(*args, **kwargs)
-            execution_time = time.time() - start_time
-            if execution_time > 1.0:  # 1秒以上の場合は警告
-                logger.warning(f"遅いクエリ検出: {func.__name__} - {execution_time:.2f}秒")
-            else:
-                logger.debug(f"クエリ実行時間: {func.__name__} - {execution_time:.3f}秒")
+            elapsed_ns = time.perf_counter_ns() - start_ns
+            # 秒への変換と文字列整形は実際にログを出す場合だけ行う
+            if elapsed_ns > SLOW_QUERY_NS:  # 1秒以上の場合は警告
+                logger.warning(f"遅いクエリ検出: {func.__name__} - {elapsed_ns / 1e9:.2f}秒")
+            elif logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"クエリ実行時間: {func.__name__} - {elapsed_ns / 1e9:.3f}秒")
             return result
         except Exception as e:
-            execution_time = time.time() - start_time
-            logger.error(f"クエリエラー: {func.__name__} - {execution_time:.3f}秒 - {e}")
+            elapsed_ns = time.perf_counter_ns() - start_ns
+            logger.error(f"クエリエラー: {func.__name__} - {elapsed_ns / 1e9:.3f}秒 - {e}")
             raise
     
     return wrapper
\ No newline at end of file
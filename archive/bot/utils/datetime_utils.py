@@ -2,18 +2,29 @@
 日時処理のユーティリティモジュール
 JST (Japan Standard Time) での日時操作を提供
 """
+import re
 import sqlite3
+import sys
+import functools
+import time
 from datetime import datetime, date, timedelta
 from typing import Optional, Tuple
-try:
-    import pytz
-    JST = pytz.timezone('Asia/Tokyo')
-    PYTZ_AVAILABLE = True
-except ImportError:
-    # Fallback when pytz is not available
-    from datetime import timezone, timedelta
-    JST = timezone(timedelta(hours=9))  # JST is UTC+9
-    PYTZ_AVAILABLE = False
+from zoneinfo import ZoneInfo
+
+# 標準ライブラリの zoneinfo を使用（Windows では tzdata パッケージが必要）
+JST = ZoneInfo('Asia/Tokyo')
+
+# parse_date_string 用: 年、区切り文字（- か /、前後で同じもの）、月、日
+_DATE_RE = re.compile(r'([0-9]{4})([-/])([0-9]{1,2})\2([0-9]{1,2})')
+
+
+@functools.lru_cache(maxsize=2048)
+def parse_iso_datetime(value: str) -> datetime:
+    """ISO 8601 文字列を datetime に変換（同じ文字列の再解析を避けるためキャッシュする）"""
+    if sys.version_info >= (3, 11):
+        # 3.11 以降の fromisoformat は末尾の 'Z' を直接扱える
+        return datetime.fromisoformat(value)
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
 
 
 def now_jst() -> datetime:
@@ -26,15 +37,50 @@ def today_jst() -> date:
     return now_jst().date()
 
 
+# 今日の日付のキャッシュ（ステータス取得などのポーリングで毎回 now() を呼ばないようにする）
+TODAY_CACHE_SECONDS = 30.0
+_TODAY_CACHE = {'date': None, 'expires': 0.0}
+
+
+def today_jst_iso() -> str:
+    """JSTの今日の日付をISO形式で返す（最長30秒、ただし日付が変わる時刻を越えてはキャッシュしない）"""
+    monotonic_now = time.monotonic()
+    if monotonic_now >= _TODAY_CACHE['expires']:
+        now = now_jst()
+        next_midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time(), now.tzinfo)
+        _TODAY_CACHE['date'] = now.date().isoformat()
+        _TODAY_CACHE['expires'] = monotonic_now + min(
+            TODAY_CACHE_SECONDS, (next_midnight - now).total_seconds()
+        )
+    return _TODAY_CACHE['date']
+
+
+def _to_jst(dt: datetime) -> datetime:
+    """datetime をJSTに揃える（タイムゾーンなしはJSTとみなす）"""
+    if dt.tzinfo is None:
+        # タイムゾーン情報がない場合、JSTとして扱う
+        return dt.replace(tzinfo=JST)
+    elif dt.tzinfo != JST:
+        # 異なるタイムゾーンの場合、JSTに変換
+        return dt.astimezone(JST)
+    return dt
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_iso_jst(value: str) -> datetime:
+    """ISO 8601 文字列をJSTのdatetimeに変換（タイムゾーン変換の結果ごとキャッシュする）"""
+    return _to_jst(parse_iso_datetime(value))
+
+
 def ensure_jst(dt) -> datetime:
     """datetime オブジェクトがJSTタイムゾーンを持つことを保証"""
     if dt is None:
         return None
     
-    # 文字列の場合はdatetimeに変換
+    # 文字列の場合は解析とJST変換をまとめてキャッシュから取得
     if isinstance(dt, str):
         try:
-            dt = datetime.fromisoformat(dt.replace('Z', '+00:00'))
+            return _parse_iso_jst(dt)
         except ValueError:
             raise ValueError(f"無効な日時形式です: {dt}")
     
@@ -42,16 +88,7 @@ def ensure_jst(dt) -> datetime:
     if not isinstance(dt, datetime):
         raise ValueError(f"datetime型または文字列を期待しましたが、{type(dt)}が渡されました")
     
-    if dt.tzinfo is None:
-        # タイムゾーン情報がない場合、JSTとして扱う
-        if PYTZ_AVAILABLE:
-            return JST.localize(dt)
-        else:
-            return dt.replace(tzinfo=JST)
-    elif dt.tzinfo != JST:
-        # 異なるタイムゾーンの場合、JSTに変換
-        return dt.astimezone(JST)
-    return dt
+    return _to_jst(dt)
 
 
 def format_time_only(dt) -> str:
@@ -62,7 +99,7 @@ def format_time_only(dt) -> str:
     # 文字列の場合はdatetimeに変換
     if isinstance(dt, str):
         try:
-            dt = datetime.fromisoformat(dt.replace('Z', '+00:00'))
+            dt = parse_iso_datetime(dt)
         except ValueError:
             return ""
     
@@ -84,7 +121,7 @@ def format_date_only(dt) -> str:
     # 文字列の場合はdatetimeに変換
     if isinstance(dt, str):
         try:
-            dt = datetime.fromisoformat(dt.replace('Z', '+00:00'))
+            dt = parse_iso_datetime(dt)
         except ValueError:
             return ""
     
@@ -104,7 +141,7 @@ def format_datetime_for_display(dt) -> str:
     # 文字列の場合はdatetimeに変換
     if isinstance(dt, str):
         try:
-            dt = datetime.fromisoformat(dt.replace('Z', '+00:00'))
+            dt = parse_iso_datetime(dt)
         except ValueError:
             return ""
     
@@ -129,13 +166,21 @@ def parse_date_string(date_str: str) -> date:
     if not date_str:
         raise ValueError("日付文字列が空です")
     
-    try:
-        return datetime.strptime(date_str, '%Y-%m-%d').date()
-    except ValueError:
+    # 大半は YYYY-MM-DD / YYYY/MM/DD なので、C 実装の fromisoformat で先に解析する
+    if len(date_str) == 10 and date_str[4] == date_str[7] and date_str[4] in '-/':
+        try:
+            return date.fromisoformat(date_str.replace('/', '-'))
+        except ValueError:
+            pass
+    
+    # ゼロ埋めなし（2024-1-5 など）は年・月・日のグループから直接 date を作る
+    match = _DATE_RE.fullmatch(date_str)
+    if match:
         try:
-            return datetime.strptime(date_str, '%Y/%m/%d').date()
+            return date(int(match.group(1)), int(match.group(3)), int(match.group(4)))
         except ValueError:
-            raise ValueError(f"無効な日付形式です: {date_str} (YYYY-MM-DD形式で入力してください)")
+            pass
+    raise ValueError(f"無効な日付形式です: {date_str} (YYYY-MM-DD形式で入力してください)")
 
 
 def calculate_time_difference(start_time, end_time) -> float:
@@ -145,9 +190,9 @@ def calculate_time_difference(start_time, end_time) -> float:
     
     # 文字列の場合はdatetimeに変換
     if isinstance(start_time, str):
-        start_time = datetime.fromisoformat(start_time.replace('Z', '+00:00'))
+        start_time = parse_iso_datetime(start_time)
     if isinstance(end_time, str):
-        end_time = datetime.fromisoformat(end_time.replace('Z', '+00:00'))
+        end_time = parse_iso_datetime(end_time)
     
     if end_time <= start_time:
         return 0.0
@@ -161,27 +206,21 @@ def calculate_work_hours(check_in, check_out, break_start=None, break_end=None,
     if not check_in or not check_out:
         return 0.0
     
-    # 文字列の場合はdatetimeに変換
-    if isinstance(check_in, str):
-        check_in = datetime.fromisoformat(check_in.replace('Z', '+00:00'))
-    if isinstance(check_out, str):
-        check_out = datetime.fromisoformat(check_out.replace('Z', '+00:00'))
-    
+    # 文字列・datetime（タイムゾーンの有無を問わず）をまとめてJSTに揃える
+    check_in, check_out = ensure_jst(check_in), ensure_jst(check_out)
     if check_out <= check_in:
         return 0.0
     
-    # 総勤務時間
-    total_hours = (check_out - check_in).total_seconds() / 3600
-    
-    # 休憩時間を差し引く
-    break_hours = 0.0
+    # 総勤務時間から休憩時間を timedelta のまま差し引き、最後に時間へ換算
+    worked = check_out - check_in
     if break_start and break_end:
-        break_hours = calculate_time_difference(break_start, break_end)
+        break_start, break_end = ensure_jst(break_start), ensure_jst(break_end)
+        if break_end > break_start:
+            worked -= break_end - break_start
     elif break_duration > 0:
-        break_hours = break_duration
+        worked -= timedelta(hours=break_duration)
     
-    work_hours = max(0.0, total_hours - break_hours)
-    return round(work_hours, 2)
+    return round(max(0.0, worked.total_seconds() / 3600), 2)
 
 
 def calculate_overtime_hours(work_hours: float, standard_hours: float = 8.0) -> float:
@@ -1,5 +1,5 @@
 import logging
-from datetime import datetime, date, timedelta
+from datetime import datetime, time, timedelta
 from typing import List, Dict, Any, Optional
 import json
 import os
@@ -16,9 +16,17 @@ except ImportError:
     GOOGLE_API_AVAILABLE = False
 
 from config import Config
+from bot.utils.datetime_utils import JST, now_jst, today_jst, parse_iso_datetime
 
 logger = logging.getLogger(__name__)
 
+# events.list で取得するフィールド（_format_event が参照するものだけに絞る）
+EVENT_FIELDS = (
+    'nextPageToken,'
+    'items(id,summary,description,start,end,location,attendees/email,creator/email,htmlLink)'
+)
+EVENTS_PAGE_SIZE = 250
+
 class GoogleCalendarService:
     """Googleカレンダー連携サービス"""
     
@@ -32,6 +40,10 @@ class GoogleCalendarService:
         
         # 認証情報の初期化
         self._init_credentials()
+        
+        # 最初の予定取得時に discovery の構築待ちが発生しないよう、起動時にクライアントを作っておく
+        if self.credentials is not None:
+            self.service = self._build_service()
     
     def _init_credentials(self):
         """認証情報を初期化"""
@@ -47,6 +59,14 @@ class GoogleCalendarService:
         except Exception as e:
             logger.error(f"Google API認証初期化エラー: {e}")
     
+    def _build_service(self):
+        """Calendar API クライアントを構築（discovery のファイルキャッシュ探索は行わない）"""
+        try:
+            return build('calendar', 'v3', credentials=self.credentials, cache_discovery=False)
+        except Exception as e:
+            logger.error(f"Google Calendar API クライアント構築エラー: {e}")
+            return None
+    
     def is_available(self) -> bool:
         """Google Calendar APIが利用可能かチェック"""
         return GOOGLE_API_AVAILABLE and self.service is not None
@@ -59,27 +79,13 @@ class GoogleCalendarService:
         try:
             calendar_id = calendar_id or Config.GOOGLE_CALENDAR_ID or 'primary'
             
-            # 今日の開始時刻と終了時刻を設定
-            today = date.today()
-            start_time = datetime.combine(today, datetime.min.time()).isoformat() + 'Z'
-            end_time = datetime.combine(today, datetime.max.time()).isoformat() + 'Z'
-            
-            # イベントを取得
-            events_result = self.service.events().list(
-                calendarId=calendar_id,
-                timeMin=start_time,
-                timeMax=end_time,
-                singleEvents=True,
-                orderBy='startTime'
-            ).execute()
-            
-            events = events_result.get('items', [])
+            # 今日の開始時刻と終了時刻を設定（JST のオフセット付き ISO 形式）
+            today = today_jst()
+            start_time = datetime.combine(today, time.min, JST).isoformat()
+            end_time = datetime.combine(today, time.max, JST).isoformat()
             
-            # イベント情報を整形
-            formatted_events = []
-            for event in events:
-                formatted_event = self._format_event(event)
-                formatted_events.append(formatted_event)
+            events = self._list_events(calendar_id, start_time, end_time)
+            formatted_events = [self._format_event(event) for event in events]
             
             logger.info(f"今日の予定を {len(formatted_events)} 件取得しました")
             return formatted_events
@@ -100,29 +106,15 @@ class GoogleCalendarService:
             calendar_id = calendar_id or Config.GOOGLE_CALENDAR_ID or 'primary'
             
             # 今週の開始日（月曜日）と終了日（日曜日）を計算
-            today = date.today()
+            today = today_jst()
             start_of_week = today - timedelta(days=today.weekday())
             end_of_week = start_of_week + timedelta(days=6)
             
-            start_time = datetime.combine(start_of_week, datetime.min.time()).isoformat() + 'Z'
-            end_time = datetime.combine(end_of_week, datetime.max.time()).isoformat() + 'Z'
-            
-            # イベントを取得
-            events_result = self.service.events().list(
-                calendarId=calendar_id,
-                timeMin=start_time,
-                timeMax=end_time,
-                singleEvents=True,
-                orderBy='startTime'
-            ).execute()
-            
-            events = events_result.get('items', [])
+            start_time = datetime.combine(start_of_week, time.min, JST).isoformat()
+            end_time = datetime.combine(end_of_week, time.max, JST).isoformat()
             
-            # イベント情報を整形
-            formatted_events = []
-            for event in events:
-                formatted_event = self._format_event(event)
-                formatted_events.append(formatted_event)
+            events = self._list_events(calendar_id, start_time, end_time)
+            formatted_events = [self._format_event(event) for event in events]
             
             logger.info(f"今週の予定を {len(formatted_events)} 件取得しました")
             return formatted_events
@@ -140,28 +132,14 @@ class GoogleCalendarService:
             return []
         
         try:
-            now = datetime.now()
+            now = now_jst()
             upcoming_time = now + timedelta(minutes=minutes)
             
-            start_time = now.isoformat() + 'Z'
-            end_time = upcoming_time.isoformat() + 'Z'
-            
-            # イベントを取得
-            events_result = self.service.events().list(
-                calendarId=Config.GOOGLE_CALENDAR_ID or 'primary',
-                timeMin=start_time,
-                timeMax=end_time,
-                singleEvents=True,
-                orderBy='startTime'
-            ).execute()
-            
-            events = events_result.get('items', [])
+            start_time = now.isoformat()
+            end_time = upcoming_time.isoformat()
             
-            # イベント情報を整形
-            formatted_events = []
-            for event in events:
-                formatted_event = self._format_event(event)
-                formatted_events.append(formatted_event)
+            events = self._list_events(Config.GOOGLE_CALENDAR_ID or 'primary', start_time, end_time)
+            formatted_events = [self._format_event(event) for event in events]
             
             return formatted_events
             
@@ -169,20 +147,37 @@ class GoogleCalendarService:
             logger.error(f"近日予定取得エラー: {e}")
             return []
     
+    def _list_events(self, calendar_id: str, time_min: str, time_max: str) -> List[Dict[str, Any]]:
+        """指定期間のイベントを全ページ分取得（_format_event で使うフィールドのみ要求する）"""
+        events = []
+        page_token = None
+        while True:
+            events_result = self.service.events().list(
+                calendarId=calendar_id,
+                timeMin=time_min,
+                timeMax=time_max,
+                singleEvents=True,
+                orderBy='startTime',
+                maxResults=EVENTS_PAGE_SIZE,
+                fields=EVENT_FIELDS,
+                pageToken=page_token
+            ).execute()
+            
+            events.extend(events_result.get('items', []))
+            page_token = events_result.get('nextPageToken')
+            if not page_token:
+                return events
+    
     def _format_event(self, event: Dict[str, Any]) -> Dict[str, Any]:
         """イベント情報を整形"""
-        start = event['start'].get('dateTime', event['start'].get('date'))
-        end = event['end'].get('dateTime', event['end'].get('date'))
+        start_info, end_info = event['start'], event['end']
+        start = start_info.get('dateTime') or start_info.get('date')
+        end = end_info.get('dateTime') or end_info.get('date')
         
-        # 日時の解析
-        if 'T' in start:  # 時刻あり
-            start_dt = datetime.fromisoformat(start.replace('Z', '+00:00'))
-            end_dt = datetime.fromisoformat(end.replace('Z', '+00:00'))
-            all_day = False
-        else:  # 終日イベント
-            start_dt = datetime.strptime(start, '%Y-%m-%d')
-            end_dt = datetime.strptime(end, '%Y-%m-%d')
-            all_day = True
+        # 日時の解析（終日イベントは 'YYYY-MM-DD' で、fromisoformat では0時の datetime になる）
+        all_day = 'T' not in start
+        start_dt = parse_iso_datetime(start)
+        end_dt = parse_iso_datetime(end)
         
         return {
             'id': event['id'],
@@ -3,7 +3,7 @@
 import asyncio
 import logging
 from datetime import datetime, time, date
-import pytz
+from zoneinfo import ZoneInfo
 import discord
 from discord.ext import commands, tasks
 import os
@@ -20,7 +20,7 @@ class ReminderService:
     
     def __init__(self, bot):
         self.bot = bot
-        self.timezone = pytz.timezone(Config.TIMEZONE)
+        self.timezone = ZoneInfo(Config.TIMEZONE)
         
         # 定期実行タスクを開始
         self.daily_report_reminder.start()
@@ -3,6 +3,7 @@
 型安全性とエラーハンドリングを改善
 """
 from typing import Any, Optional
+import functools
 import os
 
 
@@ -21,8 +22,9 @@ class BotError(Exception):
     pass
 
 
+@functools.cache
 def get_database_repositories():
-    """環境に応じてデータベースリポジトリを取得"""
+    """環境に応じてデータベースリポジトリを取得（結果はプロセス内でキャッシュ）"""
     database_url = os.getenv('DATABASE_URL', '')
     
     if database_url and 'postgres' in database_url:
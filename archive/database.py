@@ -1,17 +1,18 @@
 import sqlite3
 import logging
+import threading
+from contextlib import contextmanager
 from datetime import datetime, date, timedelta
-from typing import List, Dict, Any, Optional
+from typing import Iterator, List, Dict, Any, Optional, Tuple
 import os
 from config import Config
 from bot.utils.datetime_utils import (
-    now_jst, today_jst, ensure_jst, format_time_only,
-    calculate_work_hours, calculate_overtime_hours,
+    now_jst, today_jst_iso, ensure_jst, format_time_only,
     adapt_datetime_for_sqlite, convert_datetime_from_sqlite
 )
 from bot.utils.database_utils import (
-    handle_database_error, retry_on_lock, transaction,
-    safe_execute, fetch_one_as_dict, fetch_all_as_dict,
+    handle_database_error, retry_on_lock, db_operation, transaction, configure_connection, ConnectionPool, TTLCache,
+    safe_execute, fetch_one_as_dict, iter_rows_as_dict, fetch_all_as_dict, fetch_all_rows,
     validate_required_fields, sanitize_string, build_update_query,
     log_query_performance, DatabaseError, RecordNotFoundError, DuplicateRecordError
 )
@@ -23,130 +24,389 @@ sqlite3.register_adapter(datetime, adapt_datetime_for_sqlite)
 sqlite3.register_converter("datetime", convert_datetime_from_sqlite)
 
 
+# 休憩時間（分）。休憩の開始・終了のどちらかが未記録なら NULL になる
+BREAK_MINUTES_EXPR = "CAST((julianday(break_end_time) - julianday(break_start_time)) * 24 * 60 AS INTEGER)"
+# タスク一覧の並び順に使う優先度の順位（高=1, 中=2, 低=3）
+PRIORITY_RANK_EXPR = "CASE priority WHEN '高' THEN 1 WHEN '中' THEN 2 WHEN '低' THEN 3 END"
+
+# テーブル定義（init_database が1トランザクションで適用する）
+SCHEMA_SQL = f"""
+    BEGIN;
+    
+    -- ユーザーテーブル
+    CREATE TABLE IF NOT EXISTS users (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        discord_id TEXT UNIQUE NOT NULL,
+        username TEXT NOT NULL,
+        display_name TEXT,
+        email TEXT,
+        is_admin BOOLEAN DEFAULT FALSE,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    
+    -- 日報テーブル
+    CREATE TABLE IF NOT EXISTS daily_reports (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        report_date DATE NOT NULL,
+        today_tasks TEXT,
+        tomorrow_tasks TEXT,
+        obstacles TEXT,
+        comments TEXT,
+        submitted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (user_id) REFERENCES users (id),
+        UNIQUE(user_id, report_date)
+    );
+    
+    -- タスクテーブル
+    CREATE TABLE IF NOT EXISTS tasks (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        title TEXT NOT NULL,
+        description TEXT,
+        priority TEXT CHECK(priority IN ('高', '中', '低')) DEFAULT '中',
+        status TEXT CHECK(status IN ('未着手', '進行中', '完了', '中断')) DEFAULT '未着手',
+        due_date DATE,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        completed_at TIMESTAMP NULL,
+        priority_rank INTEGER GENERATED ALWAYS AS ({PRIORITY_RANK_EXPR}) VIRTUAL,
+        FOREIGN KEY (user_id) REFERENCES users (id)
+    );
+    
+    -- 出退勤テーブル
+    CREATE TABLE IF NOT EXISTS attendance (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        work_date DATE NOT NULL,
+        clock_in_time TIMESTAMP,
+        clock_out_time TIMESTAMP,
+        break_start_time TIMESTAMP,
+        break_end_time TIMESTAMP,
+        total_work_hours REAL,
+        overtime_hours REAL DEFAULT 0,
+        status TEXT CHECK(status IN ('在席', '離席', '休憩中', '退勤')) DEFAULT '離席',
+        notes TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        total_break_minutes INTEGER GENERATED ALWAYS AS ({BREAK_MINUTES_EXPR}) STORED,
+        FOREIGN KEY (user_id) REFERENCES users (id),
+        UNIQUE(user_id, work_date)
+    );
+    
+    -- 設定テーブル
+    CREATE TABLE IF NOT EXISTS settings (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        setting_key TEXT NOT NULL,
+        setting_value TEXT NOT NULL,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (user_id) REFERENCES users (id),
+        UNIQUE(user_id, setting_key)
+    );
+    
+    -- インデックス（users.discord_id と attendance(user_id, work_date) は UNIQUE 制約の暗黙インデックスを使う）
+    CREATE INDEX IF NOT EXISTS idx_tasks_due_status ON tasks(due_date, status) WHERE status != '完了';
+    CREATE INDEX IF NOT EXISTS idx_attendance_workdate ON attendance(work_date);
+    -- 在席状況一覧の LEFT JOIN をテーブル本体を読まずにインデックスだけで処理する
+    CREATE INDEX IF NOT EXISTS idx_attendance_daily_covering
+        ON attendance(user_id, work_date, status, clock_in_time, clock_out_time);
+    
+    COMMIT;
+    
+    -- 新しいインデックスをクエリプランナーが選べるよう統計情報を更新
+    ANALYZE;
+"""
+
+# 既存のテーブルに後から追加した生成列 (テーブル, 列名, 式)。ALTER TABLE では VIRTUAL でしか追加できない
+GENERATED_COLUMNS = (
+    ('attendance', 'total_break_minutes', BREAK_MINUTES_EXPR),
+    ('tasks', 'priority_rank', PRIORITY_RANK_EXPR),
+)
+
+# 生成列を使うインデックス（列の追加後に作成する）
+GENERATED_COLUMN_INDEXES_SQL = """
+    -- タスク一覧をソートなしでインデックス順に返す（(user_id, status) の検索も兼ねる）
+    CREATE INDEX IF NOT EXISTS idx_tasks_sort ON tasks(user_id, status, priority_rank, due_date);
+    DROP INDEX IF EXISTS idx_tasks_user_status;
+"""
+
+
+# 1文あたりのバインド変数の上限（古い SQLite の SQLITE_MAX_VARIABLE_NUMBER に合わせる）
+SQLITE_MAX_VARIABLES = 999
+
+# ポーリングなどで頻繁に実行するクエリ
+# sqlite3 は接続ごとに SQL 文字列をキーにして準備済み文をキャッシュするため、
+# 同じ文字列オブジェクトを使い回してキャッシュを確実にヒットさせる
+SQL_GET_USER_BY_DISCORD_ID = "SELECT * FROM users WHERE discord_id = ?"
+SQL_GET_TODAY_ATTENDANCE = "SELECT * FROM attendance WHERE user_id = ? AND work_date = ?"
+SQL_GET_ALL_USERS_STATUS = """
+    SELECT u.discord_id, u.username, u.display_name,
+           COALESCE(a.status, '離席') as status,
+           a.clock_in_time, a.clock_out_time
+    FROM users u
+    LEFT JOIN attendance a ON u.id = a.user_id AND a.work_date = ?
+"""
+
+# 退勤時の勤務時間（休憩を除く）。calculate_work_hours と同じく負の値は0に丸める
+_WORK_HOURS_EXPR = """MAX(0.0,
+        (julianday(:now) - julianday(clock_in_time)) * 24
+        - COALESCE((julianday(break_end_time) - julianday(break_start_time)) * 24, 0))"""
+# 勤務時間と残業時間を1回の UPDATE で計算する（SELECT して Python で計算する往復をなくす）
+SQL_CLOCK_OUT = f"""
+    UPDATE attendance SET
+    clock_out_time = :now,
+    total_work_hours = ROUND({_WORK_HOURS_EXPR}, 2),
+    overtime_hours = ROUND(MAX(0.0, {_WORK_HOURS_EXPR} - :standard_hours), 2),
+    status = '退勤',
+    updated_at = :now
+    WHERE user_id = :user_id AND work_date = :work_date AND clock_in_time IS NOT NULL
+"""
+
+# その他のクエリも同じ理由でモジュール定数にまとめる（{} は _insert_many が VALUES 行で埋める）
+SQL_INSERT_USER = """
+    INSERT INTO users (discord_id, username, display_name, email)
+    VALUES (?, ?, ?, ?)
+"""
+SQL_GET_OR_CREATE_USER = """
+    INSERT INTO users (discord_id, username, display_name)
+    VALUES (?, ?, ?)
+    ON CONFLICT(discord_id) DO UPDATE SET
+        username = excluded.username,
+        display_name = COALESCE(excluded.display_name, users.display_name),
+        updated_at = CURRENT_TIMESTAMP
+    RETURNING *
+"""
+SQL_INSERT_TASK = """
+    INSERT INTO tasks (user_id, title, description, priority, due_date)
+    VALUES (?, ?, ?, ?, ?)
+"""
+SQL_INSERT_TASKS_VALUES = """
+    INSERT INTO tasks (user_id, title, description, priority, due_date)
+    VALUES {}
+"""
+SQL_GET_USER_TASKS = """
+    SELECT * FROM tasks WHERE user_id = ?
+    ORDER BY priority_rank, due_date ASC
+"""
+SQL_GET_USER_TASKS_BY_STATUS = """
+    SELECT * FROM tasks WHERE user_id = ? AND status = ?
+    ORDER BY priority_rank, due_date ASC
+"""
+SQL_UPDATE_TASK_STATUS = """
+    UPDATE tasks SET
+    status = :status,
+    completed_at = CASE WHEN :status = '完了' THEN :now ELSE NULL END,
+    updated_at = :now
+    WHERE id = :task_id
+"""
+SQL_DELETE_TASK = "DELETE FROM tasks WHERE id = ?"
+SQL_GET_TASKS_DUE_SOON = """
+    SELECT t.*, u.discord_id, u.username
+    FROM tasks t
+    JOIN users u ON t.user_id = u.id
+    WHERE t.due_date <= date('now', '+' || ? || ' days')
+    AND t.status != '完了'
+    ORDER BY t.due_date ASC
+"""
+SQL_CLOCK_IN_UPSERT = """
+    INSERT INTO attendance
+    (user_id, work_date, clock_in_time, status, updated_at)
+    VALUES (?, ?, ?, '在席', ?)
+    ON CONFLICT(user_id, work_date) DO UPDATE SET
+        clock_in_time = excluded.clock_in_time,
+        status = '在席',
+        updated_at = excluded.updated_at
+"""
+SQL_UPSERT_ATTENDANCE_VALUES = """
+    INSERT INTO attendance
+    (user_id, work_date, clock_in_time, clock_out_time, total_work_hours,
+     overtime_hours, status, updated_at)
+    VALUES {}
+    ON CONFLICT(user_id, work_date) DO UPDATE SET
+        clock_in_time = excluded.clock_in_time,
+        clock_out_time = excluded.clock_out_time,
+        total_work_hours = excluded.total_work_hours,
+        overtime_hours = excluded.overtime_hours,
+        status = excluded.status,
+        updated_at = excluded.updated_at
+"""
+SQL_START_BREAK = """
+    UPDATE attendance SET
+    break_start_time = ?,
+    status = '休憩中',
+    updated_at = ?
+    WHERE user_id = ? AND work_date = ? AND clock_in_time IS NOT NULL
+"""
+SQL_END_BREAK = """
+    UPDATE attendance SET
+    break_end_time = ?,
+    status = '在席',
+    updated_at = ?
+    WHERE user_id = ? AND work_date = ? AND break_start_time IS NOT NULL
+"""
+SQL_GET_MONTHLY_ATTENDANCE = """
+    SELECT * FROM attendance
+    WHERE user_id = ? AND work_date >= ? AND work_date < ?
+    ORDER BY work_date
+"""
+_ATTENDANCE_RANGE_SELECT = """
+    SELECT a.work_date as date,
+           u.username, u.display_name,
+           a.clock_in_time, a.clock_out_time,
+           a.break_start_time, a.break_end_time,
+           COALESCE(a.total_break_minutes, 0) as total_break_minutes,
+           COALESCE(a.total_work_hours, 0) as total_work_hours,
+           COALESCE(a.overtime_hours, 0) as overtime_hours,
+           COALESCE(a.status, '') as status,
+           COALESCE(a.notes, '') as notes
+    FROM attendance a
+    JOIN users u ON a.user_id = u.id
+"""
+SQL_GET_ATTENDANCE_RANGE = _ATTENDANCE_RANGE_SELECT + """
+    WHERE a.work_date BETWEEN ? AND ?
+    ORDER BY a.work_date, u.username
+"""
+SQL_GET_ATTENDANCE_RANGE_FOR_USER = _ATTENDANCE_RANGE_SELECT + """
+    WHERE a.work_date BETWEEN ? AND ? AND a.user_id = ?
+    ORDER BY a.work_date, u.username
+"""
+SQL_UPSERT_SETTING = """
+    INSERT INTO settings (user_id, setting_key, setting_value)
+    VALUES (?, ?, ?)
+    ON CONFLICT(user_id, setting_key) DO UPDATE SET
+        setting_value = excluded.setting_value,
+        updated_at = CURRENT_TIMESTAMP
+"""
+SQL_GET_USER_SETTINGS = "SELECT setting_key, setting_value FROM settings WHERE user_id = ?"
+
+# 頻繁に参照される行のキャッシュ有効期限（秒）
+USER_CACHE_TTL = 300.0
+ATTENDANCE_CACHE_TTL = 5.0
+
+
 class DatabaseManager:
     """データベース操作管理クラス"""
     
     def __init__(self, db_path: str = None):
         self.db_path = db_path or Config.DATABASE_URL
+        self._pool = ConnectionPool(self._create_connection)
+        # 読み取り専用の接続はスレッドごとに別プールで持つ（インメモリDBは接続ごとに別DBになるため共有する）
+        if self.db_path == ':memory:':
+            self._reader_pool = self._pool
+        else:
+            self._reader_pool = ConnectionPool(self._create_reader_connection)
+        self._write_lock = threading.RLock()
         self.init_database()
+        # 長時間稼働で WAL が肥大化しないよう、定期的にチェックポイントと統計更新を行う
+        self._pool.start_maintenance()
     
-    @retry_on_lock()
-    def get_connection(self):
-        """データベース接続を取得"""
+    def _create_connection(self) -> sqlite3.Connection:
+        """新しい接続を作成して設定"""
         conn = sqlite3.connect(
             self.db_path,
             detect_types=sqlite3.PARSE_DECLTYPES,  # PARSE_COLNAMESを削除してタイムスタンプエラーを回避
-            timeout=30.0  # タイムアウトを30秒に設定
+            timeout=30.0,  # タイムアウトを30秒に設定（busy_timeoutとして適用される）
+            cached_statements=512,  # プール接続は長寿命なので準備済み文を多めに保持する
+            isolation_level=None,  # BEGINは transaction() が明示的に発行する
+            check_same_thread=False  # 接続はスレッドごとに分かれるが、終了時は別スレッドから閉じる
         )
-        conn.row_factory = sqlite3.Row  # 辞書形式でのアクセスを可能にする
+        configure_connection(conn)  # sqlite3.Row と PRAGMA を設定
+        return conn
+    
+    def _create_reader_connection(self) -> sqlite3.Connection:
+        """読み取り専用の接続を作成（誤って書き込むと SQLITE_READONLY になる）
+        
+        URI の mode=ro だと -shm の作成や WAL の復旧ができないため、通常どおり開いて query_only を設定する。
+        """
+        conn = self._create_connection()
+        conn.execute("PRAGMA query_only = ON")
         return conn
     
+    @retry_on_lock()
+    def get_connection(self):
+        """データベース接続を取得（スレッドごとにプールから再利用）"""
+        return self._pool.get()
+    
+    def get_reader(self) -> sqlite3.Connection:
+        """読み取り専用の接続を取得（WAL なので書き込み中でも並行して読める）"""
+        return self._reader_pool.get()
+    
+    @contextmanager
+    def get_writer(self):
+        """書き込み用の接続を取得
+        
+        プロセス内の書き込みをロックで1本ずつに直列化し、接続同士が SQLite の
+        書き込みロックを奪い合って busy 待ちになるのを避ける。
+        """
+        with self._write_lock:
+            yield self._pool.get()
+    
+    def close(self):
+        """プール内の接続を全て閉じる"""
+        self._reader_pool.close_all()
+        self._pool.close_all()
+    
     @handle_database_error
     def init_database(self):
         """データベースとテーブルの初期化"""
         conn = self.get_connection()
         try:
-            cursor = conn.cursor()
-            
-            # ユーザーテーブル
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS users (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    discord_id TEXT UNIQUE NOT NULL,
-                    username TEXT NOT NULL,
-                    display_name TEXT,
-                    email TEXT,
-                    is_admin BOOLEAN DEFAULT FALSE,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # 日報テーブル
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS daily_reports (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id INTEGER NOT NULL,
-                    report_date DATE NOT NULL,
-                    today_tasks TEXT,
-                    tomorrow_tasks TEXT,
-                    obstacles TEXT,
-                    comments TEXT,
-                    submitted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (user_id) REFERENCES users (id),
-                    UNIQUE(user_id, report_date)
-                )
-            ''')
-            
-            # タスクテーブル
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS tasks (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id INTEGER NOT NULL,
-                    title TEXT NOT NULL,
-                    description TEXT,
-                    priority TEXT CHECK(priority IN ('高', '中', '低')) DEFAULT '中',
-                    status TEXT CHECK(status IN ('未着手', '進行中', '完了', '中断')) DEFAULT '未着手',
-                    due_date DATE,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    completed_at TIMESTAMP NULL,
-                    FOREIGN KEY (user_id) REFERENCES users (id)
-                )
-            ''')
-            
-            # 出退勤テーブル
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS attendance (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id INTEGER NOT NULL,
-                    work_date DATE NOT NULL,
-                    clock_in_time TIMESTAMP,
-                    clock_out_time TIMESTAMP,
-                    break_start_time TIMESTAMP,
-                    break_end_time TIMESTAMP,
-                    total_work_hours REAL,
-                    overtime_hours REAL DEFAULT 0,
-                    status TEXT CHECK(status IN ('在席', '離席', '休憩中', '退勤')) DEFAULT '離席',
-                    notes TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (user_id) REFERENCES users (id),
-                    UNIQUE(user_id, work_date)
-                )
-            ''')
-            
-            # 設定テーブル
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS settings (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id INTEGER NOT NULL,
-                    setting_key TEXT NOT NULL,
-                    setting_value TEXT NOT NULL,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (user_id) REFERENCES users (id),
-                    UNIQUE(user_id, setting_key)
-                )
-            ''')
-            
-            conn.commit()
+            # 全テーブルの DDL を1回の executescript でまとめて実行
+            conn.executescript(SCHEMA_SQL)
+            self._add_generated_columns(conn)
             logger.info("データベースの初期化が完了しました")
-        finally:
-            conn.close()
+        except Exception:
+            # 初期化途中の接続は再利用しない
+            self._pool.close_all()
+            raise
+    
+    def _add_generated_columns(self, conn: sqlite3.Connection) -> None:
+        """既存のテーブルに不足している生成列と、それを使うインデックスを追加
+        
+        ALTER TABLE では STORED の生成列を追加できないため、既存テーブルには VIRTUAL で追加する。
+        """
+        for table, column, expr in GENERATED_COLUMNS:
+            columns = {row[1] for row in conn.execute(f"PRAGMA table_xinfo({table})")}
+            if column not in columns:
+                conn.execute(
+                    f"ALTER TABLE {table} ADD COLUMN {column} INTEGER "
+                    f"GENERATED ALWAYS AS ({expr}) VIRTUAL"
+                )
+        conn.executescript(GENERATED_COLUMN_INDEXES_SQL)
     
     def initialize_database(self):
         """データベースの初期化（互換性のためのエイリアス）"""
         self.init_database()
 
 
+def _insert_many(cursor: sqlite3.Cursor, query: str, rows: List[Tuple]) -> None:
+    """複数行の VALUES を使い、バインド変数の上限に収まる行数ずつ INSERT する
+    
+    query の {} には "(?, ?, ...), (?, ?, ...)" が埋め込まれる。
+    """
+    if not rows:
+        return
+    
+    width = len(rows[0])
+    row_placeholder = "(" + ", ".join("?" * width) + ")"
+    chunk_size = SQLITE_MAX_VARIABLES // width
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start:start + chunk_size]
+        sql = query.format(", ".join([row_placeholder] * len(chunk)))
+        safe_execute(cursor, sql, tuple(value for row in chunk for value in row))
+
+
 class UserRepository:
     """ユーザー関連のデータベース操作"""
     
     def __init__(self, db_manager: DatabaseManager):
         self.db_manager = db_manager
+        # メッセージごとに呼ばれる get_or_create_user 用（作成・更新時に破棄する）
+        self._user_cache = TTLCache(USER_CACHE_TTL)
     
-    @handle_database_error
-    @retry_on_lock()
+    @db_operation()
     def create_user(self, discord_id: str, username: str, display_name: str = None, email: str = None) -> int:
         """新しいユーザーを作成"""
         validate_required_fields({'discord_id': discord_id, 'username': username}, ['discord_id', 'username'])
@@ -156,36 +416,55 @@ class UserRepository:
         display_name = sanitize_string(display_name, 100)
         email = sanitize_string(email, 255)
         
-        with self.db_manager.get_connection() as conn:
+        with self.db_manager.get_writer() as conn:
             with transaction(conn) as cursor:
-                safe_execute(cursor, '''
-                    INSERT INTO users (discord_id, username, display_name, email)
-                    VALUES (?, ?, ?, ?)
-                ''', (discord_id, username, display_name, email))
-                return cursor.lastrowid
+                safe_execute(cursor, SQL_INSERT_USER, (discord_id, username, display_name, email))
+                user_id = cursor.lastrowid
+        self._user_cache.invalidate(discord_id)
+        return user_id
     
     @handle_database_error
     @log_query_performance
     def get_user_by_discord_id(self, discord_id: str) -> Optional[Dict[str, Any]]:
-        """Discord IDでユーザーを取得"""
-        with self.db_manager.get_connection() as conn:
+        """Discord IDでユーザーを取得（存在するユーザーは USER_CACHE_TTL 秒キャッシュする）"""
+        user = self._user_cache.get(discord_id)
+        if user is not None:
+            return user
+        
+        with self.db_manager.get_reader() as conn:
             cursor = conn.cursor()
-            safe_execute(cursor, 'SELECT * FROM users WHERE discord_id = ?', (discord_id,))
-            return fetch_one_as_dict(cursor)
+            safe_execute(cursor, SQL_GET_USER_BY_DISCORD_ID, (discord_id,))
+            user = fetch_one_as_dict(cursor)
+        if user is not None:
+            self._user_cache.set(discord_id, user)
+        return user
     
-    @handle_database_error
+    @db_operation()
     def get_or_create_user(self, discord_id: str, username: str, display_name: str = None) -> Dict[str, Any]:
-        """ユーザーを取得、存在しない場合は作成"""
-        user = self.get_user_by_discord_id(discord_id)
+        """ユーザーを取得、存在しない場合は作成
+        
+        キャッシュにない場合は UPSERT + RETURNING の1文で作成または取得し、
+        あわせてユーザー名と表示名を最新の値に更新する。
+        """
+        user = self._user_cache.get(discord_id)
+        if user is not None:
+            return user
+        
+        validate_required_fields({'discord_id': discord_id, 'username': username}, ['discord_id', 'username'])
+        discord_id = sanitize_string(discord_id, 50)
+        username = sanitize_string(username, 100)
+        display_name = sanitize_string(display_name, 100)
+        
+        with self.db_manager.get_writer() as conn:
+            with transaction(conn) as cursor:
+                safe_execute(cursor, SQL_GET_OR_CREATE_USER, (discord_id, username, display_name))
+                user = fetch_one_as_dict(cursor)
         if not user:
-            user_id = self.create_user(discord_id, username, display_name)
-            user = self.get_user_by_discord_id(discord_id)
-            if not user:
-                raise DatabaseError("ユーザーの作成後に取得できませんでした")
+            raise DatabaseError("ユーザーの作成後に取得できませんでした")
+        self._user_cache.set(discord_id, user)
         return user
     
-    @handle_database_error
-    @retry_on_lock()
+    @db_operation()
     def update_user(self, discord_id: str, **kwargs) -> bool:
         """ユーザー情報を更新"""
         if not kwargs:
@@ -202,10 +481,12 @@ class UserRepository:
         query, params = build_update_query('users', kwargs, 'discord_id = ?')
         params = list(params) + [discord_id]
         
-        with self.db_manager.get_connection() as conn:
+        with self.db_manager.get_writer() as conn:
             with transaction(conn) as cursor:
                 safe_execute(cursor, query, tuple(params))
-                return cursor.rowcount > 0
+                updated = cursor.rowcount > 0
+        self._user_cache.invalidate(discord_id)
+        return updated
 
 
 class TaskRepository:
@@ -214,8 +495,7 @@ class TaskRepository:
     def __init__(self, db_manager: DatabaseManager):
         self.db_manager = db_manager
     
-    @handle_database_error
-    @retry_on_lock()
+    @db_operation()
     def create_task(self, user_id: int, title: str, description: str = "", 
                    priority: str = "中", due_date: str = None) -> int:
         """新しいタスクを作成"""
@@ -227,75 +507,71 @@ class TaskRepository:
         if priority not in ['高', '中', '低']:
             priority = '中'
         
-        with self.db_manager.get_connection() as conn:
+        with self.db_manager.get_writer() as conn:
             with transaction(conn) as cursor:
-                safe_execute(cursor, '''
-                    INSERT INTO tasks (user_id, title, description, priority, due_date)
-                    VALUES (?, ?, ?, ?, ?)
-                ''', (user_id, title, description, priority, due_date))
+                safe_execute(cursor, SQL_INSERT_TASK, (user_id, title, description, priority, due_date))
                 return cursor.lastrowid
     
+    @db_operation()
+    def create_tasks_bulk(self, rows: List[Tuple]) -> int:
+        """複数のタスクを1トランザクションでまとめて作成
+        
+        rows は (user_id, title, description, priority, due_date) のタプルのリスト。
+        複数行の VALUES を使い、バインド変数の上限ごとにまとめて INSERT する。
+        """
+        values = []
+        for user_id, title, description, priority, due_date in rows:
+            validate_required_fields({'user_id': user_id, 'title': title}, ['user_id', 'title'])
+            if priority not in ['高', '中', '低']:
+                priority = '中'
+            values.append((user_id, sanitize_string(title, 200), sanitize_string(description, 1000),
+                           priority, due_date))
+        
+        with self.db_manager.get_writer() as conn:
+            with transaction(conn) as cursor:
+                _insert_many(cursor, SQL_INSERT_TASKS_VALUES, values)
+        return len(values)
+    
     @handle_database_error
     @log_query_performance
     def get_user_tasks(self, user_id: int, status: str = None) -> List[Dict[str, Any]]:
         """ユーザーのタスク一覧を取得"""
-        with self.db_manager.get_connection() as conn:
+        with self.db_manager.get_reader() as conn:
             cursor = conn.cursor()
             if status:
-                safe_execute(cursor, '''
-                    SELECT * FROM tasks WHERE user_id = ? AND status = ?
-                    ORDER BY 
-                        CASE priority WHEN '高' THEN 1 WHEN '中' THEN 2 WHEN '低' THEN 3 END,
-                        due_date ASC
-                ''', (user_id, status))
+                safe_execute(cursor, SQL_GET_USER_TASKS_BY_STATUS, (user_id, status))
             else:
-                safe_execute(cursor, '''
-                    SELECT * FROM tasks WHERE user_id = ?
-                    ORDER BY 
-                        CASE priority WHEN '高' THEN 1 WHEN '中' THEN 2 WHEN '低' THEN 3 END,
-                        due_date ASC
-                ''', (user_id,))
+                safe_execute(cursor, SQL_GET_USER_TASKS, (user_id,))
             return fetch_all_as_dict(cursor)
     
-    @handle_database_error
-    @retry_on_lock()
+    @db_operation()
     def update_task_status(self, task_id: int, status: str) -> bool:
         """タスクのステータスを更新"""
         if status not in ['未着手', '進行中', '完了', '中断']:
             raise ValueError(f"無効なステータス: {status}")
         
-        with self.db_manager.get_connection() as conn:
+        params = {'status': status, 'now': now_jst().isoformat(), 'task_id': task_id}
+        
+        with self.db_manager.get_writer() as conn:
             with transaction(conn) as cursor:
-                completed_at = now_jst() if status == '完了' else None
-                safe_execute(cursor, '''
-                    UPDATE tasks SET status = ?, completed_at = ?, updated_at = ?
-                    WHERE id = ?
-                ''', (status, completed_at, now_jst(), task_id))
+                safe_execute(cursor, SQL_UPDATE_TASK_STATUS, params)
                 return cursor.rowcount > 0
     
-    @handle_database_error
-    @retry_on_lock()
+    @db_operation()
     def delete_task(self, task_id: int) -> bool:
         """タスクを削除"""
-        with self.db_manager.get_connection() as conn:
+        with self.db_manager.get_writer() as conn:
             with transaction(conn) as cursor:
-                safe_execute(cursor, 'DELETE FROM tasks WHERE id = ?', (task_id,))
+                safe_execute(cursor, SQL_DELETE_TASK, (task_id,))
                 return cursor.rowcount > 0
     
     @handle_database_error
     @log_query_performance
     def get_tasks_due_soon(self, days: int = 1) -> List[Dict[str, Any]]:
         """期限が近いタスクを取得"""
-        with self.db_manager.get_connection() as conn:
+        with self.db_manager.get_reader() as conn:
             cursor = conn.cursor()
-            safe_execute(cursor, '''
-                SELECT t.*, u.discord_id, u.username 
-                FROM tasks t
-                JOIN users u ON t.user_id = u.id
-                WHERE t.due_date <= date('now', '+' || ? || ' days')
-                AND t.status != '完了'
-                ORDER BY t.due_date ASC
-            ''', (days,))
+            safe_execute(cursor, SQL_GET_TASKS_DUE_SOON, (days,))
             return fetch_all_as_dict(cursor)
 
 
@@ -304,212 +580,190 @@ class AttendanceRepository:
     
     def __init__(self, db_manager: DatabaseManager):
         self.db_manager = db_manager
+        # (user_id, work_date) ごとの get_today_attendance の結果（記録更新時に破棄する）
+        self._today_cache = TTLCache(ATTENDANCE_CACHE_TTL)
     
-    @handle_database_error
-    @retry_on_lock()
+    @db_operation()
     def clock_in(self, user_id: int, work_date: str = None) -> bool:
         """出勤記録"""
         if work_date is None:
-            work_date = today_jst().isoformat()
+            work_date = today_jst_iso()
         
-        now = now_jst()
+        now = now_jst().isoformat()
         
-        with self.db_manager.get_connection() as conn:
+        with self.db_manager.get_writer() as conn:
             with transaction(conn) as cursor:
-                safe_execute(cursor, '''
-                    INSERT OR REPLACE INTO attendance 
-                    (user_id, work_date, clock_in_time, status, updated_at)
-                    VALUES (?, ?, ?, '在席', ?)
-                ''', (user_id, work_date, now.isoformat(), now.isoformat()))
-                return cursor.rowcount > 0
+                safe_execute(cursor, SQL_CLOCK_IN_UPSERT, (user_id, work_date, now, now))
+                updated = cursor.rowcount > 0
+        self._today_cache.invalidate((user_id, work_date))
+        return updated
     
-    @handle_database_error
-    @retry_on_lock()
+    @db_operation()
+    def bulk_upsert_attendance(self, rows: List[Tuple]) -> int:
+        """複数日の出退勤記録を1トランザクションでまとめて登録（既存の記録は行内で更新する）
+        
+        rows は (user_id, work_date, clock_in_time, clock_out_time, total_work_hours,
+        overtime_hours, status) のタプルのリスト。
+        """
+        now = now_jst().isoformat()
+        values = [tuple(row) + (now,) for row in rows]
+        
+        with self.db_manager.get_writer() as conn:
+            with transaction(conn) as cursor:
+                _insert_many(cursor, SQL_UPSERT_ATTENDANCE_VALUES, values)
+        self._today_cache.clear()
+        return len(values)
+    
+    @db_operation()
     def clock_out(self, user_id: int, work_date: str = None) -> bool:
         """退勤記録"""
         if work_date is None:
-            work_date = today_jst().isoformat()
+            work_date = today_jst_iso()
         
-        now = now_jst()
+        params = {
+            'now': now_jst().isoformat(),
+            'standard_hours': 8.0,
+            'user_id': user_id,
+            'work_date': work_date,
+        }
         
-        with self.db_manager.get_connection() as conn:
+        with self.db_manager.get_writer() as conn:
             with transaction(conn) as cursor:
-                # 既存の出勤記録を取得
-                safe_execute(cursor, '''
-                    SELECT clock_in_time, break_start_time, break_end_time 
-                    FROM attendance 
-                    WHERE user_id = ? AND work_date = ?
-                ''', (user_id, work_date))
-                
-                record = fetch_one_as_dict(cursor)
-                if not record or not record['clock_in_time']:
-                    return False
-                
-                # 勤務時間を計算
-                total_hours = calculate_work_hours(
-                    record['clock_in_time'],
-                    now,
-                    record['break_start_time'],
-                    record['break_end_time']
-                )
-                
-                # 残業時間を計算
-                overtime_hours = calculate_overtime_hours(total_hours)
-                
-                safe_execute(cursor, '''
-                    UPDATE attendance SET 
-                    clock_out_time = ?, 
-                    total_work_hours = ?, 
-                    overtime_hours = ?,
-                    status = '退勤',
-                    updated_at = ?
-                    WHERE user_id = ? AND work_date = ?
-                ''', (now.isoformat(), total_hours, overtime_hours, now.isoformat(), user_id, work_date))
-                
-                return cursor.rowcount > 0
+                # 出勤記録がなければ0行更新となり False を返す
+                safe_execute(cursor, SQL_CLOCK_OUT, params)
+                updated = cursor.rowcount > 0
+        self._today_cache.invalidate((user_id, work_date))
+        return updated
     
-    @handle_database_error
-    @retry_on_lock()
+    @db_operation()
     def start_break(self, user_id: int, work_date: str = None) -> bool:
         """休憩開始"""
         if work_date is None:
-            work_date = today_jst().isoformat()
+            work_date = today_jst_iso()
         
-        now = now_jst()
+        now = now_jst().isoformat()
         
-        with self.db_manager.get_connection() as conn:
+        with self.db_manager.get_writer() as conn:
             with transaction(conn) as cursor:
-                safe_execute(cursor, '''
-                    UPDATE attendance SET 
-                    break_start_time = ?, 
-                    status = '休憩中',
-                    updated_at = ?
-                    WHERE user_id = ? AND work_date = ? AND clock_in_time IS NOT NULL
-                ''', (now.isoformat(), now.isoformat(), user_id, work_date))
-                return cursor.rowcount > 0
+                safe_execute(cursor, SQL_START_BREAK, (now, now, user_id, work_date))
+                updated = cursor.rowcount > 0
+        self._today_cache.invalidate((user_id, work_date))
+        return updated
     
-    @handle_database_error
-    @retry_on_lock()
+    @db_operation()
     def end_break(self, user_id: int, work_date: str = None) -> bool:
         """休憩終了"""
         if work_date is None:
-            work_date = today_jst().isoformat()
+            work_date = today_jst_iso()
         
-        now = now_jst()
+        now = now_jst().isoformat()
         
-        with self.db_manager.get_connection() as conn:
+        with self.db_manager.get_writer() as conn:
             with transaction(conn) as cursor:
-                safe_execute(cursor, '''
-                    UPDATE attendance SET 
-                    break_end_time = ?, 
-                    status = '在席',
-                    updated_at = ?
-                    WHERE user_id = ? AND work_date = ? AND break_start_time IS NOT NULL
-                ''', (now.isoformat(), now.isoformat(), user_id, work_date))
-                return cursor.rowcount > 0
+                safe_execute(cursor, SQL_END_BREAK, (now, now, user_id, work_date))
+                updated = cursor.rowcount > 0
+        self._today_cache.invalidate((user_id, work_date))
+        return updated
     
     @handle_database_error
     @log_query_performance
     def get_today_attendance(self, user_id: int, work_date: str = None) -> Optional[Dict[str, Any]]:
-        """今日の出退勤記録を取得"""
+        """今日の出退勤記録を取得（ATTENDANCE_CACHE_TTL 秒キャッシュする）"""
         if work_date is None:
-            work_date = today_jst().isoformat()
+            work_date = today_jst_iso()
         
-        with self.db_manager.get_connection() as conn:
+        key = (user_id, work_date)
+        record = self._today_cache.get(key)
+        if record is not None:
+            return record
+        
+        with self.db_manager.get_reader() as conn:
             cursor = conn.cursor()
-            safe_execute(cursor, '''
-                SELECT * FROM attendance 
-                WHERE user_id = ? AND work_date = ?
-            ''', (user_id, work_date))
-            return fetch_one_as_dict(cursor)
+            safe_execute(cursor, SQL_GET_TODAY_ATTENDANCE, key)
+            record = fetch_one_as_dict(cursor)
+        if record is not None:
+            self._today_cache.set(key, record)
+        return record
     
     @handle_database_error
     @log_query_performance
-    def get_monthly_attendance(self, user_id: int, year: int, month: int) -> List[Dict[str, Any]]:
-        """月次出退勤記録を取得"""
+    def get_monthly_attendance(self, user_id: int, year: int, month: int) -> List[sqlite3.Row]:
+        """月次出退勤記録を取得（集計用に sqlite3.Row のまま返す）"""
         start_date = f"{year}-{month:02d}-01"
         if month == 12:
             end_date = f"{year + 1}-01-01"
         else:
             end_date = f"{year}-{month + 1:02d}-01"
         
-        with self.db_manager.get_connection() as conn:
+        with self.db_manager.get_reader() as conn:
             cursor = conn.cursor()
-            safe_execute(cursor, '''
-                SELECT * FROM attendance 
-                WHERE user_id = ? AND work_date >= ? AND work_date < ?
-                ORDER BY work_date
-            ''', (user_id, start_date, end_date))
-            return fetch_all_as_dict(cursor)
+            safe_execute(cursor, SQL_GET_MONTHLY_ATTENDANCE, (user_id, start_date, end_date))
+            return fetch_all_rows(cursor)
     
     @handle_database_error
     @log_query_performance
-    def get_all_users_status(self) -> List[Dict[str, Any]]:
-        """全ユーザーの現在の勤怠状況を取得"""
-        today = today_jst().isoformat()
+    def get_all_users_status(self) -> List[sqlite3.Row]:
+        """全ユーザーの現在の勤怠状況を取得（sqlite3.Row のまま返す）"""
+        today = today_jst_iso()
         
-        with self.db_manager.get_connection() as conn:
+        with self.db_manager.get_reader() as conn:
             cursor = conn.cursor()
-            safe_execute(cursor, '''
-                SELECT u.discord_id, u.username, u.display_name, 
-                       COALESCE(a.status, '離席') as status,
-                       a.clock_in_time, a.clock_out_time
-                FROM users u
-                LEFT JOIN attendance a ON u.id = a.user_id AND a.work_date = ?
-            ''', (today,))
-            return fetch_all_as_dict(cursor)
+            safe_execute(cursor, SQL_GET_ALL_USERS_STATUS, (today,))
+            return fetch_all_rows(cursor)
     
     @handle_database_error
     @log_query_performance
     def get_attendance_range(self, start_date: str, end_date: str, user_id: int = None) -> List[Dict[str, Any]]:
         """指定期間の勤怠データを取得（CSV出力用）"""
-        with self.db_manager.get_connection() as conn:
+        return list(self.iter_attendance_range(start_date, end_date, user_id))
+    
+    def iter_attendance_range(self, start_date: str, end_date: str, user_id: int = None) -> Iterator[Dict[str, Any]]:
+        """指定期間の勤怠データを1行ずつ返す（結果全体をメモリに載せずにCSVへ書き出す用）
+        
+        ジェネレーターのため handle_database_error は通らず、取得中のエラーは sqlite3 の例外のまま送出される。
+        """
+        with self.db_manager.get_reader() as conn:
             cursor = conn.cursor()
             
             if user_id:
                 # 特定ユーザーのデータ
-                safe_execute(cursor, '''
-                    SELECT a.work_date as date, 
-                           u.username, u.display_name,
-                           a.clock_in_time, a.clock_out_time,
-                           a.break_start_time, a.break_end_time,
-                           CASE 
-                               WHEN a.break_start_time IS NOT NULL AND a.break_end_time IS NOT NULL
-                               THEN CAST((julianday(a.break_end_time) - julianday(a.break_start_time)) * 24 * 60 AS INTEGER)
-                               ELSE 0
-                           END as total_break_minutes,
-                           COALESCE(a.total_work_hours, 0) as total_work_hours,
-                           COALESCE(a.overtime_hours, 0) as overtime_hours,
-                           COALESCE(a.status, '') as status,
-                           COALESCE(a.notes, '') as notes
-                    FROM attendance a
-                    JOIN users u ON a.user_id = u.id
-                    WHERE a.work_date BETWEEN ? AND ? AND a.user_id = ?
-                    ORDER BY a.work_date, u.username
-                ''', (start_date, end_date, user_id))
+                safe_execute(cursor, SQL_GET_ATTENDANCE_RANGE_FOR_USER, (start_date, end_date, user_id))
             else:
                 # 全ユーザーのデータ
-                safe_execute(cursor, '''
-                    SELECT a.work_date as date, 
-                           u.username, u.display_name,
-                           a.clock_in_time, a.clock_out_time,
-                           a.break_start_time, a.break_end_time,
-                           CASE 
-                               WHEN a.break_start_time IS NOT NULL AND a.break_end_time IS NOT NULL
-                               THEN CAST((julianday(a.break_end_time) - julianday(a.break_start_time)) * 24 * 60 AS INTEGER)
-                               ELSE 0
-                           END as total_break_minutes,
-                           COALESCE(a.total_work_hours, 0) as total_work_hours,
-                           COALESCE(a.overtime_hours, 0) as overtime_hours,
-                           COALESCE(a.status, '') as status,
-                           COALESCE(a.notes, '') as notes
-                    FROM attendance a
-                    JOIN users u ON a.user_id = u.id
-                    WHERE a.work_date BETWEEN ? AND ?
-                    ORDER BY a.work_date, u.username
-                ''', (start_date, end_date))
+                safe_execute(cursor, SQL_GET_ATTENDANCE_RANGE, (start_date, end_date))
             
-            return fetch_all_as_dict(cursor)
+            yield from iter_rows_as_dict(cursor)
+
+
+class SettingsRepository:
+    """ユーザー設定関連のデータベース操作"""
+    
+    def __init__(self, db_manager: DatabaseManager):
+        self.db_manager = db_manager
+    
+    @db_operation()
+    def upsert_many(self, user_id: int, settings: Dict[str, Any]) -> int:
+        """複数の設定を1トランザクションでまとめて登録・更新
+        
+        1リクエストで複数の設定を変更しても、コミット（fsync）は1回で済む。
+        """
+        rows = [(user_id, sanitize_string(key, 100), str(value)) for key, value in settings.items()]
+        if not rows:
+            return 0
+        
+        with self.db_manager.get_writer() as conn:
+            with transaction(conn) as cursor:
+                cursor.executemany(SQL_UPSERT_SETTING, rows)
+        return len(rows)
+    
+    @handle_database_error
+    @log_query_performance
+    def get_settings(self, user_id: int) -> Dict[str, str]:
+        """ユーザーの設定をキーと値の辞書で取得"""
+        with self.db_manager.get_reader() as conn:
+            cursor = conn.cursor()
+            safe_execute(cursor, SQL_GET_USER_SETTINGS, (user_id,))
+            return {row['setting_key']: row['setting_value'] for row in fetch_all_rows(cursor)}
 
 
 # データベースマネージャーのインスタンスを作成（テスト時以外）
@@ -520,7 +774,8 @@ def get_default_instances():
         'db_manager': db_manager,
         'user_repo': UserRepository(db_manager),
         'task_repo': TaskRepository(db_manager),
-        'attendance_repo': AttendanceRepository(db_manager)
+        'attendance_repo': AttendanceRepository(db_manager),
+        'settings_repo': SettingsRepository(db_manager)
     }
 
 
@@ -534,6 +789,7 @@ if __name__ != '__main__':
         user_repo = _instances['user_repo']
         task_repo = _instances['task_repo']
         attendance_repo = _instances['attendance_repo']
+        settings_repo = _instances['settings_repo']
         
         # Check for Discord token and warn if missing
         if not os.getenv('DISCORD_TOKEN'):
@@ -550,4 +806,5 @@ if __name__ != '__main__':
         user_repo = None
         daily_report_repo = None
         task_repo = None
-        attendance_repo = None 
\ No newline at end of file
+        attendance_repo = None
+        settings_repo = None 
\ No newline at end of file
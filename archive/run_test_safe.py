@@ -10,16 +10,14 @@ import unittest
 import importlib.util
 from unittest.mock import MagicMock, patch
 
-# プロジェクトルートをパスに追加
-sys.path.insert(0, os.path.abspath('.'))
+# プロジェクトルートのパスと環境変数を設定
+from test_env import print_traceback
 
-# 環境変数設定
-os.environ.setdefault('DISCORD_TOKEN', 'test_token_12345')
-os.environ.setdefault('DISCORD_GUILD_ID', '123456789')
-os.environ.setdefault('DATABASE_URL', 'test_discord_bot.db')
-os.environ.setdefault('ENVIRONMENT', 'test')
-os.environ.setdefault('TIMEZONE', 'Asia/Tokyo')
-os.environ.setdefault('LOG_LEVEL', 'INFO')
+# setup_mocks() が sys.modules に差し込むモジュール名
+_MOCKED_MODULES = frozenset({
+    'dotenv', 'discord', 'discord.ext', 'discord.ext.commands', 'flask', 'Flask',
+    'pytz', 'googleapiclient', 'google.auth'
+})
 
 # 外部依存のモック設定
 def setup_mocks():
@@ -59,6 +57,10 @@ def setup_mocks():
     # google-api モック
     sys.modules['googleapiclient'] = MagicMock()
     sys.modules['google.auth'] = MagicMock()
+    
+    # 作成したモックを保存しておき、テストファイル間では作り直さずに戻す
+    return {name: module for name, module in sys.modules.items()
+            if name in _MOCKED_MODULES}
 
 def run_test_module(test_file):
     """指定されたテストモジュールを実行"""
@@ -80,15 +82,14 @@ def run_test_module(test_file):
         
     except Exception as e:
         print(f"❌ テスト実行エラー: {e}")
-        import traceback
-        traceback.print_exc()
+        print_traceback()
         return None
 
 if __name__ == "__main__":
     print("🧪 安全なテスト実行開始")
     
-    # モック設定
-    setup_mocks()
+    # モック設定（1回だけ作成）
+    mock_snapshot = setup_mocks()
     
     # テストファイルリスト
     test_files = [
@@ -105,6 +106,8 @@ if __name__ == "__main__":
             print(f"🧪 実行中: {test_file}")
             print(f"{'='*60}")
             
+            # 前のテストファイルが差し替えたモックを元に戻す
+            sys.modules.update(mock_snapshot)
             result = run_test_module(test_file)
             
             if result:
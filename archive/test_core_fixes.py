@@ -5,12 +5,15 @@ Discord依存のない部分の修正を検証します。
 """
 
 import sys
-import os
 from datetime import datetime, date
-import traceback
 
-# プロジェクトルートをパスに追加
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+# プロジェクトルートのパスと環境変数を設定
+from test_env import print_traceback
+
+class MockCursor:
+    """safe_execute 検証用のカーソル（実行内容を文字列で返す）"""
+    def execute(self, query, params):
+        return f"executed: {query} with {params}"
 
 def test_enhanced_datetime_functions():
     """強化された日時処理関数のテスト"""
@@ -97,7 +100,7 @@ def test_enhanced_datetime_functions():
         
     except Exception as e:
         print(f"❌ 強化された日時処理エラー: {e}")
-        traceback.print_exc()
+        print_traceback()
         return False
 
 def test_database_utils_improvements():
@@ -129,10 +132,6 @@ def test_database_utils_improvements():
         print("\n📝 safe_execute関数の改善:")
         
         # モックオブジェクトでテスト
-        class MockCursor:
-            def execute(self, query, params):
-                return f"executed: {query} with {params}"
-        
         mock_cursor = MockCursor()
         result = safe_execute(mock_cursor, "SELECT * FROM test WHERE id = ?", (1,))
         print(f"  mock実行結果: {result}")
@@ -141,7 +140,7 @@ def test_database_utils_improvements():
         
     except Exception as e:
         print(f"❌ データベースユーティリティ改善エラー: {e}")
-        traceback.print_exc()
+        print_traceback()
         return False
 
 def test_compatibility_scenarios():
@@ -188,7 +187,7 @@ def test_compatibility_scenarios():
         
     except Exception as e:
         print(f"❌ 互換性シナリオエラー: {e}")
-        traceback.print_exc()
+        print_traceback()
         return False
 
 def test_error_handling_improvements():
@@ -227,7 +226,7 @@ def test_error_handling_improvements():
         
     except Exception as e:
         print(f"❌ エラーハンドリング改善エラー: {e}")
-        traceback.print_exc()
+        print_traceback()
         return False
 
 def main():
@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""
+テストスクリプト共通の環境セットアップ
+プロジェクトルートの sys.path 追加とテスト用環境変数の設定をまとめて行う
+"""
+
+import os
+import sys
+import traceback
+
+# プロジェクトルートをパスに追加
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+# 必要な環境変数を設定（既に設定されている値は上書きしない）
+os.environ.setdefault('DISCORD_TOKEN', 'test_token_12345')
+os.environ.setdefault('DISCORD_GUILD_ID', '123456789')
+os.environ.setdefault('DATABASE_URL', 'test_discord_bot.db')
+os.environ.setdefault('ENVIRONMENT', 'test')
+os.environ.setdefault('TIMEZONE', 'Asia/Tokyo')
+os.environ.setdefault('LOG_LEVEL', 'INFO')
+
+# VERBOSE を設定したときだけ失敗時のスタックトレースを出力する
+VERBOSE = bool(os.environ.get('VERBOSE'))
+
+
+def print_traceback():
+    """処理中の例外のスタックトレースを出力（VERBOSE のときのみ整形する）"""
+    if VERBOSE:
+        traceback.print_exc()
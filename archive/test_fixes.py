@@ -5,12 +5,10 @@
 """
 
 import sys
-import os
 from datetime import datetime, date
-import traceback
 
-# プロジェクトルートをパスに追加
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+# プロジェクトルートのパスと環境変数を設定
+from test_env import print_traceback
 
 def test_datetime_utils():
     """日時ユーティリティの修正確認"""
@@ -55,7 +53,7 @@ def test_datetime_utils():
         
     except Exception as e:
         print(f"❌ 日時ユーティリティエラー: {e}")
-        traceback.print_exc()
+        print_traceback()
         return False
 
 def test_database_utils():
@@ -95,7 +93,7 @@ def test_database_utils():
         
     except Exception as e:
         print(f"❌ データベースユーティリティエラー: {e}")
-        traceback.print_exc()
+        print_traceback()
         return False
 
 def test_admin_command_import():
@@ -116,7 +114,7 @@ def test_admin_command_import():
         
     except Exception as e:
         print(f"❌ adminコマンドエラー: {e}")
-        traceback.print_exc()
+        print_traceback()
         return False
 
 def test_attendance_command_import():
@@ -137,7 +135,7 @@ def test_attendance_command_import():
         
     except Exception as e:
         print(f"❌ attendanceコマンドエラー: {e}")
-        traceback.print_exc()
+        print_traceback()
         return False
 
 def test_task_manager_import():
@@ -158,7 +156,7 @@ def test_task_manager_import():
         
     except Exception as e:
         print(f"❌ task_managerコマンドエラー: {e}")
-        traceback.print_exc()
+        print_traceback()
         return False
 
 def main():
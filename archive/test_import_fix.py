@@ -6,14 +6,70 @@ Test script to verify all import issues are fixed
 import sys
 import os
 import logging
-from pathlib import Path
+import types
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Add project root to path
-sys.path.insert(0, str(Path(__file__).parent))
+# Project root on sys.path and test environment variables
+import test_env  # noqa: F401
+
+def _install_discord_mocks():
+    """Register lightweight discord stand-ins in sys.modules (once per process)"""
+    if 'discord' in sys.modules:
+        return
+    
+    # Create mock discord module  
+    mock_discord = types.ModuleType('discord')
+    mock_discord.Embed = type('Embed', (), {})
+    mock_discord.Color = type('Color', (), {
+        'green': lambda: 0x00ff00,
+        'red': lambda: 0xff0000, 
+        'blue': lambda: 0x0000ff,
+        'orange': lambda: 0xffa500,
+        'gold': lambda: 0xffd700
+    })
+    mock_discord.ButtonStyle = type('ButtonStyle', (), {
+        'green': 1,
+        'red': 2,
+        'secondary': 3
+    })
+    mock_discord.Intents = type('Intents', (), {
+        'default': lambda: type('Instance', (), {'message_content': True, 'members': True})()
+    })
+    mock_discord.Activity = type('Activity', (), {})
+    mock_discord.ActivityType = type('ActivityType', (), {'watching': 1})
+    mock_discord.Interaction = type('Interaction', (), {})
+    
+    # Create mock ui module
+    mock_ui = types.ModuleType('ui')
+    mock_ui.View = type('View', (), {})
+    mock_ui.button = lambda **kwargs: lambda f: f
+    mock_ui.Button = type('Button', (), {})
+    mock_discord.ui = mock_ui
+    
+    # Create mock ext module
+    mock_ext = types.ModuleType('ext')
+    mock_commands = types.ModuleType('commands')
+    mock_commands.Cog = type('Cog', (), {})
+    mock_commands.command = lambda **kwargs: lambda f: f
+    mock_commands.group = lambda **kwargs: lambda f: f
+    mock_commands.Context = type('Context', (), {})
+    mock_commands.Bot = type('Bot', (), {})
+    mock_commands.has_permissions = lambda **kwargs: lambda f: f
+    mock_commands.CommandNotFound = type('CommandNotFound', (Exception,), {})
+    mock_commands.MissingRequiredArgument = type('MissingRequiredArgument', (Exception,), {})
+    mock_commands.BadArgument = type('BadArgument', (Exception,), {})
+    mock_commands.CommandOnCooldown = type('CommandOnCooldown', (Exception,), {})
+    mock_ext.commands = mock_commands
+    mock_discord.ext = mock_ext
+    
+    # Register in sys.modules
+    sys.modules['discord'] = mock_discord
+    sys.modules['discord.ext'] = mock_ext
+    sys.modules['discord.ext.commands'] = mock_commands
+    sys.modules['discord.ui'] = mock_ui
 
 def test_imports():
     """Test all critical imports that were failing"""
@@ -54,62 +110,10 @@ def test_imports():
     test_import("Database utilities import", lambda: __import__('bot.utils.database_utils'))
     
     # Test 6: Command modules import (should work now)
+    # The three command modules share one set of discord mocks
+    _install_discord_mocks()
+    
     def test_attendance_import():
-        # Mock discord modules properly
-        import types
-        
-        # Create mock discord module  
-        mock_discord = types.ModuleType('discord')
-        mock_discord.Embed = type('Embed', (), {})
-        mock_discord.Color = type('Color', (), {
-            'green': lambda: 0x00ff00,
-            'red': lambda: 0xff0000, 
-            'blue': lambda: 0x0000ff,
-            'orange': lambda: 0xffa500,
-            'gold': lambda: 0xffd700
-        })
-        mock_discord.ButtonStyle = type('ButtonStyle', (), {
-            'green': 1,
-            'red': 2,
-            'secondary': 3
-        })
-        mock_discord.Intents = type('Intents', (), {
-            'default': lambda: type('Instance', (), {'message_content': True, 'members': True})()
-        })
-        mock_discord.Activity = type('Activity', (), {})
-        mock_discord.ActivityType = type('ActivityType', (), {'watching': 1})
-        mock_discord.Interaction = type('Interaction', (), {})
-        
-        # Create mock ui module
-        mock_ui = types.ModuleType('ui')
-        mock_ui.View = type('View', (), {})
-        mock_ui.button = lambda **kwargs: lambda f: f
-        mock_ui.Button = type('Button', (), {})
-        mock_discord.ui = mock_ui
-        
-        # Create mock ext module
-        mock_ext = types.ModuleType('ext')
-        mock_commands = types.ModuleType('commands')
-        mock_commands.Cog = type('Cog', (), {})
-        mock_commands.command = lambda **kwargs: lambda f: f
-        mock_commands.group = lambda **kwargs: lambda f: f
-        mock_commands.Context = type('Context', (), {})
-        mock_commands.Bot = type('Bot', (), {})
-        mock_commands.has_permissions = lambda **kwargs: lambda f: f
-        mock_commands.CommandNotFound = type('CommandNotFound', (Exception,), {})
-        mock_commands.MissingRequiredArgument = type('MissingRequiredArgument', (Exception,), {})
-        mock_commands.BadArgument = type('BadArgument', (Exception,), {})
-        mock_commands.CommandOnCooldown = type('CommandOnCooldown', (Exception,), {})
-        mock_ext.commands = mock_commands
-        mock_discord.ext = mock_ext
-        
-        # Register in sys.modules
-        sys.modules['discord'] = mock_discord
-        sys.modules['discord.ext'] = mock_ext
-        sys.modules['discord.ext.commands'] = mock_commands
-        sys.modules['discord.ui'] = mock_ui
-        
-        # Now try to import the attendance module
         import bot.commands.attendance
         return True
     
@@ -4,17 +4,11 @@
 外部依存なしでテストを実行するためのモック
 """
 
-import os
 import sys
 from unittest.mock import MagicMock
 
-# 必要な環境変数を設定
-os.environ.setdefault('DISCORD_TOKEN', 'test_token_12345')
-os.environ.setdefault('DISCORD_GUILD_ID', '123456789')
-os.environ.setdefault('DATABASE_URL', 'test_discord_bot.db')
-os.environ.setdefault('ENVIRONMENT', 'test')
-os.environ.setdefault('TIMEZONE', 'Asia/Tokyo')
-os.environ.setdefault('LOG_LEVEL', 'INFO')
+# パスと環境変数は共通のセットアップを使う
+import test_env  # noqa: F401
 
 # dotenvモジュールのモック
 class MockDotenv:
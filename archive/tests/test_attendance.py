@@ -355,10 +355,10 @@ class TestAttendanceCSVExport(unittest.TestCase):
     
     def test_csv_japanese_timezone(self):
         """CSV出力での日本時間テスト"""
-        import pytz
+        from zoneinfo import ZoneInfo
         
         # 日本時間の設定
-        jst = pytz.timezone('Asia/Tokyo')
+        jst = ZoneInfo('Asia/Tokyo')
         now_jst = datetime.now(jst)
         
         # タイムゾーンが正しく設定されていることを確認
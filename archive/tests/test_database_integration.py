@@ -22,7 +22,7 @@ os.environ.setdefault('ENVIRONMENT', 'test')
 # プロジェクトルートをパスに追加
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from database import DatabaseManager, UserRepository, TaskRepository, AttendanceRepository
+from database import DatabaseManager, UserRepository, TaskRepository, AttendanceRepository, SettingsRepository
 
 
 class TestDatabaseIntegration(unittest.TestCase):
@@ -169,6 +169,26 @@ class TestDatabaseIntegration(unittest.TestCase):
         due_soon_tasks = self.task_repo.get_tasks_due_soon(days=2)
         self.assertEqual(len(due_soon_tasks), 2)  # 完了済みを除く2件
     
+    def test_bulk_inserts(self):
+        """複数行VALUESによる一括登録のテスト"""
+        # バインド変数の上限をまたぐ件数
+        rows = [(self.test_user_id, f"一括タスク{i}", "", "高", None) for i in range(450)]
+        self.assertEqual(self.task_repo.create_tasks_bulk(rows), 450)
+        self.assertEqual(len(self.task_repo.get_user_tasks(self.test_user_id)), 450)
+        
+        start = date.today() - timedelta(days=3)
+        attendance_rows = [
+            (self.test_user2_id, (start + timedelta(days=i)).isoformat(),
+             None, None, 8.0, 0.0, '退勤')
+            for i in range(3)
+        ]
+        self.assertEqual(self.attendance_repo.bulk_upsert_attendance(attendance_rows), 3)
+        records = self.attendance_repo.get_attendance_range(
+            start.isoformat(), date.today().isoformat(), self.test_user2_id
+        )
+        self.assertEqual(len(records), 3)
+        self.assertTrue(all(record['total_work_hours'] == 8.0 for record in records))
+    
     def test_concurrent_database_operations(self):
         """並行データベース操作のテスト"""
         today = date.today().isoformat()
@@ -261,7 +281,60 @@ class TestDatabaseIntegration(unittest.TestCase):
         # 重複する出勤記録
         self.attendance_repo.clock_in(self.test_user_id, today)
         result = self.attendance_repo.clock_in(self.test_user_id, today)  # 再度出勤
-        self.assertTrue(result)  # INSERT OR REPLACEで成功するはず
+        self.assertTrue(result)  # UPSERTで既存行を更新して成功するはず
+    
+    def test_clock_in_again_keeps_break_times(self):
+        """再出勤しても休憩記録が消えないことのテスト"""
+        today = date.today().isoformat()
+        self.attendance_repo.clock_in(self.test_user_id, today)
+        self.attendance_repo.start_break(self.test_user_id, today)
+        
+        def fetch_row():
+            conn = self.db_manager.get_connection()
+            return conn.execute(
+                'SELECT id, CAST(break_start_time AS TEXT) AS break_start, status '
+                'FROM attendance WHERE user_id = ? AND work_date = ?',
+                (self.test_user_id, today)
+            ).fetchone()
+        
+        before = fetch_row()
+        self.assertIsNotNone(before['break_start'])
+        
+        self.assertTrue(self.attendance_repo.clock_in(self.test_user_id, today))
+        after = fetch_row()
+        
+        self.assertEqual(after['id'], before['id'])
+        self.assertEqual(after['break_start'], before['break_start'])
+        self.assertEqual(after['status'], '在席')
+    
+    def test_clock_out_computes_hours_in_sql(self):
+        """退勤時に休憩を除いた勤務時間と残業時間が計算されることのテスト"""
+        from bot.utils.datetime_utils import now_jst
+        today = date.today().isoformat()
+        self.attendance_repo.clock_in(self.test_user_id, today)
+        
+        # 10時間前に出勤し、1時間休憩したことにする
+        now = now_jst()
+        conn = self.db_manager.get_connection()
+        conn.execute(
+            'UPDATE attendance SET clock_in_time = ?, break_start_time = ?, break_end_time = ? '
+            'WHERE user_id = ? AND work_date = ?',
+            ((now - timedelta(hours=10)).isoformat(),
+             (now - timedelta(hours=5)).isoformat(),
+             (now - timedelta(hours=4)).isoformat(),
+             self.test_user_id, today)
+        )
+        
+        self.assertTrue(self.attendance_repo.clock_out(self.test_user_id, today))
+        row = conn.execute(
+            'SELECT total_work_hours, overtime_hours, status FROM attendance '
+            'WHERE user_id = ? AND work_date = ?',
+            (self.test_user_id, today)
+        ).fetchone()
+        
+        self.assertAlmostEqual(row['total_work_hours'], 9.0, places=1)
+        self.assertAlmostEqual(row['overtime_hours'], 1.0, places=1)
+        self.assertEqual(row['status'], '退勤')
     
     def test_performance_with_large_dataset(self):
         """大量データでのパフォーマンステスト"""
@@ -293,6 +366,98 @@ class TestDatabaseIntegration(unittest.TestCase):
         
         # パフォーマンス基準（100ユーザーの状況取得が1秒以内）
         self.assertLess(query_time, 1.0, f"ステータス取得が遅すぎます: {query_time:.2f}秒")
+    
+    def test_repository_caches_invalidated_on_write(self):
+        """ユーザー・出退勤キャッシュが書き込み時に破棄されることのテスト"""
+        today = date.today().isoformat()
+        user = self.user_repo.get_user_by_discord_id("123456789")
+        user['username'] = 'changed_by_caller'
+        # キャッシュはコピーを返すので呼び出し元の変更は残らない
+        self.assertEqual(self.user_repo.get_user_by_discord_id("123456789")['username'], 'testuser')
+        
+        self.user_repo.update_user("123456789", username='renamed')
+        self.assertEqual(self.user_repo.get_user_by_discord_id("123456789")['username'], 'renamed')
+        
+        key = (self.test_user_id, today)
+        self.attendance_repo.clock_in(self.test_user_id, today)
+        self.attendance_repo._today_cache.set(key, {'status': '在席'})
+        self.assertEqual(self.attendance_repo.get_today_attendance(*key)['status'], '在席')
+        self.attendance_repo.clock_out(self.test_user_id, today)
+        self.assertIsNone(self.attendance_repo._today_cache.get(key))
+    
+    def test_break_minutes_generated_column(self):
+        """休憩時間（分）が生成列から取得されることのテスト"""
+        work_date = '2024-01-15'
+        conn = self.db_manager.get_connection()
+        conn.execute(
+            'INSERT INTO attendance (user_id, work_date, break_start_time, break_end_time, status) '
+            'VALUES (?, ?, ?, ?, ?)',
+            (self.test_user_id, work_date, '2024-01-15 12:00:00', '2024-01-15 12:45:00', '退勤')
+        )
+        conn.execute(
+            'INSERT INTO attendance (user_id, work_date, status) VALUES (?, ?, ?)',
+            (self.test_user2_id, work_date, '退勤')
+        )
+        
+        records = self.attendance_repo.get_attendance_range(work_date, work_date)
+        minutes = {record['username']: record['total_break_minutes'] for record in records}
+        self.assertEqual(minutes, {'testuser': 45, 'testuser2': 0})
+    
+    def test_iter_attendance_range_streams_rows(self):
+        """期間の勤怠データを1行ずつ取得するテスト"""
+        import types
+        start = date(2024, 1, 1)
+        rows = [(self.test_user_id, (start + timedelta(days=i)).isoformat(), None, None, 8.0, 0.0, '退勤')
+                for i in range(5)]
+        self.attendance_repo.bulk_upsert_attendance(rows)
+        
+        records = self.attendance_repo.iter_attendance_range('2024-01-01', '2024-01-31')
+        self.assertIsInstance(records, types.GeneratorType)
+        self.assertEqual([record['date'] for record in records], [start + timedelta(days=i) for i in range(5)])
+    
+    def test_reader_connection_is_read_only(self):
+        """読み取り用の接続では書き込めず、書き込み用とは別の接続であることのテスト"""
+        reader = self.db_manager.get_reader()
+        with self.db_manager.get_writer() as writer:
+            self.assertIsNot(reader, writer)
+        with self.assertRaises(sqlite3.OperationalError):
+            reader.execute("DELETE FROM users")
+        self.assertEqual(reader.execute("SELECT COUNT(*) FROM users").fetchone()[0], 2)
+    
+    def test_settings_upsert_many(self):
+        """複数の設定を1回でまとめて登録・更新するテスト"""
+        settings_repo = SettingsRepository(self.db_manager)
+        self.assertEqual(settings_repo.upsert_many(self.test_user_id, {'theme': 'dark', 'reminder': 'on'}), 2)
+        self.assertEqual(settings_repo.upsert_many(self.test_user_id, {'reminder': 'off'}), 1)
+        self.assertEqual(settings_repo.upsert_many(self.test_user_id, {}), 0)
+        self.assertEqual(settings_repo.get_settings(self.test_user_id), {'theme': 'dark', 'reminder': 'off'})
+    
+    def test_get_or_create_user_upsert(self):
+        """get_or_create_user が1文で作成・取得するテスト"""
+        created = self.user_repo.get_or_create_user("555", "newuser", "New User")
+        self.assertEqual(created['username'], "newuser")
+        self.assertEqual(self.user_repo.get_or_create_user("555", "newuser")['id'], created['id'])
+        
+        # キャッシュ切れ後はユーザー名を更新し、表示名は None なら維持する
+        self.user_repo._user_cache.clear()
+        user = self.user_repo.get_or_create_user("555", "renamed")
+        self.assertEqual(user['id'], created['id'])
+        self.assertEqual(user['username'], "renamed")
+        self.assertEqual(user['display_name'], "New User")
+    
+    def test_today_cache_expires_at_midnight(self):
+        """今日の日付キャッシュが日付の変わり目を越えないことのテスト"""
+        import time
+        from unittest.mock import patch
+        from bot.utils import datetime_utils
+        from bot.utils.datetime_utils import JST
+        
+        just_before_midnight = datetime(2024, 1, 15, 23, 59, 59, 500000, tzinfo=JST)
+        with patch.dict(datetime_utils._TODAY_CACHE, {'date': None, 'expires': 0.0}), \
+                patch('bot.utils.datetime_utils.now_jst', return_value=just_before_midnight):
+            self.assertEqual(datetime_utils.today_jst_iso(), '2024-01-15')
+            remaining = datetime_utils._TODAY_CACHE['expires'] - time.monotonic()
+            self.assertLessEqual(remaining, 0.5)
 
 def run_integration_tests():
     """統合テストの実行"""
@@ -9,8 +9,8 @@ import unittest
 import sqlite3
 import tempfile
 import os
-from datetime import datetime, date, timedelta
-import pytz
+import time
+from datetime import datetime, date, timedelta, timezone
 from unittest.mock import Mock, patch, MagicMock
 
 # テスト対象のモジュールをインポート
@@ -25,8 +25,9 @@ from bot.utils.datetime_utils import (
 )
 
 from bot.utils.database_utils import (
-    handle_database_error, retry_on_lock, transaction, safe_execute,
-    fetch_one_as_dict, fetch_all_as_dict, validate_required_fields,
+    handle_database_error, retry_on_lock, db_operation, transaction, safe_execute,
+    fetch_one_as_dict, fetch_all_as_dict, iter_rows_as_dict, fetch_all_as_tuples, fetch_all_rows,
+    validate_required_fields, configure_connection, ConnectionPool, TTLCache,
     sanitize_string, build_update_query, DatabaseError, RecordNotFoundError,
     DuplicateRecordError
 )
@@ -38,13 +39,13 @@ class TestDateTimeUtils(unittest.TestCase):
     def setUp(self):
         """テストの初期設定"""
         self.test_dt = datetime(2024, 1, 15, 9, 30, 0)
-        self.test_dt_jst = JST.localize(self.test_dt)
+        self.test_dt_jst = self.test_dt.replace(tzinfo=JST)
     
     def test_now_jst(self):
         """now_jst関数のテスト"""
         result = now_jst()
         self.assertIsInstance(result, datetime)
-        self.assertEqual(result.tzinfo.zone, 'Asia/Tokyo')
+        self.assertEqual(result.tzinfo.key, 'Asia/Tokyo')
     
     def test_today_jst(self):
         """today_jst関数のテスト"""
@@ -54,22 +55,28 @@ class TestDateTimeUtils(unittest.TestCase):
     def test_ensure_jst_with_naive_datetime(self):
         """ナイーブなdatetimeのJST変換テスト"""
         result = ensure_jst(self.test_dt)
-        self.assertEqual(result.tzinfo.zone, 'Asia/Tokyo')
+        self.assertEqual(result.tzinfo.key, 'Asia/Tokyo')
         self.assertEqual(result.hour, 9)
     
     def test_ensure_jst_with_string(self):
         """文字列からのJST変換テスト"""
         dt_str = "2024-01-15T09:30:00"
         result = ensure_jst(dt_str)
-        self.assertEqual(result.tzinfo.zone, 'Asia/Tokyo')
+        self.assertEqual(result.tzinfo.key, 'Asia/Tokyo')
         self.assertEqual(result.hour, 9)
     
+    def test_ensure_jst_with_utc_z_suffix(self):
+        """末尾Z付き文字列のJST変換テスト"""
+        result = ensure_jst("2024-01-15T00:30:00Z")
+        self.assertEqual(result.tzinfo.key, 'Asia/Tokyo')
+        self.assertEqual(result.hour, 9)
+        self.assertEqual(format_time_only("2024-01-15T00:30:00Z"), "00:30")
+    
     def test_ensure_jst_with_timezone(self):
         """タイムゾーン付きdatetimeの変換テスト"""
-        utc = pytz.UTC
-        dt_utc = utc.localize(self.test_dt)
+        dt_utc = self.test_dt.replace(tzinfo=timezone.utc)
         result = ensure_jst(dt_utc)
-        self.assertEqual(result.tzinfo.zone, 'Asia/Tokyo')
+        self.assertEqual(result.tzinfo.key, 'Asia/Tokyo')
         # UTCの9:30はJSTの18:30
         self.assertEqual(result.hour, 18)
     
@@ -275,6 +282,77 @@ class TestDatabaseUtils(unittest.TestCase):
         self.assertEqual(result, "success")
         self.assertEqual(call_count, 3)
     
+    def test_db_operation_decorator(self):
+        """エラー変換とロック時リトライを兼ねるデコレータのテスト"""
+        call_count = 0
+        
+        @db_operation(retries=3, delay=0.001)
+        def locked_twice():
+            nonlocal call_count
+            call_count += 1
+            if call_count < 3:
+                raise sqlite3.OperationalError("database is locked")
+            return "success"
+        
+        self.assertEqual(locked_twice(), "success")
+        self.assertEqual(call_count, 3)
+        
+        @db_operation(retries=2, delay=0.001)
+        def always_locked():
+            raise sqlite3.OperationalError("database is locked")
+        
+        with self.assertRaises(DatabaseError):
+            always_locked()
+        
+        @db_operation()
+        def raise_integrity_error():
+            raise sqlite3.IntegrityError("UNIQUE constraint failed")
+        
+        with self.assertRaises(DuplicateRecordError):
+            raise_integrity_error()
+        
+        # 実際の制約違反はエラーコードで判定される
+        @db_operation()
+        def insert_duplicate():
+            self.conn.execute("INSERT INTO test_table (name, value) VALUES ('dup', 1)")
+            self.conn.execute("INSERT INTO test_table (name, value) VALUES ('dup', 2)")
+        
+        with self.assertRaises(DuplicateRecordError):
+            insert_duplicate()
+    
+    def test_configure_connection_sets_page_size_on_new_file(self):
+        """新規ファイルではWAL設定前にページサイズが設定されるテスト"""
+        path = os.path.join(tempfile.mkdtemp(), 'new.db')
+        conn = sqlite3.connect(path)
+        try:
+            configure_connection(conn)
+            self.assertEqual(conn.execute("PRAGMA page_size").fetchone()[0], 8192)
+            self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], 'wal')
+        finally:
+            conn.close()
+    
+    def test_connection_pool_maintenance_truncates_wal(self):
+        """定期メンテナンスでWALファイルが切り詰められるテスト"""
+        def connect():
+            conn = sqlite3.connect(self.temp_db.name, check_same_thread=False, isolation_level=None)
+            configure_connection(conn)
+            return conn
+        
+        pool = ConnectionPool(connect)
+        try:
+            pool.get().execute("INSERT INTO test_table (name, value) VALUES ('wal', 1)")
+            wal_path = self.temp_db.name + '-wal'
+            self.assertGreater(os.path.getsize(wal_path), 0)
+            
+            pool.start_maintenance(interval=0.01)
+            for _ in range(100):
+                if os.path.getsize(wal_path) == 0:
+                    break
+                time.sleep(0.01)
+            self.assertEqual(os.path.getsize(wal_path), 0)
+        finally:
+            pool.close_all()
+    
     def test_transaction_context_manager(self):
         """トランザクションコンテキストマネージャのテスト"""
         # 成功ケース
@@ -362,6 +440,66 @@ class TestDatabaseUtils(unittest.TestCase):
         results = fetch_all_as_dict(cursor)
         self.assertEqual(results, [])
     
+    def test_iter_rows_as_dict(self):
+        """分割取得しながら辞書変換するテスト"""
+        cursor = self.conn.cursor()
+        cursor.executemany("INSERT INTO test_table (name, value) VALUES (?, ?)",
+                           [(f"chunk{i}", i) for i in range(5)])
+        self.conn.commit()
+        
+        cursor.execute("SELECT name, value FROM test_table WHERE name LIKE 'chunk%' ORDER BY value")
+        results = list(iter_rows_as_dict(cursor, arraysize=2))
+        
+        self.assertEqual([row['value'] for row in results], [0, 1, 2, 3, 4])
+        self.assertEqual(results[0], {'name': 'chunk0', 'value': 0})
+    
+    def test_fetch_all_as_tuples(self):
+        """名前付きタプル変換のテスト"""
+        cursor = self.conn.cursor()
+        cursor.executemany("INSERT INTO test_table (name, value) VALUES (?, ?)",
+                           [("tuple1", 1), ("tuple2", 2)])
+        self.conn.commit()
+        
+        cursor.execute("SELECT name, value FROM test_table WHERE name LIKE 'tuple%' ORDER BY value")
+        results = fetch_all_as_tuples(cursor)
+        self.assertEqual([row.value for row in results], [1, 2])
+        self.assertEqual(results[0].name, "tuple1")
+        
+        # 同じ列構成ならクラスを再利用する
+        cursor.execute("SELECT name, value FROM test_table WHERE name = 'tuple2'")
+        self.assertIs(type(fetch_all_as_tuples(cursor)[0]), type(results[0]))
+    
+    def test_fetch_all_rows(self):
+        """sqlite3.Row のまま取得するテスト"""
+        self.conn.row_factory = sqlite3.Row
+        cursor = self.conn.cursor()
+        cursor.execute("INSERT INTO test_table (name, value) VALUES (?, ?)", ("row1", 1))
+        self.conn.commit()
+        
+        cursor.execute("SELECT name, value FROM test_table WHERE name = 'row1'")
+        rows = fetch_all_rows(cursor)
+        self.assertIsInstance(rows[0], sqlite3.Row)
+        self.assertEqual(rows[0]['value'], 1)
+    
+    def test_ttl_cache(self):
+        """有効期限付きキャッシュのテスト"""
+        cache = TTLCache(ttl=60)
+        cache.set('key', {'name': 'cached'})
+        cached = cache.get('key')
+        self.assertEqual(cached, {'name': 'cached'})
+        
+        # 返却値の変更はキャッシュに残らない
+        cached['name'] = 'changed'
+        self.assertEqual(cache.get('key'), {'name': 'cached'})
+        
+        cache.invalidate('key')
+        self.assertIsNone(cache.get('key'))
+        
+        # 有効期限切れ
+        expired = TTLCache(ttl=0)
+        expired.set('key', {'name': 'cached'})
+        self.assertIsNone(expired.get('key'))
+    
     def test_validate_required_fields(self):
         """必須フィールド検証のテスト"""
         # 正常ケース
@@ -404,6 +542,11 @@ class TestDatabaseUtils(unittest.TestCase):
         self.assertIn("updated_at = CURRENT_TIMESTAMP", query)
         self.assertEqual(params, ['newname', 999])
         
+        # 同じ列構成ならクエリ文字列を再利用する
+        cached_query, cached_params = build_update_query('test_table', {'name': 'other', 'value': 1}, 'id = ?')
+        self.assertIs(cached_query, query)
+        self.assertEqual(cached_params, ['other', 1])
+        
         # 空データ
         with self.assertRaises(ValueError):
             build_update_query('test_table', {}, 'id = ?')
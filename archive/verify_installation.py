@@ -77,7 +77,6 @@ def main():
     # Critical packages
     checker.check_package("discord.py", "discord")
     checker.check_package("python-dotenv", "dotenv")
-    checker.check_package("pytz")
     
     # Optional but recommended packages
     checker.check_package("Flask", "flask")
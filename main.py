@@ -132,6 +132,13 @@ class Application:
             if self.logger:
                 self.logger.error(f"Error stopping health server: {e}")
         
+        # Close pooled database connections
+        try:
+            await get_database_manager().close()
+        except Exception as e:
+            if self.logger:
+                self.logger.error(f"Error closing database: {e}")
+        
         if self.logger:
             self.logger.info("Application shutdown complete")
     
@@ -1,11 +1,15 @@
 """Admin commands - Clean TDD implementation"""
+import asyncio
 import discord
-from discord.ext import commands
+from discord import app_commands
+from discord.ext import commands, tasks
 import os
-import shutil
-from typing import Dict, Any, List, Optional
+import sqlite3
+import time
+from itertools import islice
+from typing import Dict, Any, Optional, Tuple, Callable, Awaitable
 
-from src.core.database import get_database_manager, DatabaseError
+from src.core.database import get_database_manager, DatabaseManager, DatabaseError
 from src.core.error_handling import (
     get_error_handler, handle_errors, UserError, SystemError,
     ErrorContext
@@ -16,12 +20,115 @@ from src.bot.core import require_registration, admin_only
 
 logger = get_logger(__name__)
 
+# 統計結果のキャッシュ有効期間（秒）
+STATS_CACHE_TTL = 60.0
+# 出勤統計で指定できる最大日数
+MAX_ATTENDANCE_STATS_DAYS = 90
+# ユーザー別タスク件数の集計ビュー更新間隔（分、PostgreSQLのみ）
+TASK_COUNTS_REFRESH_MINUTES = 15
+# ユーザー一覧の1ページあたりの表示件数
+USERS_PAGE_SIZE = 25
+# 出勤率の表示絵文字（50%未満 / 50%以上 / 80%以上）
+RATE_EMOJIS = ('🔴', '🟡', '🟢')
+
+
+def _backup_sqlite(db_path: str, backup_stem: str) -> str:
+    """SQLiteのオンラインバックアップAPIで整合性のあるコピーを作成（スレッドで実行）"""
+    # 同じ秒に複数回実行されても既存のバックアップを上書きしない
+    backup_filename = f"{backup_stem}.db"
+    suffix = 1
+    while os.path.exists(backup_filename):
+        backup_filename = f"{backup_stem}_{suffix}.db"
+        suffix += 1
+    
+    source = sqlite3.connect(db_path)
+    try:
+        destination = sqlite3.connect(backup_filename)
+        try:
+            # 1000ページずつコピーし、合間に書き込み中の接続へ譲る
+            source.backup(destination, pages=1000, sleep=0.001)
+        finally:
+            destination.close()
+    finally:
+        source.close()
+    return backup_filename
+
+
+async def _is_registered_admin(interaction: discord.Interaction) -> bool:
+    """スラッシュコマンド用: DB上の管理者フラグを確認（@admin_only 相当）"""
+    user = await get_database_manager().get_user(interaction.user.id)
+    return bool(user and user.get('is_admin', False))
+
+
+class UserListView(discord.ui.View):
+    """ユーザー一覧のページ送りボタンUI"""
+    
+    def __init__(self, cog: 'AdminCog', author_id: int, page: int, has_next: bool) -> None:
+        super().__init__(timeout=120)
+        self.cog = cog
+        self.author_id = author_id
+        self.page = page
+        self._update_buttons(has_next)
+    
+    def _update_buttons(self, has_next: bool) -> None:
+        """現在のページに応じてボタンの有効/無効を切り替え"""
+        self.previous_page.disabled = self.page <= 1
+        self.next_page.disabled = not has_next
+    
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        """コマンド実行者のみ操作可能"""
+        return interaction.user.id == self.author_id
+    
+    @discord.ui.button(label='◀ 前へ', style=discord.ButtonStyle.secondary)
+    async def previous_page(self, interaction: discord.Interaction, button: discord.ui.Button) -> None:
+        """前のページを表示"""
+        await self._show_page(interaction, self.page - 1)
+    
+    @discord.ui.button(label='次へ ▶', style=discord.ButtonStyle.secondary)
+    async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button) -> None:
+        """次のページを表示"""
+        await self._show_page(interaction, self.page + 1)
+    
+    async def _show_page(self, interaction: discord.Interaction, page: int) -> None:
+        """指定ページをDBから取得してメッセージを更新"""
+        embed, has_next = await self.cog._build_users_page(page)
+        self.page = page
+        self._update_buttons(has_next)
+        await interaction.response.edit_message(embed=embed, view=self)
+
+
 class AdminCog(commands.Cog):
     """管理者機能を提供するCog"""
     
     def __init__(self, bot: commands.Bot) -> None:
         self.bot = bot
         self.error_handler = get_error_handler()
+        self._stats_cache: Dict[Tuple[str, int], Tuple[float, Any]] = {}
+        self._cache_hits = 0
+        self._cache_misses = 0
+    
+    async def cog_load(self) -> None:
+        """Cog読み込み時の処理"""
+        # 集計ビューを持つDB（PostgreSQL）のみ定期更新する
+        if hasattr(get_database_manager(), 'refresh_user_task_counts'):
+            self.refresh_task_counts.start()
+    
+    async def cog_unload(self) -> None:
+        """Cog終了時の処理"""
+        self.refresh_task_counts.cancel()
+    
+    @tasks.loop(minutes=TASK_COUNTS_REFRESH_MINUTES)
+    async def refresh_task_counts(self) -> None:
+        """ユーザー別タスク件数の集計ビューを更新"""
+        try:
+            await get_database_manager().refresh_user_task_counts()
+        except Exception as e:
+            logger.error(f"タスク件数集計ビュー更新エラー: {e}")
+    
+    @refresh_task_counts.before_loop
+    async def before_refresh_task_counts(self) -> None:
+        """集計ビュー更新タスク開始前の処理"""
+        await self.bot.wait_until_ready()
     
     @commands.group(name='admin', aliases=['管理'])
     @commands.has_permissions(administrator=True)
@@ -41,7 +148,8 @@ class AdminCog(commands.Cog):
                 ("!admin backup", "データベースバックアップ"),
                 ("!admin settings", "Bot設定を表示"),
                 ("!admin tasks", "全タスク統計"),
-                ("!admin attendance", "出勤統計")
+                ("!admin attendance", "出勤統計"),
+                ("!admin cache clear", "統計キャッシュをクリア")
             ]
             
             for command, description in commands_info:
@@ -63,23 +171,7 @@ class AdminCog(commands.Cog):
     @handle_errors()
     async def show_stats(self, ctx: commands.Context[commands.Bot]) -> None:
         """システム統計を表示"""
-        stats = await self._get_system_stats()
-        
-        embed = discord.Embed(
-            title="📊 システム統計",
-            color=discord.Color.blue(),
-            timestamp=now_jst()
-        )
-        
-        embed.add_field(name="登録ユーザー数", value=f"{stats['total_users']}人", inline=True)
-        embed.add_field(name="総タスク数", value=f"{stats['total_tasks']}件", inline=True)
-        embed.add_field(name="未完了タスク", value=f"{stats['pending_tasks']}件", inline=True)
-        embed.add_field(name="期限切れタスク", value=f"{stats['overdue_tasks']}件", inline=True)
-        embed.add_field(name="今日の出勤", value=f"{stats['today_attendance']}人", inline=True)
-        embed.add_field(name="現在出勤中", value=f"{stats['current_present']}人", inline=True)
-        embed.add_field(name="稼働時間", value=stats['uptime'], inline=True)
-        
-        await ctx.send(embed=embed)
+        await ctx.send(embed=await self._build_stats_embed())
         
         log_command_execution(
             logger, "admin_stats", ctx.author.id, 
@@ -89,42 +181,18 @@ class AdminCog(commands.Cog):
     @admin_group.command(name='users', aliases=['ユーザー'])
     @admin_only
     @handle_errors()
-    async def show_users(self, ctx: commands.Context[commands.Bot]) -> None:
+    async def show_users(self, ctx: commands.Context[commands.Bot], page: int = 1) -> None:
         """ユーザー一覧を表示"""
-        db_manager = get_database_manager()
-        
-        users = await db_manager.list_users()
+        embed, view = await self._build_users_message(int(page), ctx.author.id)
         
-        if not users:
-            await ctx.send("登録されているユーザーがいません。")
+        if embed is None:
+            await ctx.send(self._empty_users_message(int(page)))
             return
-            
-        embed = discord.Embed(
-            title="👥 ユーザー一覧",
-            color=discord.Color.green(),
-            timestamp=now_jst()
-        )
-        
-        user_list: List[str] = []
-        for i, user in enumerate(users, 1):
-            display_name = user['display_name']
-            is_admin = user.get('is_admin', False)
-            created_at = user.get('created_at')
-            
-            admin_mark = " [管理者]" if is_admin else ""
-            if created_at:
-                # Handle different datetime formats
-                if hasattr(created_at, 'strftime'):
-                    created_date = created_at.strftime("%Y-%m-%d")
-                else:
-                    created_date = str(created_at)[:10]  # Assume ISO format
-            else:
-                created_date = "不明"
-            
-            user_list.append(f"{i}. {display_name}{admin_mark} (登録: {created_date})")
         
-        embed.description = '\n'.join(user_list)
-        await ctx.send(embed=embed)
+        if view is not None:
+            await ctx.send(embed=embed, view=view)
+        else:
+            await ctx.send(embed=embed)
         
         log_command_execution(
             logger, "admin_users", ctx.author.id, 
@@ -136,31 +204,199 @@ class AdminCog(commands.Cog):
     @handle_errors()
     async def show_task_stats(self, ctx: commands.Context[commands.Bot]) -> None:
         """タスク統計を表示"""
-        db_manager = get_database_manager()
+        await ctx.send(embed=await self._build_task_stats_embed())
+        
+        log_command_execution(
+            logger, "admin_tasks", ctx.author.id, 
+            ctx.guild.id if ctx.guild else None, True
+        )
+    
+    @admin_group.command(name='attendance', aliases=['出勤'])
+    @admin_only
+    @handle_errors()
+    async def show_attendance_stats(self, ctx: commands.Context[commands.Bot], days: int = 7) -> None:
+        """出勤統計を表示"""
+        days = int(days)
+        embed = await self._build_attendance_embed(days)
         
-        # Get all users and their tasks
-        users = await db_manager.list_users()
+        if embed is None:
+            await ctx.send("登録されているユーザーがいません。")
+            return
         
-        # Collect statistics
-        status_counts = {'pending': 0, 'in_progress': 0, 'completed': 0, 'cancelled': 0}
-        priority_counts = {'low': 0, 'medium': 0, 'high': 0}
-        user_task_counts = []
+        await ctx.send(embed=embed)
         
-        for user in users:
-            user_tasks = await db_manager.list_tasks(user['discord_id'])
-            task_count = len(user_tasks)
-            
-            if task_count > 0:
-                user_task_counts.append((user['username'], task_count))
-            
-            for task in user_tasks:
-                status = task.get('status', 'pending')
-                priority = task.get('priority', 'medium')
-                
-                if status in status_counts:
-                    status_counts[status] += 1
-                if priority in priority_counts:
-                    priority_counts[priority] += 1
+        log_command_execution(
+            logger, "admin_attendance", ctx.author.id, 
+            ctx.guild.id if ctx.guild else None, True,
+            days=days
+        )
+    
+    @admin_group.command(name='backup', aliases=['バックアップ'])
+    @admin_only
+    async def create_backup(self, ctx: commands.Context[commands.Bot]) -> None:
+        """データベースバックアップを作成"""
+        await ctx.send(embed=await self._build_backup_embed())
+    
+    @admin_group.group(name='cache', aliases=['キャッシュ'], invoke_without_command=True)
+    @admin_only
+    @handle_errors()
+    async def cache_group(self, ctx: commands.Context[commands.Bot]) -> None:
+        """統計キャッシュの状態を表示"""
+        await ctx.send(
+            f"統計キャッシュ: {len(self._stats_cache)}件 "
+            f"(ヒット: {self._cache_hits}, ミス: {self._cache_misses}, TTL: {STATS_CACHE_TTL:.0f}秒)"
+        )
+    
+    @cache_group.command(name='clear', aliases=['クリア'])
+    @admin_only
+    @handle_errors()
+    async def clear_cache(self, ctx: commands.Context[commands.Bot]) -> None:
+        """統計キャッシュをクリア"""
+        cleared = len(self._stats_cache)
+        self._stats_cache.clear()
+        await ctx.send(f"統計キャッシュをクリアしました（{cleared}件）")
+        
+        log_command_execution(
+            logger, "admin_cache_clear", ctx.author.id, 
+            ctx.guild.id if ctx.guild else None, True,
+            cleared=cleared
+        )
+    
+    @admin_group.command(name='settings', aliases=['設定'])
+    async def show_settings(self, ctx: commands.Context[commands.Bot]) -> None:
+        """Bot設定を表示"""
+        await ctx.send(embed=self._build_settings_embed())
+    
+    # スラッシュコマンド版: Discord側で管理者権限を持たないメンバーには表示・実行されない
+    admin_app_group = app_commands.Group(
+        name='admin',
+        description='管理者コマンド',
+        default_permissions=discord.Permissions(administrator=True),
+        guild_only=True
+    )
+    
+    @admin_app_group.command(name='stats', description='システム統計を表示')
+    @app_commands.check(_is_registered_admin)
+    async def slash_stats(self, interaction: discord.Interaction) -> None:
+        """システム統計を表示（スラッシュコマンド）"""
+        await interaction.response.send_message(embed=await self._build_stats_embed(), ephemeral=True)
+    
+    @admin_app_group.command(name='users', description='ユーザー一覧を表示')
+    @app_commands.describe(page='ページ番号')
+    @app_commands.check(_is_registered_admin)
+    async def slash_users(self, interaction: discord.Interaction, page: app_commands.Range[int, 1] = 1) -> None:
+        """ユーザー一覧を表示（スラッシュコマンド）"""
+        embed, view = await self._build_users_message(page, interaction.user.id)
+        
+        if embed is None:
+            await interaction.response.send_message(self._empty_users_message(page), ephemeral=True)
+        elif view is not None:
+            await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
+        else:
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+    
+    @admin_app_group.command(name='tasks', description='全タスク統計を表示')
+    @app_commands.check(_is_registered_admin)
+    async def slash_task_stats(self, interaction: discord.Interaction) -> None:
+        """タスク統計を表示（スラッシュコマンド）"""
+        await interaction.response.send_message(embed=await self._build_task_stats_embed(), ephemeral=True)
+    
+    @admin_app_group.command(name='attendance', description='出勤統計を表示')
+    @app_commands.describe(days='集計日数')
+    @app_commands.check(_is_registered_admin)
+    async def slash_attendance_stats(
+        self, interaction: discord.Interaction,
+        days: app_commands.Range[int, 1, MAX_ATTENDANCE_STATS_DAYS] = 7
+    ) -> None:
+        """出勤統計を表示（スラッシュコマンド）"""
+        embed = await self._build_attendance_embed(days)
+        
+        if embed is None:
+            await interaction.response.send_message("登録されているユーザーがいません。", ephemeral=True)
+        else:
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+    
+    @admin_app_group.command(name='backup', description='データベースバックアップを作成')
+    @app_commands.check(_is_registered_admin)
+    async def slash_backup(self, interaction: discord.Interaction) -> None:
+        """データベースバックアップを作成（スラッシュコマンド）"""
+        # バックアップは3秒を超えることがあるため応答を保留する
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        await interaction.followup.send(embed=await self._build_backup_embed(), ephemeral=True)
+    
+    @admin_app_group.command(name='settings', description='Bot設定を表示')
+    @app_commands.check(_is_registered_admin)
+    async def slash_settings(self, interaction: discord.Interaction) -> None:
+        """Bot設定を表示（スラッシュコマンド）"""
+        await interaction.response.send_message(embed=self._build_settings_embed(), ephemeral=True)
+    
+    async def cog_app_command_error(
+        self, interaction: discord.Interaction, error: app_commands.AppCommandError
+    ) -> None:
+        """スラッシュコマンドのエラー処理"""
+        original = getattr(error, 'original', error)
+        if isinstance(error, app_commands.CheckFailure):
+            message = "This command requires administrator privileges."
+        elif isinstance(original, UserError):
+            message = original.user_message
+        else:
+            logger.error(f"管理者スラッシュコマンドエラー: {original}")
+            message = "コマンドの実行中にエラーが発生しました。"
+        
+        if interaction.response.is_done():
+            await interaction.followup.send(message, ephemeral=True)
+        else:
+            await interaction.response.send_message(message, ephemeral=True)
+    
+    async def _build_stats_embed(self) -> discord.Embed:
+        """システム統計のEmbedを作成"""
+        stats = await self._get_system_stats()
+        
+        # Build the embed in one pass instead of one add_field call per field
+        return discord.Embed.from_dict({
+            "title": "📊 システム統計",
+            "color": discord.Color.blue().value,
+            "timestamp": now_jst().isoformat(),
+            "fields": [
+                {"name": "登録ユーザー数", "value": f"{stats['total_users']}人", "inline": True},
+                {"name": "総タスク数", "value": f"{stats['total_tasks']}件", "inline": True},
+                {"name": "未完了タスク", "value": f"{stats['pending_tasks']}件", "inline": True},
+                {"name": "期限切れタスク", "value": f"{stats['overdue_tasks']}件", "inline": True},
+                {"name": "今日の出勤", "value": f"{stats['today_attendance']}人", "inline": True},
+                {"name": "現在出勤中", "value": f"{stats['current_present']}人", "inline": True},
+                {"name": "稼働時間", "value": stats['uptime'], "inline": True},
+            ]
+        })
+    
+    async def _build_users_message(
+        self, page: int, author_id: int
+    ) -> Tuple[Optional[discord.Embed], Optional['UserListView']]:
+        """ユーザー一覧のEmbedと、複数ページある場合のページ送りUIを作成"""
+        if page < 1:
+            raise UserError(
+                f"Invalid page: {page}",
+                "ページ番号は1以上で指定してください。",
+                error_code="INVALID_PAGE"
+            )
+        
+        embed, has_next = await self._build_users_page(page)
+        if embed is None or not (page > 1 or has_next):
+            return embed, None
+        return embed, UserListView(self, author_id, page, has_next)
+    
+    @staticmethod
+    def _empty_users_message(page: int) -> str:
+        """ユーザーが見つからない場合のメッセージ"""
+        if page == 1:
+            return "登録されているユーザーがいません。"
+        return f"{page}ページ目にユーザーはいません。"
+    
+    async def _build_task_stats_embed(self) -> discord.Embed:
+        """タスク統計のEmbedを作成"""
+        task_stats = await self._get_cached(('task_stats', 0), self._get_task_stats)
+        status_counts = task_stats['status_counts']
+        priority_counts = task_stats['priority_counts']
+        user_task_counts = task_stats['user_task_counts']
         
         embed = discord.Embed(
             title="📋 タスク統計",
@@ -169,8 +405,8 @@ class AdminCog(commands.Cog):
         )
         
         # ステータス別
-        status_text = '\n'.join([f"{status}: {count}件" 
-                               for status, count in status_counts.items() if count > 0])
+        status_text = '\n'.join(f"{status}: {count}件"
+                                for status, count in status_counts.items() if count > 0)
         embed.add_field(
             name="ステータス別",
             value=status_text if status_text else "データなし",
@@ -178,8 +414,8 @@ class AdminCog(commands.Cog):
         )
         
         # 優先度別
-        priority_text = '\n'.join([f"{priority}: {count}件" 
-                                 for priority, count in priority_counts.items() if count > 0])
+        priority_text = '\n'.join(f"{priority}: {count}件"
+                                  for priority, count in priority_counts.items() if count > 0)
         embed.add_field(
             name="優先度別",
             value=priority_text if priority_text else "データなし",
@@ -188,54 +424,42 @@ class AdminCog(commands.Cog):
         
         # ユーザー別（上位5名）
         if user_task_counts:
-            user_task_counts.sort(key=lambda x: x[1], reverse=True)
-            top_users = user_task_counts[:5]
-            user_list = [f"{username}: {count}件" for username, count in top_users]
-            
             embed.add_field(
                 name="ユーザー別タスク数（上位5名）",
-                value='\n'.join(user_list),
+                value='\n'.join(f"{username}: {count}件" for username, count in user_task_counts),
                 inline=False
             )
         
-        await ctx.send(embed=embed)
-        
-        log_command_execution(
-            logger, "admin_tasks", ctx.author.id, 
-            ctx.guild.id if ctx.guild else None, True
-        )
+        return embed
     
-    @admin_group.command(name='attendance', aliases=['出勤'])
-    @admin_only
-    @handle_errors()
-    async def show_attendance_stats(self, ctx: commands.Context[commands.Bot], days: int = 7) -> None:
-        """出勤統計を表示"""
+    async def _build_attendance_embed(self, days: int) -> Optional[discord.Embed]:
+        """出勤統計のEmbedを作成（ユーザー未登録の場合はNone）"""
+        if not 1 <= days <= MAX_ATTENDANCE_STATS_DAYS:
+            raise UserError(
+                f"Invalid days: {days}",
+                f"日数は1〜{MAX_ATTENDANCE_STATS_DAYS}の範囲で指定してください。",
+                error_code="INVALID_DAYS"
+            )
+        
         db_manager = get_database_manager()
         
-        # Get all users
-        users = await db_manager.list_users()
-        total_users = len(users)
+        from datetime import timedelta
+        today = now_jst().date()
+        start_date = format_date_only(today - timedelta(days=days - 1))
+        
+        summary = await self._get_cached(
+            ('attendance_stats', days),
+            lambda: db_manager.get_attendance_summary(start_date, format_date_only(today))
+        )
+        total_users = summary['total_users']
         
         if total_users == 0:
-            await ctx.send("登録されているユーザーがいません。")
-            return
+            return None
         
-        # Get attendance data for the past days
-        from datetime import timedelta
-        today = now_jst().date()
         date_counts = {}
-        
         for i in range(days):
-            check_date = today - timedelta(days=i)
-            date_str = format_date_only(check_date)
-            
-            attendance_count = 0
-            for user in users:
-                record = await db_manager.get_attendance_record(user['discord_id'], date_str)
-                if record and record.get('check_in'):
-                    attendance_count += 1
-            
-            date_counts[date_str] = attendance_count
+            date_str = format_date_only(today - timedelta(days=i))
+            date_counts[date_str] = summary['daily_counts'].get(date_str, 0)
         
         embed = discord.Embed(
             title=f"📅 出勤統計（過去{days}日間）",
@@ -244,19 +468,18 @@ class AdminCog(commands.Cog):
         )
         
         if date_counts:
-            daily_rates: List[str] = []
-            # Sort dates in descending order
-            sorted_dates = sorted(date_counts.keys(), reverse=True)
+            # total_users > 0 is checked above, so scale once instead of per row
+            percent_per_user = 100.0 / total_users
             
-            for date_str in sorted_dates[:7]:  # Show last 7 days
-                count = date_counts[date_str]
-                rate = (count / total_users) * 100 if total_users > 0 else 0
-                rate_emoji = "🟢" if rate >= 80 else "🟡" if rate >= 50 else "🔴"
-                daily_rates.append(f"{date_str}: {rate_emoji} {rate:.1f}% ({count}/{total_users})")
+            def rate_line(date_str: str, count: int) -> str:
+                rate = count * percent_per_user
+                return f"{date_str}: {RATE_EMOJIS[(rate >= 50) + (rate >= 80)]} {rate:.1f}% ({count}/{total_users})"
             
+            # date_counts is built newest first; show last 7 days
             embed.add_field(
                 name="日別出勤率",
-                value='\n'.join(daily_rates) if daily_rates else "データなし",
+                value='\n'.join(rate_line(date_str, count)
+                                for date_str, count in islice(date_counts.items(), 7)),
                 inline=False
             )
         else:
@@ -266,76 +489,48 @@ class AdminCog(commands.Cog):
                 inline=False
             )
         
-        await ctx.send(embed=embed)
-        
-        log_command_execution(
-            logger, "admin_attendance", ctx.author.id, 
-            ctx.guild.id if ctx.guild else None, True,
-            days=days
-        )
+        return embed
     
-    @admin_group.command(name='backup', aliases=['バックアップ'])
-    async def create_backup(self, ctx: commands.Context[commands.Bot]) -> None:
-        """データベースバックアップを作成"""
+    async def _build_backup_embed(self) -> discord.Embed:
+        """バックアップを実行し、結果のEmbedを作成"""
+        db_manager = get_database_manager()
+        
+        # SQLiteの場合のみバックアップ実行
+        if not isinstance(db_manager, DatabaseManager):
+            return discord.Embed(
+                title="❌ バックアップエラー",
+                description="PostgreSQLのバックアップは手動で実行してください",
+                color=discord.Color.red()
+            )
+        if db_manager.database_url == ":memory:":
+            return discord.Embed(
+                title="❌ バックアップエラー",
+                description="データベースパスが見つかりません",
+                color=discord.Color.red()
+            )
+        
+        timestamp = now_jst().strftime("%Y%m%d_%H%M%S")
         try:
-            if db_manager is None:
-                await ctx.send("データベースに接続できません。")
-                return
-                
-            timestamp = now_jst().strftime("%Y%m%d_%H%M%S")
-            backup_filename = f"backup_{timestamp}.db"
-              # SQLiteの場合のみバックアップ実行
-            try:
-                if hasattr(db_manager, 'db_path'):
-                    db_path = getattr(db_manager, 'db_path', None)
-                    if db_path:
-                        shutil.copy2(db_path, backup_filename)
-                        
-                        embed = discord.Embed(
-                            title="💾 バックアップ完了",
-                            description=f"バックアップファイル: {backup_filename}",
-                            color=discord.Color.green(),
-                            timestamp=now_jst()
-                        )
-                    else:
-                        embed = discord.Embed(
-                            title="❌ バックアップエラー",
-                            description="データベースパスが見つかりません",
-                            color=discord.Color.red()
-                        )
-                else:
-                    embed = discord.Embed(
-                        title="❌ バックアップエラー",
-                        description="PostgreSQLのバックアップは手動で実行してください",
-                        color=discord.Color.red()
-                    )
-            except Exception as backup_error:
-                logger.error(f"バックアップ実行エラー: {backup_error}")
-                embed = discord.Embed(
-                    title="❌ バックアップエラー",
-                    description="バックアップファイルの作成に失敗しました",
-                    color=discord.Color.red()
-                )
-            
+            backup_filename = await asyncio.to_thread(
+                _backup_sqlite, db_manager.database_url, f"backup_{timestamp}"
+            )
         except Exception as e:
             logger.error(f"バックアップ作成エラー: {e}")
-            embed = discord.Embed(
+            return discord.Embed(
                 title="❌ バックアップエラー",
-                description="バックアップの作成中にエラーが発生しました",
+                description="バックアップファイルの作成に失敗しました",
                 color=discord.Color.red()
             )
         
-        await ctx.send(embed=embed)
-    
-    @admin_group.command(name='settings', aliases=['設定'])
-    async def show_settings(self, ctx: commands.Context[commands.Bot]) -> None:
-        """Bot設定を表示"""
-        embed = discord.Embed(
-            title="⚙️ Bot設定",
-            color=discord.Color.blue(),
+        return discord.Embed(
+            title="💾 バックアップ完了",
+            description=f"バックアップファイル: {backup_filename}",
+            color=discord.Color.green(),
             timestamp=now_jst()
         )
-        
+    
+    def _build_settings_embed(self) -> discord.Embed:
+        """Bot設定のEmbedを作成"""
         settings = {
             "データベース": "PostgreSQL" if os.getenv('DATABASE_URL') else "SQLite",
             "環境": "本番" if os.getenv('ENVIRONMENT') == 'production' else "開発",
@@ -343,10 +538,15 @@ class AdminCog(commands.Cog):
             "Discord Guild ID": os.getenv('DISCORD_GUILD_ID', '未設定'),
         }
         
-        for key, value in settings.items():
-            embed.add_field(name=key, value=value, inline=True)
-        
-        await ctx.send(embed=embed)
+        return discord.Embed.from_dict({
+            "title": "⚙️ Bot設定",
+            "color": discord.Color.blue().value,
+            "timestamp": now_jst().isoformat(),
+            "fields": [
+                {"name": key, "value": value, "inline": True}
+                for key, value in settings.items()
+            ]
+        })
     
     async def _get_system_stats(self) -> Dict[str, Any]:
         """システム統計を取得"""
@@ -362,51 +562,14 @@ class AdminCog(commands.Cog):
         
         try:
             db_manager = get_database_manager()
-            
-            # Get all users
-            users = await db_manager.list_users()
-            stats['total_users'] = len(users)
-            
-            # Get task statistics
-            total_tasks = 0
-            pending_tasks = 0
-            overdue_tasks = 0
-            
-            today_str = format_date_only(now_jst())
             now_dt = now_jst()
             
-            for user in users:
-                user_tasks = await db_manager.list_tasks(user['discord_id'])
-                total_tasks += len(user_tasks)
-                
-                for task in user_tasks:
-                    if task.get('status') != 'completed':
-                        pending_tasks += 1
-                        
-                        # Check if overdue
-                        due_date = task.get('due_date')
-                        if due_date and due_date < now_dt:
-                            overdue_tasks += 1
-            
-            stats['total_tasks'] = total_tasks
-            stats['pending_tasks'] = pending_tasks
-            stats['overdue_tasks'] = overdue_tasks
-            
-            # Get attendance statistics
-            today_attendance = 0
-            current_present = 0
-            
-            for user in users:
-                record = await db_manager.get_attendance_record(user['discord_id'], today_str)
-                if record and record.get('check_in'):
-                    today_attendance += 1
-                    
-                    # Check if currently present (not checked out)
-                    if not record.get('check_out'):
-                        current_present += 1
-            
-            stats['today_attendance'] = today_attendance
-            stats['current_present'] = current_present
+            stats.update(await self._get_cached(
+                ('system_stats', 0),
+                lambda: db_manager.get_system_stats(
+                    format_date_only(now_dt), now_dt.replace(tzinfo=None)
+                )
+            ))
             
             # Calculate uptime
             if hasattr(self.bot, 'start_time'):
@@ -426,6 +589,75 @@ class AdminCog(commands.Cog):
             logger.error(f"統計取得エラー: {e}")
         
         return stats
+    
+    async def _build_users_page(self, page: int) -> Tuple[Optional[discord.Embed], bool]:
+        """ユーザー一覧の1ページ分のEmbedと次ページの有無を返す"""
+        offset = (page - 1) * USERS_PAGE_SIZE
+        # 1件多く取得して次ページの有無を判定（件数の別クエリを避ける）
+        users = await get_database_manager().list_users_page(
+            limit=USERS_PAGE_SIZE + 1, offset=offset
+        )
+        has_next = len(users) > USERS_PAGE_SIZE
+        
+        if not users:
+            return None, False
+        
+        embed = discord.Embed(
+            title="👥 ユーザー一覧",
+            color=discord.Color.green(),
+            timestamp=now_jst()
+        )
+        embed.description = '\n'.join(
+            f"{i}. {user['display_name']}{' [管理者]' if user.get('is_admin') else ''}"
+            f" (登録: {self._format_created_date(user.get('created_at'))})"
+            for i, user in enumerate(users[:USERS_PAGE_SIZE], offset + 1)
+        )
+        embed.set_footer(text=f"ページ {page}")
+        return embed, has_next
+    
+    @staticmethod
+    def _format_created_date(created_at: Any) -> str:
+        """登録日時を YYYY-MM-DD 形式で返す"""
+        if not created_at:
+            return "不明"
+        # Handle different datetime formats
+        if hasattr(created_at, 'strftime'):
+            return created_at.strftime("%Y-%m-%d")
+        return str(created_at)[:10]  # Assume ISO format
+    
+    async def _get_task_stats(self) -> Dict[str, Any]:
+        """タスク統計を取得"""
+        task_stats = await get_database_manager().get_task_stats(limit=5)
+        
+        status_counts = {'pending': 0, 'in_progress': 0, 'completed': 0, 'cancelled': 0}
+        priority_counts = {'low': 0, 'medium': 0, 'high': 0}
+        for status, count in task_stats['status_counts'].items():
+            if status in status_counts:
+                status_counts[status] = count
+        for priority, count in task_stats['priority_counts'].items():
+            if priority in priority_counts:
+                priority_counts[priority] = count
+        
+        return {
+            'status_counts': status_counts,
+            'priority_counts': priority_counts,
+            'user_task_counts': [(row['username'], row['task_count']) for row in task_stats['user_task_counts']]
+        }
+    
+    async def _get_cached(self, key: Tuple[str, int], loader: Callable[[], Awaitable[Any]]) -> Any:
+        """TTL付きキャッシュから統計結果を取得し、期限切れなら再計算"""
+        now = time.monotonic()
+        cached = self._stats_cache.get(key)
+        if cached and now - cached[0] < STATS_CACHE_TTL:
+            self._cache_hits += 1
+            logger.debug(f"統計キャッシュヒット: {key} (hits={self._cache_hits}, misses={self._cache_misses})")
+            return cached[1]
+        
+        self._cache_misses += 1
+        logger.debug(f"統計キャッシュミス: {key} (hits={self._cache_hits}, misses={self._cache_misses})")
+        result = await loader()
+        self._stats_cache[key] = (now, result)
+        return result
 
 async def setup(bot: commands.Bot) -> None:
     """Cogをbotに追加"""
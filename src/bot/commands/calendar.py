@@ -1,17 +1,31 @@
+import asyncio
 import discord
 from discord.ext import commands, tasks
-from datetime import datetime, time, date, timedelta
+from datetime import time, date, timedelta
 import logging
+import time as time_module
+from itertools import groupby
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 from bot.utils.google_api import google_calendar_service
 from bot.utils.datetime_utils import now_jst
+from src.core.config import get_config
 
 logger = logging.getLogger(__name__)
 
+# 会議リマインドの同時送信数（Discordのレート制限を考慮）
+MEETING_REMINDER_CONCURRENCY = 8
+# 予定取得結果のキャッシュ有効期間（秒）
+EVENTS_CACHE_TTL = 300.0
+# 曜日表示（date.weekday() の順）
+WEEKDAY_NAMES = ('月', '火', '水', '木', '金', '土', '日')
+
 class CalendarCog(commands.Cog):
     """Googleカレンダー連携機能を提供するCog"""
     
     def __init__(self, bot):
         self.bot = bot
+        self._events_cache: Dict[str, Tuple[Any, float, List[Dict[str, Any]]]] = {}
+        self._events_lock = asyncio.Lock()
         
         # 定期実行タスクを開始
         if google_calendar_service.is_available():
@@ -35,10 +49,11 @@ class CalendarCog(commands.Cog):
         
         try:
             # 今日の予定を取得
-            events = await google_calendar_service.get_today_events()
+            today = now_jst().date()
+            events = await self._get_today_events_cached(today)
             
             embed = discord.Embed(
-                title=f"📅 今日の予定 ({date.today().strftime('%Y-%m-%d')})",
+                title=f"📅 今日の予定 ({today.strftime('%Y-%m-%d')})",
                 color=discord.Color.blue(),
                 timestamp=now_jst()
             )
@@ -46,40 +61,25 @@ class CalendarCog(commands.Cog):
             if not events:
                 embed.description = "今日の予定はありません"
             else:
-                # 予定を時系列で表示
-                schedule_text = []
-                for event in events:
-                    if event['all_day']:
-                        time_str = "終日"
-                    else:
-                        start_time = event['start'].strftime("%H:%M")
-                        end_time = event['end'].strftime("%H:%M")
-                        time_str = f"{start_time}-{end_time}"
-                    
-                    location_str = f" @{event['location']}" if event['location'] else ""
-                    
-                    schedule_text.append(f"🕐 **{time_str}** {event['summary']}{location_str}")
-                
-                # 長すぎる場合は分割
-                if len(schedule_text) > 10:
+                # 予定を時系列で表示（長すぎる場合は分割し、表示分だけ整形する）
+                if len(events) > 10:
                     embed.add_field(
                         name="午前の予定",
-                        value='\n'.join(schedule_text[:5]),
+                        value='\n'.join(self._format_schedule_line(event) for event in events[:5]),
                         inline=False
                     )
                     embed.add_field(
                         name="午後の予定",
-                        value='\n'.join(schedule_text[5:10]),
+                        value='\n'.join(self._format_schedule_line(event) for event in events[5:10]),
+                        inline=False
+                    )
+                    embed.add_field(
+                        name="その他",
+                        value=f"他 {len(events) - 10} 件の予定があります",
                         inline=False
                     )
-                    if len(schedule_text) > 10:
-                        embed.add_field(
-                            name="その他",
-                            value=f"他 {len(schedule_text) - 10} 件の予定があります",
-                            inline=False
-                        )
                 else:
-                    embed.description = '\n'.join(schedule_text)
+                    embed.description = '\n'.join(self._format_schedule_line(event) for event in events)
             
             await ctx.send(embed=embed)
             
@@ -101,10 +101,10 @@ class CalendarCog(commands.Cog):
         
         try:
             # 今週の予定を取得
-            events = await google_calendar_service.get_week_events()
+            today = now_jst().date()
+            events = await self._get_week_events_cached(today)
             
             # 今週の開始日と終了日を計算
-            today = date.today()
             start_of_week = today - timedelta(days=today.weekday())
             end_of_week = start_of_week + timedelta(days=6)
             
@@ -117,40 +117,28 @@ class CalendarCog(commands.Cog):
             if not events:
                 embed.description = "今週の予定はありません"
             else:
-                # 日付別に予定をグループ化
-                daily_events = {}
-                for event in events:
-                    event_date = event['start'].date()
-                    if event_date not in daily_events:
-                        daily_events[event_date] = []
-                    daily_events[event_date].append(event)
+                # 日付別に予定をグループ化（安定ソートなので同日内の時刻順は保たれる）
+                def event_day(event):
+                    return event['start'].date()
                 
-                # 日付順にソート
-                sorted_dates = sorted(daily_events.keys())
-                
-                for event_date in sorted_dates:
-                    day_events = daily_events[event_date]
+                for event_date, grouped_events in groupby(sorted(events, key=event_day), key=event_day):
+                    day_events = list(grouped_events)
                     
                     # 曜日を取得
-                    weekday_names = ['月', '火', '水', '木', '金', '土', '日']
-                    weekday = weekday_names[event_date.weekday()]
+                    weekday = WEEKDAY_NAMES[event_date.weekday()]
                     
-                    # その日の予定リストを作成
-                    event_texts = []
-                    for event in day_events[:3]:  # 最大3件まで表示
-                        if event['all_day']:
-                            time_str = "終日"
-                        else:
-                            time_str = event['start'].strftime("%H:%M")
-                        
-                        event_texts.append(f"• {time_str} {event['summary']}")
+                    # その日の予定リストを作成（最大3件まで表示）
+                    event_texts = '\n'.join(
+                        f"• {'終日' if event['all_day'] else event['start'].strftime('%H:%M')} {event['summary']}"
+                        for event in day_events[:3]
+                    )
                     
                     if len(day_events) > 3:
-                        event_texts.append(f"• 他 {len(day_events) - 3} 件")
+                        event_texts += f"\n• 他 {len(day_events) - 3} 件"
                     
                     embed.add_field(
                         name=f"{event_date.strftime('%m/%d')}({weekday})",
-                        value='\n'.join(event_texts) if event_texts else "予定なし",
+                        value=event_texts or "予定なし",
                         inline=True
                     )
             
@@ -179,11 +167,15 @@ class CalendarCog(commands.Cog):
                 )
             else:
                 next_event = events[0]  # 最初の予定が次の予定
+                start = next_event['start']
+                location = next_event.get('location') or ''
+                description = next_event.get('description') or ''
+                now = now_jst()
                 
                 embed = discord.Embed(
                     title="📅 次の予定",
                     color=discord.Color.green(),
-                    timestamp=now_jst()
+                    timestamp=now
                 )
                 
                 embed.add_field(
@@ -193,17 +185,15 @@ class CalendarCog(commands.Cog):
                 )
                 
                 if next_event['all_day']:
-                    time_str = next_event['start'].strftime('%Y-%m-%d') + " (終日)"
+                    time_str = start.strftime('%Y-%m-%d') + " (終日)"
                 else:
-                    time_str = next_event['start'].strftime('%Y-%m-%d %H:%M')
+                    time_str = start.strftime('%Y-%m-%d %H:%M')
                     
-                    # 開始までの時間を計算
-                    now = datetime.now()
-                    time_until = next_event['start'] - now
-                    if time_until.total_seconds() > 0:
-                        hours = int(time_until.total_seconds() // 3600)
-                        minutes = int((time_until.total_seconds() % 3600) // 60)
-                        time_str += f" (あと{hours}時間{minutes}分)"
+                    # 開始までの時間を計算（時刻指定の予定はタイムゾーン付きのため now_jst と比較）
+                    seconds_until = (start - now).total_seconds()
+                    if seconds_until > 0:
+                        hours, remainder = divmod(int(seconds_until), 3600)
+                        time_str += f" (あと{hours}時間{remainder // 60}分)"
                 
                 embed.add_field(
                     name="開始時刻",
@@ -211,18 +201,17 @@ class CalendarCog(commands.Cog):
                     inline=True
                 )
                 
-                if next_event['location']:
+                if location:
                     embed.add_field(
                         name="場所",
-                        value=next_event['location'],
+                        value=location,
                         inline=True
                     )
                 
-                if next_event['description']:
+                if description:
                     # 説明が長い場合は省略
-                    description = next_event['description'][:200]
-                    if len(next_event['description']) > 200:
-                        description += "..."
+                    if len(description) > 200:
+                        description = description[:200] + "..."
                     embed.add_field(
                         name="詳細",
                         value=description,
@@ -245,12 +234,17 @@ class CalendarCog(commands.Cog):
             if not upcoming_events:
                 return
             
-            # 各予定について参加者にリマインドを送信
-            for event in upcoming_events:
-                try:
-                    await self._send_meeting_reminder(event)
-                except Exception as e:
-                    logger.error(f"会議リマインド送信エラー: {e}")
+            # 各予定について参加者にリマインドを並行送信
+            semaphore = asyncio.Semaphore(MEETING_REMINDER_CONCURRENCY)
+            
+            async def send_one(event):
+                async with semaphore:
+                    try:
+                        await self._send_meeting_reminder(event)
+                    except Exception as e:
+                        logger.error(f"会議リマインド送信エラー: {e}")
+            
+            await asyncio.gather(*(send_one(event) for event in upcoming_events))
             
         except Exception as e:
             logger.error(f"会議リマインド処理エラー: {e}")
@@ -259,32 +253,79 @@ class CalendarCog(commands.Cog):
     async def daily_schedule_share(self):
         """定期スケジュール共有"""
         try:
-            # 今日の予定を取得
-            events = await google_calendar_service.get_today_events()
+            # 共有先が未設定・見つからない場合はGoogle APIを呼ばずに終了
+            channel_id = self._get_daily_channel_id()
+            if not channel_id:
+                return
+            channel = self.bot.get_channel(channel_id)
+            if not channel:
+                return
             
-            # メインチャンネルに今日の予定を投稿
-            # 注意: 実際の実装では設定でチャンネルIDを指定する必要があります
-            channel_id = None  # 設定から取得する予定
+            # 今日の予定を取得（!today と同じキャッシュを共有）
+            today = now_jst().date()
+            events = await self._get_today_events_cached(today)
             
-            if channel_id:
-                channel = self.bot.get_channel(channel_id)
-                if channel:
-                    embed = self._create_daily_schedule_embed(events)
-                    await channel.send(embed=embed)
+            embed = self._create_daily_schedule_embed(events, today)
+            await channel.send(embed=embed)
             
         except Exception as e:
             logger.error(f"定期スケジュール共有エラー: {e}")
     
+    def _get_daily_channel_id(self) -> Optional[int]:
+        """予定共有先のチャンネルIDを設定から取得"""
+        return get_config().SCHEDULE_CHANNEL_ID or None
+    
+    async def _get_today_events_cached(self, today: Optional[date] = None) -> List[Dict[str, Any]]:
+        """今日の予定をキャッシュ経由で取得"""
+        return await self._get_cached_events(
+            'today', today or now_jst().date(), google_calendar_service.get_today_events
+        )
+    
+    async def _get_week_events_cached(self, today: Optional[date] = None) -> List[Dict[str, Any]]:
+        """今週の予定をキャッシュ経由で取得（ISO週単位）"""
+        return await self._get_cached_events(
+            'week', (today or now_jst().date()).isocalendar()[:2], google_calendar_service.get_week_events
+        )
+    
+    async def _get_cached_events(self, kind: str, period: Any,
+                                 fetch: Callable[[], Awaitable[List[Dict[str, Any]]]]) -> List[Dict[str, Any]]:
+        """予定をキャッシュし、同時に来た要求は1回のAPI呼び出しにまとめる"""
+        cached = self._events_cache.get(kind)
+        if cached and cached[0] == period and time_module.monotonic() - cached[1] < EVENTS_CACHE_TTL:
+            return cached[2]
+        
+        async with self._events_lock:
+            # ロック待ちの間に他の要求が取得済みならそれを使う
+            cached = self._events_cache.get(kind)
+            if cached and cached[0] == period and time_module.monotonic() - cached[1] < EVENTS_CACHE_TTL:
+                return cached[2]
+            
+            events = await fetch()
+            self._events_cache[kind] = (period, time_module.monotonic(), events)
+            return events
+    
     async def _send_meeting_reminder(self, event):
         """会議リマインドを送信"""
         # 参加者にDMでリマインドを送信
         # 実際の実装では、カレンダーの参加者とDiscordユーザーの紐づけが必要
         pass
     
-    def _create_daily_schedule_embed(self, events):
+    @staticmethod
+    def _format_schedule_line(event) -> str:
+        """予定1件を「🕐 **開始-終了** 件名 @場所」形式に整形"""
+        if event['all_day']:
+            time_str = "終日"
+        else:
+            time_str = f"{event['start'].strftime('%H:%M')}-{event['end'].strftime('%H:%M')}"
+        
+        location_str = f" @{event['location']}" if event['location'] else ""
+        return f"🕐 **{time_str}** {event['summary']}{location_str}"
+    
+    def _create_daily_schedule_embed(self, events, today: Optional[date] = None):
         """日次スケジュール用のEmbedを作成"""
+        today = today or now_jst().date()
         embed = discord.Embed(
-            title=f"📅 今日の予定 ({date.today().strftime('%Y-%m-%d')})",
+            title=f"📅 今日の予定 ({today.strftime('%Y-%m-%d')})",
             color=discord.Color.blue(),
             timestamp=now_jst()
         )
@@ -292,19 +333,8 @@ class CalendarCog(commands.Cog):
         if not events:
             embed.description = "今日の予定はありません"
         else:
-            schedule_text = []
-            for event in events[:10]:  # 最大10件
-                if event['all_day']:
-                    time_str = "終日"
-                else:
-                    start_time = event['start'].strftime("%H:%M")
-                    end_time = event['end'].strftime("%H:%M")
-                    time_str = f"{start_time}-{end_time}"
-                
-                location_str = f" @{event['location']}" if event['location'] else ""
-                schedule_text.append(f"🕐 **{time_str}** {event['summary']}{location_str}")
-            
-            embed.description = '\n'.join(schedule_text)
+            # 最大10件
+            embed.description = '\n'.join(self._format_schedule_line(event) for event in events[:10])
             
             if len(events) > 10:
                 embed.add_field(
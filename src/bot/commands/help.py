@@ -346,8 +346,8 @@ class HelpCog(commands.Cog):
                 "value": "システム全体の統計情報を表示"
             },
             {
-                "name": "!admin users",
-                "value": "登録ユーザー一覧を表示"
+                "name": "!admin users [ページ]",
+                "value": "登録ユーザー一覧を表示（25件ずつ）"
             },
             {
                 "name": "!admin report [日数]",
@@ -368,6 +368,10 @@ class HelpCog(commands.Cog):
             {
                 "name": "!admin settings",
                 "value": "現在のBot設定を表示"
+            },
+            {
+                "name": "!admin cache clear",
+                "value": "統計キャッシュをクリア"
             }
         ]
         
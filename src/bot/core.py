@@ -53,6 +53,9 @@ class DiscordBot(commands.Bot):
         # Load extensions
         await self._load_extensions()
         
+        # Register slash commands
+        await self._sync_app_commands()
+        
         self.logger.info("Bot setup completed")
     
     async def on_ready(self):
@@ -172,6 +175,19 @@ class DiscordBot(commands.Bot):
                 self.logger.info("Continuing with other extensions...")
                 # Continue loading other extensions despite failures
     
+    async def _sync_app_commands(self):
+        """Sync application commands, per guild when configured for instant updates."""
+        try:
+            if self.config.DISCORD_GUILD_ID:
+                guild = discord.Object(id=self.config.DISCORD_GUILD_ID)
+                self.tree.copy_global_to(guild=guild)
+                synced = await self.tree.sync(guild=guild)
+            else:
+                synced = await self.tree.sync()
+            self.logger.info(f"Synced {len(synced)} application commands")
+        except Exception as e:
+            self.logger.warning(f"Failed to sync application commands: {e}")
+    
     def _add_builtin_commands(self):
         """Add built-in commands to the bot."""
         @self.command(name="ping")
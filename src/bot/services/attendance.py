@@ -4,13 +4,13 @@ Attendance tracking service - Clean TDD implementation
 import csv
 import io
 from dataclasses import dataclass
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, NamedTuple
-import pytz
 
 from src.core.database import get_database_manager
 from src.core.logging import get_logger, log_user_action
 from src.core.error_handling import handle_database_error, SystemError
+from src.utils.datetime_utils import JST
 
 
 class AttendanceResult(NamedTuple):
@@ -134,12 +134,7 @@ class AttendanceService:
     def __init__(self):
         self.logger = get_logger(__name__)
         self.calculator = AttendanceCalculator()
-        
-        # Set timezone
-        try:
-            self.timezone = pytz.timezone('Asia/Tokyo')
-        except:
-            self.timezone = timezone(timedelta(hours=9))  # JST fallback
+        self.timezone = JST
     
     def _get_current_time(self) -> datetime:
         """Get current time in JST."""
@@ -160,6 +155,7 @@ class AttendanceService:
         try:
             db_manager = get_database_manager()
             async with db_manager.get_connection() as conn:
+                await conn.begin_immediate()
                 # Check if user already checked in today
                 cursor = await conn.execute(
                     "SELECT check_in, check_out FROM attendance WHERE user_id = ? AND date = ?",
@@ -225,6 +221,7 @@ class AttendanceService:
         try:
             db_manager = get_database_manager()
             async with db_manager.get_connection() as conn:
+                await conn.begin_immediate()
                 # Get today's attendance record
                 cursor = await conn.execute(
                     "SELECT check_in, check_out, break_start, break_end FROM attendance WHERE user_id = ? AND date = ?",
@@ -306,6 +303,7 @@ class AttendanceService:
         try:
             db_manager = get_database_manager()
             async with db_manager.get_connection() as conn:
+                await conn.begin_immediate()
                 # Check current status
                 cursor = await conn.execute(
                     "SELECT check_in, check_out, break_start, break_end FROM attendance WHERE user_id = ? AND date = ?",
@@ -368,6 +366,7 @@ class AttendanceService:
         try:
             db_manager = get_database_manager()
             async with db_manager.get_connection() as conn:
+                await conn.begin_immediate()
                 # Check current status
                 cursor = await conn.execute(
                     "SELECT check_in, check_out, break_start, break_end FROM attendance WHERE user_id = ? AND date = ?",
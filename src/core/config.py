@@ -111,6 +111,7 @@ class Config:
         # Server settings
         self.HEALTH_CHECK_PORT = int(os.getenv("HEALTH_CHECK_PORT", "8000"))
         self.MEETING_REMINDER_MINUTES = int(os.getenv("MEETING_REMINDER_MINUTES", "15"))
+        self.SCHEDULE_CHANNEL_ID = int(os.getenv("SCHEDULE_CHANNEL_ID", "0"))
     
     @classmethod
     def from_env_file(cls, env_file: str) -> 'Config':
@@ -162,7 +163,8 @@ class Config:
             "GOOGLE_CLIENT_SECRET": self.GOOGLE_CLIENT_SECRET,
             "GOOGLE_CALENDAR_ID": self.GOOGLE_CALENDAR_ID,
             "HEALTH_CHECK_PORT": self.HEALTH_CHECK_PORT,
-            "MEETING_REMINDER_MINUTES": self.MEETING_REMINDER_MINUTES
+            "MEETING_REMINDER_MINUTES": self.MEETING_REMINDER_MINUTES,
+            "SCHEDULE_CHANNEL_ID": self.SCHEDULE_CHANNEL_ID
         }
         
         if not include_sensitive:
@@ -11,6 +11,8 @@ import json
 from pathlib import Path
 import os
 
+from .task_stats import split_task_stats
+
 # Import PostgreSQL support if available
 try:
     from .database_postgres import PostgreSQLManager
@@ -27,22 +29,34 @@ class DatabaseError(Exception):
 class DatabaseConnection:
     """Async database connection wrapper."""
     
-    def __init__(self, database_url: str):
+    def __init__(self, database_url: str, connection: Optional[aiosqlite.Connection] = None):
         self.database_url = database_url
-        self._connection: Optional[aiosqlite.Connection] = None
+        self._connection: Optional[aiosqlite.Connection] = connection
+        # Borrowed (pooled) connections are returned to the pool, not closed
+        self._owns_connection = connection is None
+    
+    @staticmethod
+    async def connect(database_url: str, daemon: bool = False, **kwargs) -> aiosqlite.Connection:
+        """Open and configure a new SQLite connection."""
+        connection = aiosqlite.connect(database_url, **kwargs)
+        # Long-lived pooled connections must not block interpreter shutdown
+        connection.daemon = daemon
+        await connection
+        connection.row_factory = aiosqlite.Row
+        # Enable foreign keys and WAL mode for better performance
+        await connection.execute("PRAGMA foreign_keys = ON")
+        await connection.execute("PRAGMA journal_mode = WAL")
+        return connection
     
     async def __aenter__(self) -> 'DatabaseConnection':
         """Enter async context manager."""
-        self._connection = await aiosqlite.connect(self.database_url)
-        self._connection.row_factory = aiosqlite.Row
-        # Enable foreign keys and WAL mode for better performance
-        await self._connection.execute("PRAGMA foreign_keys = ON")
-        await self._connection.execute("PRAGMA journal_mode = WAL")
+        if self._connection is None:
+            self._connection = await self.connect(self.database_url)
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Exit async context manager."""
-        if self._connection:
+        if self._connection and self._owns_connection:
             await self._connection.close()
             self._connection = None
     
@@ -56,6 +70,15 @@ class DatabaseConnection:
         except Exception as e:
             raise DatabaseError(f"Database query failed: {e}") from e
     
+    async def begin_immediate(self) -> None:
+        """Start a write transaction that takes the write lock up front.
+        
+        A deferred transaction that reads before it writes has to upgrade its
+        lock on the first write, which fails with SQLITE_BUSY under WAL when
+        another writer got there first.
+        """
+        await self.execute("BEGIN IMMEDIATE")
+    
     async def commit(self) -> None:
         """Commit current transaction."""
         if self._connection:
@@ -74,8 +97,18 @@ class DatabaseManager:
         self.database_url = database_url
         self.pool_size = pool_size
         self.connection_pool: Optional[asyncio.Queue] = None
+        self._open_connections = 0
         self._initialized = False
         self.logger = logging.getLogger(__name__)
+        
+        # Each connection to ":memory:" is a separate database, so pooled
+        # connections share one named in-memory database instead
+        if database_url == ":memory:":
+            self._connect_url = f"file:memdb_{id(self)}?mode=memory&cache=shared"
+            self._connect_kwargs: Dict[str, Any] = {'uri': True}
+        else:
+            self._connect_url = database_url
+            self._connect_kwargs = {}
     
     async def initialize(self) -> None:
         """Initialize database schema and connection pool."""
@@ -96,41 +129,84 @@ class DatabaseManager:
         if not self._initialized:
             await self.initialize()
         
-        # For now, create new connections (can be optimized with actual pooling)
-        async with DatabaseConnection(self.database_url) as conn:
-            yield conn
+        connection = await self._acquire_connection()
+        try:
+            async with DatabaseConnection(self.database_url, connection) as conn:
+                yield conn
+        finally:
+            await self._release_connection(connection)
+    
+    async def _acquire_connection(self) -> aiosqlite.Connection:
+        """Take an idle connection from the pool, opening one if below pool size."""
+        if self.connection_pool.empty() and self._open_connections < self.pool_size:
+            self._open_connections += 1
+            try:
+                return await DatabaseConnection.connect(
+                    self._connect_url, daemon=True, **self._connect_kwargs
+                )
+            except Exception:
+                self._open_connections -= 1
+                raise
+        
+        return await self.connection_pool.get()
+    
+    async def _release_connection(self, connection: aiosqlite.Connection) -> None:
+        """Return a connection to the pool, discarding any unfinished transaction."""
+        if self.connection_pool is None:
+            # Pool was closed while the connection was checked out
+            await connection.close()
+            return
+        
+        try:
+            if connection.in_transaction:
+                await connection.rollback()
+        except Exception as e:
+            self.logger.warning(f"Dropping broken pooled connection: {e}")
+            self._open_connections -= 1
+            await connection.close()
+            return
+        
+        self.connection_pool.put_nowait(connection)
     
     async def close(self) -> None:
         """Close all connections and cleanup."""
+        if self.connection_pool is not None:
+            while not self.connection_pool.empty():
+                await self.connection_pool.get_nowait().close()
         self.connection_pool = None
+        self._open_connections = 0
         self._initialized = False
         self.logger.info("Database connections closed")
     
     async def _run_migrations(self) -> None:
         """Run database migrations."""
-        async with DatabaseConnection(self.database_url) as conn:
-            # Create schema migrations table
-            await conn.execute("""
-                CREATE TABLE IF NOT EXISTS schema_migrations (
-                    version INTEGER PRIMARY KEY,
-                    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        connection = await self._acquire_connection()
+        try:
+            async with DatabaseConnection(self.database_url, connection) as conn:
+                # Create schema migrations table
+                await conn.execute("""
+                    CREATE TABLE IF NOT EXISTS schema_migrations (
+                        version INTEGER PRIMARY KEY,
+                        applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                """)
+                
+                # Check current schema version
+                cursor = await conn.execute(
+                    "SELECT MAX(version) as version FROM schema_migrations"
                 )
-            """)
-            
-            # Check current schema version
-            cursor = await conn.execute(
-                "SELECT MAX(version) as version FROM schema_migrations"
-            )
-            result = await cursor.fetchone()
-            current_version = result[0] if result[0] else 0
-            
-            # Apply migrations
-            migrations = self._get_migrations()
-            for version, migration_sql in migrations.items():
-                if version > current_version:
-                    await self._apply_migration(conn, version, migration_sql)
-            
-            await conn.commit()
+                result = await cursor.fetchone()
+                current_version = result[0] if result[0] else 0
+                
+                # Apply migrations
+                migrations = self._get_migrations()
+                for version, migration_sql in migrations.items():
+                    if version > current_version:
+                        await self._apply_migration(conn, version, migration_sql)
+                
+                await conn.commit()
+        finally:
+            await self._release_connection(connection)
     
     def _get_migrations(self) -> Dict[int, str]:
         """Get all database migrations."""
@@ -206,6 +282,14 @@ class DatabaseManager:
                     daily_report_time TEXT DEFAULT '17:00',
                     FOREIGN KEY (user_id) REFERENCES users (discord_id)
                 );
+            """,
+            
+            3: """
+                -- Partial index matching the overdue-task predicate in get_system_stats
+                CREATE INDEX IF NOT EXISTS idx_tasks_open_due ON tasks(due_date) WHERE status != 'completed';
+                
+                -- Covers the per-day attendance counts without touching the table
+                CREATE INDEX IF NOT EXISTS idx_attendance_checked_in ON attendance(date, user_id) WHERE check_in IS NOT NULL;
             """
         }
     
@@ -303,6 +387,17 @@ class DatabaseManager:
             results = await cursor.fetchall()
             return [dict(row) for row in results]
     
+    async def list_users_page(self, limit: int = 25, offset: int = 0) -> List[Dict[str, Any]]:
+        """Get one page of users, newest first, with only the listing columns."""
+        async with self.get_connection() as conn:
+            cursor = await conn.execute("""
+                SELECT display_name, is_admin, created_at FROM users
+                ORDER BY created_at DESC, id DESC
+                LIMIT ? OFFSET ?
+            """, (limit, offset))
+            results = await cursor.fetchall()
+            return [dict(row) for row in results]
+    
     # Task operations
     async def create_task(self, user_id: int, title: str, description: str = None, 
                          priority: str = "medium", status: str = "pending", 
@@ -533,6 +628,90 @@ class DatabaseManager:
                 return cursor.rowcount > 0
         except Exception as e:
             raise DatabaseError(f"Failed to update user preferences: {e}") from e
+    
+    # Statistics operations
+    async def get_system_stats(self, today: str, now: datetime) -> Dict[str, int]:
+        """Get user, task and attendance counts in a single query."""
+        async with self.get_connection() as conn:
+            cursor = await conn.execute("""
+                SELECT
+                    (SELECT COUNT(*) FROM users) AS total_users,
+                    t.total_tasks, t.pending_tasks,
+                    (SELECT COUNT(*) FROM tasks
+                     WHERE status != 'completed' AND due_date < ?) AS overdue_tasks,
+                    a.today_attendance, a.current_present
+                FROM (
+                    SELECT
+                        COUNT(*) AS total_tasks,
+                        COALESCE(SUM(CASE WHEN status != 'completed' THEN 1 ELSE 0 END), 0) AS pending_tasks
+                    FROM tasks
+                ) t, (
+                    SELECT
+                        COUNT(*) AS today_attendance,
+                        COALESCE(SUM(CASE WHEN check_out IS NULL THEN 1 ELSE 0 END), 0) AS current_present
+                    FROM attendance
+                    WHERE date = ? AND check_in IS NOT NULL
+                ) a
+            """, (now, today))
+            result = await cursor.fetchone()
+            return dict(result)
+    
+    async def get_user_task_counts(self, limit: int = 5) -> List[Dict[str, Any]]:
+        """Get users with the most tasks, counted via the tasks(user_id) index."""
+        async with self.get_connection() as conn:
+            cursor = await conn.execute("""
+                SELECT u.username, COUNT(t.id) AS task_count
+                FROM users u
+                JOIN tasks t ON t.user_id = u.discord_id
+                GROUP BY u.discord_id, u.username
+                ORDER BY task_count DESC
+                LIMIT ?
+            """, (limit,))
+            results = await cursor.fetchall()
+            return [dict(row) for row in results]
+    
+    async def get_task_stats(self, limit: int = 5) -> Dict[str, Any]:
+        """Get status, priority and top-user task counts in one round-trip."""
+        async with self.get_connection() as conn:
+            cursor = await conn.execute("""
+                SELECT 'status' AS kind, status AS key, COUNT(*) AS count
+                FROM tasks GROUP BY status
+                UNION ALL
+                SELECT 'priority', priority, COUNT(*)
+                FROM tasks GROUP BY priority
+                UNION ALL
+                SELECT 'user', username, task_count FROM (
+                    SELECT u.username, COUNT(t.id) AS task_count
+                    FROM users u
+                    JOIN tasks t ON t.user_id = u.discord_id
+                    GROUP BY u.discord_id, u.username
+                    ORDER BY task_count DESC
+                    LIMIT ?
+                )
+            """, (limit,))
+            results = await cursor.fetchall()
+        
+        return split_task_stats(results)
+    
+    async def get_attendance_summary(self, start_date: str, end_date: str) -> Dict[str, Any]:
+        """Get total user count and per-day attendance counts within date range."""
+        async with self.get_connection() as conn:
+            cursor = await conn.execute("""
+                WITH user_total AS (SELECT COUNT(*) AS total_users FROM users)
+                SELECT user_total.total_users, a.date, COUNT(a.user_id) AS attendance_count
+                FROM user_total
+                LEFT JOIN attendance a
+                    ON a.date BETWEEN ? AND ? AND a.check_in IS NOT NULL
+                GROUP BY user_total.total_users, a.date
+            """, (start_date, end_date))
+            results = await cursor.fetchall()
+            
+            return {
+                'total_users': results[0]['total_users'] if results else 0,
+                'daily_counts': {
+                    row['date']: row['attendance_count'] for row in results if row['date']
+                }
+            }
 
 
 # Global database manager instance
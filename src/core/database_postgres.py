@@ -6,11 +6,12 @@ import asyncpg
 import logging
 from contextlib import asynccontextmanager
 from typing import Any, AsyncGenerator, Dict, List, Optional, Union
-from datetime import datetime
+from datetime import date, datetime
 import json
 from urllib.parse import urlparse
 
 from src.core.logging import get_logger
+from src.core.task_stats import split_task_stats
 
 
 class PostgreSQLError(Exception):
@@ -24,6 +25,7 @@ class PostgreSQLConnection:
     def __init__(self, database_url: str):
         self.database_url = database_url
         self._connection: Optional[asyncpg.Connection] = None
+        self._transaction: Optional[Any] = None
         self.logger = get_logger(__name__)
     
     async def __aenter__(self) -> 'PostgreSQLConnection':
@@ -84,6 +86,30 @@ class PostgreSQLConnection:
         except Exception as e:
             self.logger.error(f"PostgreSQL fetchval failed: {e}")
             raise PostgreSQLError(f"Database fetchval failed: {e}") from e
+    
+    async def begin_immediate(self) -> None:
+        """Start a write transaction, mirroring the SQLite connection API.
+        
+        PostgreSQL has no deferred lock upgrade to avoid, so this only opens
+        the transaction that commit() or rollback() closes.
+        """
+        if not self._connection:
+            raise PostgreSQLError("No active database connection")
+        
+        self._transaction = self._connection.transaction()
+        await self._transaction.start()
+    
+    async def commit(self) -> None:
+        """Commit current transaction."""
+        if self._transaction:
+            transaction, self._transaction = self._transaction, None
+            await transaction.commit()
+    
+    async def rollback(self) -> None:
+        """Rollback current transaction."""
+        if self._transaction:
+            transaction, self._transaction = self._transaction, None
+            await transaction.rollback()
 
 
 class PostgreSQLManager:
@@ -132,8 +158,13 @@ class PostgreSQLManager:
             wrapper = PostgreSQLConnection.__new__(PostgreSQLConnection)
             wrapper.database_url = self.database_url
             wrapper._connection = conn
+            wrapper._transaction = None
             wrapper.logger = self.logger
-            yield wrapper
+            try:
+                yield wrapper
+            finally:
+                # Do not hand a connection with an open transaction back to the pool
+                await wrapper.rollback()
     
     async def close(self) -> None:
         """Close connection pool."""
@@ -257,6 +288,25 @@ class PostgreSQLManager:
                 
                 CREATE INDEX IF NOT EXISTS idx_audit_log_user_id ON audit_log(user_id);
                 CREATE INDEX IF NOT EXISTS idx_audit_log_created_at ON audit_log(created_at);
+            """,
+            
+            3: """
+                -- Pre-aggregated per-user task counts for admin statistics
+                CREATE MATERIALIZED VIEW IF NOT EXISTS mv_user_task_counts AS
+                    SELECT user_id, COUNT(*) AS task_count
+                    FROM tasks
+                    GROUP BY user_id;
+                
+                -- Unique index required for REFRESH ... CONCURRENTLY
+                CREATE UNIQUE INDEX IF NOT EXISTS idx_mv_user_task_counts_user_id ON mv_user_task_counts(user_id);
+            """,
+            
+            4: """
+                -- Partial index matching the overdue-task predicate in get_system_stats
+                CREATE INDEX IF NOT EXISTS idx_tasks_open_due ON tasks(due_date) WHERE status != 'completed';
+                
+                -- Covers the per-day attendance counts without touching the table
+                CREATE INDEX IF NOT EXISTS idx_attendance_checked_in ON attendance(work_date, user_id) WHERE check_in IS NOT NULL;
             """
         }
     
@@ -363,4 +413,114 @@ class PostgreSQLManager:
         
         async with self.connection_pool.acquire() as conn:
             records = await conn.fetch("SELECT * FROM users ORDER BY created_at")
-            return [dict(record) for record in records]
\ No newline at end of file
+            return [dict(record) for record in records]
+    
+    async def list_users_page(self, limit: int = 25, offset: int = 0) -> List[Dict[str, Any]]:
+        """Get one page of users, newest first, with only the listing columns."""
+        if not self.connection_pool:
+            return []
+        
+        async with self.connection_pool.acquire() as conn:
+            records = await conn.fetch("""
+                SELECT display_name, is_admin, created_at FROM users
+                ORDER BY created_at DESC, id DESC
+                LIMIT $1 OFFSET $2
+            """, limit, offset)
+            return [dict(record) for record in records]
+    
+    # Statistics operations
+    async def get_system_stats(self, today: str, now: datetime) -> Dict[str, int]:
+        """Get user, task and attendance counts in a single query."""
+        if not self.connection_pool:
+            return {}
+        
+        async with self.connection_pool.acquire() as conn:
+            record = await conn.fetchrow("""
+                SELECT
+                    (SELECT COUNT(*) FROM users) AS total_users,
+                    t.total_tasks, t.pending_tasks,
+                    (SELECT COUNT(*) FROM tasks
+                     WHERE status != 'completed' AND due_date < $1) AS overdue_tasks,
+                    a.today_attendance, a.current_present
+                FROM (
+                    SELECT
+                        COUNT(*) AS total_tasks,
+                        COUNT(*) FILTER (WHERE status != 'completed') AS pending_tasks
+                    FROM tasks
+                ) t, (
+                    SELECT
+                        COUNT(*) AS today_attendance,
+                        COUNT(*) FILTER (WHERE check_out IS NULL) AS current_present
+                    FROM attendance
+                    WHERE work_date = $2 AND check_in IS NOT NULL
+                ) a
+            """, now, date.fromisoformat(today))
+            return dict(record)
+    
+    async def get_user_task_counts(self, limit: int = 5) -> List[Dict[str, Any]]:
+        """Get users with the most tasks from the mv_user_task_counts view."""
+        if not self.connection_pool:
+            return []
+        
+        async with self.connection_pool.acquire() as conn:
+            records = await conn.fetch("""
+                SELECT u.username, mv.task_count
+                FROM mv_user_task_counts mv
+                JOIN users u ON u.discord_id = mv.user_id
+                ORDER BY mv.task_count DESC
+                LIMIT $1
+            """, limit)
+            return [dict(record) for record in records]
+    
+    async def get_task_stats(self, limit: int = 5) -> Dict[str, Any]:
+        """Get status, priority and top-user task counts in one round-trip."""
+        if not self.connection_pool:
+            return {'status_counts': {}, 'priority_counts': {}, 'user_task_counts': []}
+        
+        async with self.connection_pool.acquire() as conn:
+            records = await conn.fetch("""
+                SELECT 'status' AS kind, status AS key, COUNT(*) AS count
+                FROM tasks GROUP BY status
+                UNION ALL
+                SELECT 'priority', priority, COUNT(*)
+                FROM tasks GROUP BY priority
+                UNION ALL
+                (SELECT 'user', u.username, mv.task_count
+                 FROM mv_user_task_counts mv
+                 JOIN users u ON u.discord_id = mv.user_id
+                 ORDER BY mv.task_count DESC
+                 LIMIT $1)
+            """, limit)
+        
+        return split_task_stats(records)
+    
+    async def refresh_user_task_counts(self) -> None:
+        """Refresh the mv_user_task_counts materialized view without blocking readers."""
+        if not self.connection_pool:
+            return
+        
+        async with self.connection_pool.acquire() as conn:
+            await conn.execute("REFRESH MATERIALIZED VIEW CONCURRENTLY mv_user_task_counts")
+    
+    async def get_attendance_summary(self, start_date: str, end_date: str) -> Dict[str, Any]:
+        """Get total user count and per-day attendance counts within date range."""
+        if not self.connection_pool:
+            return {'total_users': 0, 'daily_counts': {}}
+        
+        async with self.connection_pool.acquire() as conn:
+            records = await conn.fetch("""
+                WITH user_total AS (SELECT COUNT(*) AS total_users FROM users)
+                SELECT user_total.total_users, a.work_date, COUNT(a.user_id) AS attendance_count
+                FROM user_total
+                LEFT JOIN attendance a
+                    ON a.work_date BETWEEN $1 AND $2 AND a.check_in IS NOT NULL
+                GROUP BY user_total.total_users, a.work_date
+            """, date.fromisoformat(start_date), date.fromisoformat(end_date))
+            
+            return {
+                'total_users': records[0]['total_users'] if records else 0,
+                'daily_counts': {
+                    record['work_date'].isoformat(): record['attendance_count']
+                    for record in records if record['work_date']
+                }
+            }
@@ -1,61 +1,62 @@
 """
 Health check server for production deployment
 """
-import asyncio
 import json
+import threading
 from datetime import datetime
-from typing import Dict, Any
-import logging
-
-# Import Flask for health check server
-try:
-    from flask import Flask, jsonify
-    import threading
-    FLASK_AVAILABLE = True
-except ImportError:
-    FLASK_AVAILABLE = False
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, Optional, Tuple
 
 from src.core.logging import get_logger
 from src.core.database import get_database_manager
 
 
+class _HealthCheckHandler(BaseHTTPRequestHandler):
+    """Request handler that serves the JSON health endpoints."""
+    
+    # Set on the per-server subclass created in HealthCheckServer.start()
+    health_server: "HealthCheckServer" = None
+    
+    def do_GET(self) -> None:
+        status, payload = self.health_server.handle_path(self.path.split('?', 1)[0])
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format: str, *args) -> None:
+        """Silence per-request access logging from liveness probes."""
+
+
 class HealthCheckServer:
     """Health check HTTP server for Koyeb monitoring."""
     
     def __init__(self, port: int = 8000):
         self.port = port
         self.logger = get_logger(__name__)
-        self.app = None
+        self.httpd: Optional[ThreadingHTTPServer] = None
         self.server_thread = None
         self.is_running = False
-        
-        if FLASK_AVAILABLE:
-            self._setup_flask_app()
     
-    def _setup_flask_app(self) -> None:
-        """Setup Flask application for health checks."""
-        self.app = Flask(__name__)
-        self.app.logger.setLevel(logging.WARNING)  # Reduce Flask logging
-        
-        @self.app.route('/health')
-        def health_check():
-            """Health check endpoint."""
+    def handle_path(self, path: str) -> Tuple[int, Dict[str, Any]]:
+        """Return the status code and JSON payload for a GET request path."""
+        if path == '/health':
             try:
                 health_data = self._get_health_status()
                 status_code = 200 if health_data['status'] == 'healthy' else 503
-                return jsonify(health_data), status_code
+                return status_code, health_data
             except Exception as e:
                 self.logger.error(f"Health check failed: {e}")
-                return jsonify({
+                return 503, {
                     'status': 'error',
                     'message': str(e),
                     'timestamp': datetime.now().isoformat()
-                }), 503
+                }
         
-        @self.app.route('/')
-        def root():
-            """Root endpoint with service information."""
-            return jsonify({
+        if path == '/':
+            return 200, {
                 'service': 'Discord Bot Enterprise',
                 'version': '3.0.0',
                 'status': 'running',
@@ -63,16 +64,16 @@ class HealthCheckServer:
                     'health': '/health'
                 },
                 'timestamp': datetime.now().isoformat()
-            })
+            }
         
-        @self.app.route('/metrics')
-        def metrics():
-            """Basic metrics endpoint."""
+        if path == '/metrics':
             try:
-                return jsonify(self._get_metrics())
+                return 200, self._get_metrics()
             except Exception as e:
                 self.logger.error(f"Metrics collection failed: {e}")
-                return jsonify({'error': str(e)}), 500
+                return 500, {'error': str(e)}
+        
+        return 404, {'error': 'Not found'}
     
     def _get_health_status(self) -> Dict[str, Any]:
         """Get current health status."""
@@ -157,22 +158,19 @@ class HealthCheckServer:
     
     def start(self) -> None:
         """Start health check server."""
-        if not FLASK_AVAILABLE:
-            self.logger.warning("Flask not available, health check server disabled")
-            return
-        
         if self.is_running:
             return
         
         self.logger.info(f"Starting health check server on port {self.port}")
         
-        def run_server():
-            try:
-                self.app.run(host='0.0.0.0', port=self.port, debug=False, use_reloader=False)
-            except Exception as e:
-                self.logger.error(f"Health check server error: {e}")
+        handler = type('HealthCheckHandler', (_HealthCheckHandler,), {'health_server': self})
+        try:
+            self.httpd = ThreadingHTTPServer(('0.0.0.0', self.port), handler)
+        except OSError as e:
+            self.logger.error(f"Health check server error: {e}")
+            return
         
-        self.server_thread = threading.Thread(target=run_server, daemon=True)
+        self.server_thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
         self.server_thread.start()
         self.is_running = True
         
@@ -181,6 +179,9 @@ class HealthCheckServer:
     def stop(self) -> None:
         """Stop health check server."""
         if self.is_running:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+            self.httpd = None
             self.is_running = False
             self.logger.info("Health check server stopped")
 
@@ -254,7 +254,7 @@ class PerformanceTimer:
     
     def __enter__(self):
         import time
-        self.start_time = time.time()
+        self.start_time = time.perf_counter()
         self.logger.debug(f"Starting {self.operation}", extra={
             "operation": self.operation,
             "phase": "start",
@@ -264,7 +264,7 @@ class PerformanceTimer:
     
     def __exit__(self, exc_type, exc_val, exc_tb):
         import time
-        duration = time.time() - self.start_time
+        duration = time.perf_counter() - self.start_time
         
         if exc_type is None:
             self.logger.info(f"Completed {self.operation}", extra={
@@ -0,0 +1,17 @@
+"""
+Task statistics helpers shared by the SQLite and PostgreSQL backends
+"""
+from typing import Any, Dict
+
+
+def split_task_stats(rows) -> Dict[str, Any]:
+    """Dispatch (kind, key, count) rows from get_task_stats into separate counts."""
+    stats: Dict[str, Any] = {'status_counts': {}, 'priority_counts': {}, 'user_task_counts': []}
+    for kind, key, count in rows:
+        if kind == 'user':
+            stats['user_task_counts'].append({'username': key, 'task_count': count})
+        else:
+            stats[f'{kind}_counts'][key] = count
+    # UNION ALL does not preserve the sub-select order
+    stats['user_task_counts'].sort(key=lambda row: row['task_count'], reverse=True)
+    return stats
@@ -3,13 +3,14 @@ Datetime utilities for Discord Bot Enterprise
 """
 from datetime import datetime, date, timedelta
 from typing import Optional, Tuple
-import pytz
+from zoneinfo import ZoneInfo
+
+JST = ZoneInfo('Asia/Tokyo')
 
 
 def now_jst() -> datetime:
     """Get current datetime in JST timezone."""
-    jst = pytz.timezone('Asia/Tokyo')
-    return datetime.now(jst)
+    return datetime.now(JST)
 
 
 def today_jst() -> date:
@@ -20,9 +21,8 @@ def today_jst() -> date:
 def ensure_jst(dt: datetime) -> datetime:
     """Ensure datetime is in JST timezone."""
     if dt.tzinfo is None:
-        jst = pytz.timezone('Asia/Tokyo')
-        return jst.localize(dt)
-    return dt.astimezone(pytz.timezone('Asia/Tokyo'))
+        return dt.replace(tzinfo=JST)
+    return dt.astimezone(JST)
 
 
 def format_time_only(dt: datetime) -> str:
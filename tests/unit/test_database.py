@@ -66,6 +66,25 @@ class TestDatabaseConnection:
             cursor = await conn.execute("SELECT COUNT(*) FROM test")
             count = await cursor.fetchone()
             assert count[0] == 0
+    
+    @pytest.mark.asyncio
+    async def test_begin_immediate_takes_write_lock(self, temp_db_path):
+        """Test a second writer cannot start while an immediate transaction is open."""
+        async with DatabaseConnection(temp_db_path) as conn:
+            await conn.execute("CREATE TABLE test (id INTEGER PRIMARY KEY)")
+            await conn.commit()
+            
+            await conn.begin_immediate()
+            async with DatabaseConnection(temp_db_path) as other:
+                await other._connection.execute("PRAGMA busy_timeout = 0")
+                with pytest.raises(DatabaseError, match="locked"):
+                    await other.begin_immediate()
+            
+            await conn.execute("INSERT INTO test (id) VALUES (1)")
+            await conn.commit()
+            cursor = await conn.execute("SELECT COUNT(*) FROM test")
+            count = await cursor.fetchone()
+            assert count[0] == 1
 
 
 class TestDatabaseManager:
@@ -134,6 +153,24 @@ class TestDatabaseManager:
         assert manager.connection_pool is not None
         assert manager.pool_size == 3
     
+    @pytest.mark.asyncio
+    async def test_manager_reuses_pooled_connections(self):
+        """Test sequential queries reuse one pooled connection."""
+        manager = DatabaseManager(":memory:", pool_size=3)
+        await manager.initialize()
+        
+        async with manager.get_connection() as conn:
+            first = conn._connection
+        async with manager.get_connection() as conn:
+            second = conn._connection
+            # Schema created during initialize is visible on the pooled connection
+            cursor = await conn.execute("SELECT COUNT(*) FROM users")
+            assert (await cursor.fetchone())[0] == 0
+        
+        assert first is second
+        assert manager._open_connections == 1
+        await manager.close()
+    
     @pytest.mark.asyncio
     async def test_manager_cleanup(self):
         """Test manager properly cleans up resources."""
@@ -202,6 +239,24 @@ class TestDatabaseOperations:
         assert user["display_name"] == "Updated Name"
         assert user["is_admin"] is True
     
+    @pytest.mark.asyncio
+    async def test_list_users_page(self, temp_db_path):
+        """Test paging through users newest first."""
+        manager = DatabaseManager(temp_db_path)
+        await manager.initialize()
+        
+        for i in range(3):
+            await manager.create_user(
+                discord_id=100 + i, username=f"user{i}", display_name=f"User {i}"
+            )
+        
+        first_page = await manager.list_users_page(limit=2, offset=0)
+        second_page = await manager.list_users_page(limit=2, offset=2)
+        
+        assert [u["display_name"] for u in first_page] == ["User 2", "User 1"]
+        assert [u["display_name"] for u in second_page] == ["User 0"]
+        assert set(first_page[0]) == {"display_name", "is_admin", "created_at"}
+    
     @pytest.mark.asyncio
     async def test_database_error_handling(self, temp_db_path):
         """Test database error handling."""
@@ -654,6 +709,110 @@ class TestUserPreferencesOperations:
         assert prefs["notification_enabled"] is True
 
 
+class TestStatisticsOperations:
+    """Test aggregate statistics queries."""
+    
+    @pytest.mark.asyncio
+    async def test_get_system_stats(self, temp_db_path, sample_user_data, sample_attendance_data):
+        """Test system stats are aggregated in one query."""
+        manager = DatabaseManager(temp_db_path)
+        await manager.initialize()
+        
+        user_id = sample_user_data["discord_id"]
+        await manager.create_user(
+            discord_id=user_id,
+            username=sample_user_data["username"],
+            display_name=sample_user_data["display_name"]
+        )
+        await manager.create_task(user_id=user_id, title="Overdue", due_date=datetime(2024, 1, 1))
+        await manager.create_task(user_id=user_id, title="Future", due_date=datetime(2024, 12, 31))
+        done_id = await manager.create_task(user_id=user_id, title="Done", due_date=datetime(2024, 1, 1))
+        await manager.complete_task(done_id)
+        await manager.create_attendance_record(
+            user_id=user_id,
+            date=sample_attendance_data["date"],
+            check_in=sample_attendance_data["check_in"]
+        )
+        
+        stats = await manager.get_system_stats("2024-01-01", datetime(2024, 6, 15, 10, 0))
+        
+        assert stats == {
+            "total_users": 1,
+            "total_tasks": 3,
+            "pending_tasks": 2,
+            "overdue_tasks": 1,
+            "today_attendance": 1,
+            "current_present": 1
+        }
+    
+    @pytest.mark.asyncio
+    async def test_get_user_task_counts(self, temp_db_path):
+        """Test per-user task counts are ordered and limited."""
+        manager = DatabaseManager(temp_db_path)
+        await manager.initialize()
+        
+        for discord_id, username, task_count in [(1, "alice", 1), (2, "bob", 3), (3, "carol", 0)]:
+            await manager.create_user(discord_id=discord_id, username=username, display_name=username)
+            for i in range(task_count):
+                await manager.create_task(user_id=discord_id, title=f"Task {i}")
+        
+        counts = await manager.get_user_task_counts(limit=5)
+        
+        assert counts == [
+            {"username": "bob", "task_count": 3},
+            {"username": "alice", "task_count": 1}
+        ]
+        assert len(await manager.get_user_task_counts(limit=1)) == 1
+    
+    @pytest.mark.asyncio
+    async def test_get_task_stats(self, temp_db_path):
+        """Test status, priority and per-user counts come back from one query."""
+        manager = DatabaseManager(temp_db_path)
+        await manager.initialize()
+        
+        await manager.create_user(discord_id=1, username="alice", display_name="alice")
+        await manager.create_user(discord_id=2, username="bob", display_name="bob")
+        await manager.create_task(user_id=1, title="A", priority="high")
+        await manager.create_task(user_id=2, title="B", status="completed")
+        await manager.create_task(user_id=2, title="C")
+        
+        stats = await manager.get_task_stats(limit=5)
+        
+        assert stats["status_counts"] == {"pending": 2, "completed": 1}
+        assert stats["priority_counts"] == {"high": 1, "medium": 2}
+        assert stats["user_task_counts"] == [
+            {"username": "bob", "task_count": 2},
+            {"username": "alice", "task_count": 1}
+        ]
+    
+    @pytest.mark.asyncio
+    async def test_get_attendance_summary(self, temp_db_path, sample_user_data, sample_attendance_data):
+        """Test attendance summary returns user total and per-day counts."""
+        manager = DatabaseManager(temp_db_path)
+        await manager.initialize()
+        
+        await manager.create_user(
+            discord_id=sample_user_data["discord_id"],
+            username=sample_user_data["username"],
+            display_name=sample_user_data["display_name"]
+        )
+        await manager.create_attendance_record(**sample_attendance_data)
+        
+        summary = await manager.get_attendance_summary("2024-01-01", "2024-01-07")
+        
+        assert summary == {"total_users": 1, "daily_counts": {"2024-01-01": 1}}
+    
+    @pytest.mark.asyncio
+    async def test_get_attendance_summary_empty(self, temp_db_path):
+        """Test attendance summary with no users."""
+        manager = DatabaseManager(temp_db_path)
+        await manager.initialize()
+        
+        summary = await manager.get_attendance_summary("2024-01-01", "2024-01-07")
+        
+        assert summary == {"total_users": 0, "daily_counts": {}}
+
+
 class TestDatabaseMigrations:
     """Test database migration system."""
     
@@ -0,0 +1,47 @@
+"""
+Test health check server - TDD approach
+"""
+import json
+import urllib.error
+import urllib.request
+
+from src.core.health_check import HealthCheckServer
+
+
+class TestHealthCheckServer:
+    """Test stdlib-based health check HTTP server."""
+    
+    def _get(self, server: HealthCheckServer, path: str):
+        port = server.httpd.server_address[1]
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}{path}", timeout=5) as response:
+                return response.status, json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            return e.code, json.loads(e.read())
+    
+    def test_server_serves_json_endpoints(self):
+        """Test root and unknown paths are answered with JSON."""
+        server = HealthCheckServer(port=0)
+        server.start()
+        try:
+            assert server.is_running
+            
+            status, payload = self._get(server, '/')
+            assert status == 200
+            assert payload['status'] == 'running'
+            
+            status, payload = self._get(server, '/missing')
+            assert status == 404
+        finally:
+            server.stop()
+        
+        assert not server.is_running
+        assert server.httpd is None
+    
+    def test_health_path_reports_status(self):
+        """Test /health maps overall status to the HTTP status code."""
+        server = HealthCheckServer(port=0)
+        status, payload = server.handle_path('/health')
+        
+        assert payload['status'] in ('healthy', 'warning', 'unhealthy')
+        assert status == (200 if payload['status'] == 'healthy' else 503)